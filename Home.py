@@ -9,14 +9,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-def build_navigation():
+@st.cache_data(show_spinner=False)
+def scan_views():
     """
-    Build navigation structure by scanning views subfolders.
+    Scan the views subfolders once per process.
     Groups pages by topic derived from subfolder names.
-    Icons are shown only in navigation group items, not in filenames.
     
     Returns:
-        List of st.Page objects organized by topic sections
+        Dictionary mapping topic names to lists of (path, title) tuples
     """
     views_dir = Path(__file__).parent / "views"
     
@@ -33,16 +33,8 @@ def build_navigation():
         "9_helper": {"name": "🔧 Helper", "icon": "🔧", "order": 9}
     }
     
-    # Map specific pages to their individual icons
-    page_icons = {
-        "Thinking": "🧠",
-        "Thinking_Generate": "🧠",
-        "Thinking_Levels": "🧠",
-        "Fill_in_Middle": "💻"
-    }
-    
     # Build navigation structure
-    navigation_pages = {}
+    navigation = {}
     
     # Scan each topic subfolder
     for topic_folder, topic_info in sorted(topics.items(), key=lambda x: x[1]["order"]):
@@ -52,33 +44,32 @@ def build_navigation():
             continue
             
         # Get all Python files in this topic folder
-        py_files = sorted(topic_path.glob("*.py"))
+        entries = []
+        for py_file in sorted(topic_path.glob("*.py")):
+            # Extract title from filename (remove number prefix)
+            title = py_file.stem.split("_", 1)[1] if "_" in py_file.stem else py_file.stem
+            entries.append((str(py_file), title.replace("_", " ")))
         
-        if py_files:
-            pages = []
-            for py_file in py_files:
-                # Extract title from filename (remove number prefix)
-                title = py_file.stem.split("_", 1)[1] if "_" in py_file.stem else py_file.stem
-                title = title.replace("_", " ")
-                
-                # Get icon for specific pages, otherwise use topic icon
-                icon = page_icons.get(py_file.stem.split("_", 1)[1] if "_" in py_file.stem else "", 
-                                     topic_info["icon"])
-                icon = None
-                
-                # Create st.Page for each script
-                page = st.Page(
-                    str(py_file),
-                    title=title,
-                    icon=icon
-                )
-                pages.append(page)
-            
-            # Add this topic's pages to navigation
-            if pages:
-                navigation_pages[topic_info["name"]] = pages
+        # Add this topic's pages to navigation
+        if entries:
+            navigation[topic_info["name"]] = entries
+    
+    return navigation
+
+
+def build_navigation():
+    """
+    Build navigation from the cached folder scan.
+    Page scripts are only executed when they are opened, so nothing
+    under views/ is imported here.
     
-    return navigation_pages
+    Returns:
+        List of st.Page objects organized by topic sections
+    """
+    return {
+        topic: [st.Page(path, title=title) for path, title in entries]
+        for topic, entries in scan_views().items()
+    }
 
 
 # -----
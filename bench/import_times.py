@@ -0,0 +1,101 @@
+"""
+Import-Time Report
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+each module and reports the total cold import time together with the
+slowest modules it pulls in, so cold start regressions show up per module.
+
+Usage:
+    python -m bench.import_times                         # default modules
+    python -m bench.import_times lib.helper_ollama numpy --top 15
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = (
+    'lib.helper_ollama',
+    'lib.helper_streamlit',
+    'ollama',
+    'numpy',
+    'streamlit',
+)
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    Parse the output of `python -X importtime`
+
+    Args:
+        stderr: Captured standard error of the interpreter
+
+    Returns:
+        One dictionary per imported module with self_us, cumulative_us and depth
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        rows.append({
+            'module': name.strip(),
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+        })
+    return rows
+
+
+def import_report(module: str, top: int = 10) -> Dict[str, Any]:
+    """
+    Measure the cold import of one module in a fresh interpreter
+
+    Args:
+        module: Dotted module name
+        top: Number of slowest modules (by self time) to include
+
+    Returns:
+        Dictionary with total_ms, module count and the slowest modules
+    """
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [str(ROOT), os.environ.get('PYTHONPATH')]))}
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'import failed'}
+
+    rows = parse_importtime(proc.stderr)
+    target = next((r for r in rows if r['module'] == module), None)
+    slowest = sorted(rows, key=lambda r: r['self_us'], reverse=True)[:top]
+    return {
+        'total_ms': round((target['cumulative_us'] if target else sum(r['self_us'] for r in rows)) / 1000, 2),
+        'modules': len(rows),
+        'numpy_loaded': any(r['module'] == 'numpy' for r in rows),
+        'slowest': [
+            {'module': r['module'], 'self_ms': round(r['self_us'] / 1000, 2),
+             'cumulative_ms': round(r['cumulative_us'] / 1000, 2)}
+            for r in slowest
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Report cold import times per module')
+    parser.add_argument('modules', nargs='*', default=list(DEFAULT_MODULES), help='modules to import')
+    parser.add_argument('--top', type=int, default=10, help='slowest modules to list per import')
+    args = parser.parse_args()
+
+    print(json.dumps({module: import_report(module, args.top) for module in args.modules}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Run the benchmark scenarios against a local stub Ollama server.
+
+Usage:
+    python -m bench.run                                  # all scenarios
+    python -m bench.run -s streaming_parse -s catalog_lookups
+    python -m bench.run --token-rate 500 --latency 0.005 --tokens 512
+    python -m bench.run --compare bench/results/previous.json
+
+Results are written as JSON to bench/results/ (or --output) together with
+the stub configuration, so runs can be compared over time.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict
+
+from .scenarios import ROOT, SCENARIOS
+from .stub_server import StubConfig, StubOllamaServer
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except Exception:
+        return ''
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    """Print the relative change of every numeric measurement"""
+    for scenario, metrics in current['scenarios'].items():
+        before = previous.get('scenarios', {}).get(scenario, {})
+        for name, value in metrics.items():
+            old = before.get(name)
+            if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+                change = (value - old) / old * 100
+                print(f'{scenario:20s} {name:32s} {old:>14g} -> {value:<14g} {change:+7.1f}%')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the Ollama helpers against a stub server')
+    parser.add_argument('-s', '--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='scenario to run (repeatable, default: all)')
+    parser.add_argument('--tokens', type=int, default=StubConfig.tokens, help='tokens per response')
+    parser.add_argument('--token-rate', type=float, default=StubConfig.token_rate,
+                        help='streamed tokens per second (0 = unthrottled)')
+    parser.add_argument('--latency', type=float, default=StubConfig.latency_s, help='seconds before each response')
+    parser.add_argument('--embedding-dim', type=int, default=StubConfig.embedding_dim)
+    parser.add_argument('--models', type=int, default=StubConfig.models, help='models listed by /api/tags')
+    parser.add_argument('--output', type=Path, default=None, help='result file (default: bench/results/<time>.json)')
+    parser.add_argument('--compare', type=Path, default=None, help='previous result file to compare against')
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency_s=args.latency,
+        token_rate=args.token_rate,
+        tokens=args.tokens,
+        embedding_dim=args.embedding_dim,
+        models=args.models,
+    )
+
+    results: Dict[str, Any] = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'stub': config.to_dict(),
+        },
+        'scenarios': {},
+    }
+
+    for name in args.scenario or list(SCENARIOS):
+        # A fresh server per scenario keeps request counts separate
+        with StubOllamaServer(config) as stub:
+            print(f'Running {name}...', file=sys.stderr)
+            started = time.perf_counter()
+            results['scenarios'][name] = SCENARIOS[name](stub)
+            print(f'  done in {time.perf_counter() - started:.2f}s', file=sys.stderr)
+
+    output = args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+
+    print(json.dumps(results['scenarios'], indent=2))
+    print(f'Results written to {output}', file=sys.stderr)
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,367 @@
+"""
+Benchmark Scenarios
+
+Each scenario takes a running StubOllamaServer and returns a flat dictionary
+of measurements. Times are medians over several repetitions, so a scenario
+result can be compared run to run.
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src'))
+
+from lib.helper_ollama import BatchEmbedder, EmbeddingCache, OllamaHelper, SingleFlight, MetricsRegistry  # noqa: E402
+
+from .stub_server import StubOllamaServer  # noqa: E402
+
+
+def timed(fn: Callable[[], Any], repeat: int = 5) -> Dict[str, float]:
+    """
+    Run `fn` several times
+
+    Args:
+        fn: Callable to time
+        repeat: Number of runs
+
+    Returns:
+        Dictionary with median, min and max seconds
+    """
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return {
+        'median_s': round(statistics.median(samples), 6),
+        'min_s': round(min(samples), 6),
+        'max_s': round(max(samples), 6),
+    }
+
+
+def _helper(stub: StubOllamaServer) -> OllamaHelper:
+    # Private coalescing/metrics so scenarios do not share state
+    return OllamaHelper(stub.host, single_flight=SingleFlight(), metrics=MetricsRegistry())
+
+
+class _Placeholder:
+    """Stands in for st.empty() and counts renders"""
+
+    def __init__(self):
+        self.renders = 0
+
+    def markdown(self, text: str) -> None:
+        self.renders += 1
+
+
+class _Container:
+    """Stands in for a Streamlit container"""
+
+    def __init__(self):
+        self.placeholder = _Placeholder()
+
+    def empty(self) -> _Placeholder:
+        return self.placeholder
+
+    def caption(self, text: str) -> None:
+        pass
+
+    def write(self, text: str) -> None:
+        pass
+
+
+# ==================== Scenarios ====================
+
+def streaming_parse(stub: StubOllamaServer, repeat: int = 5) -> Dict[str, Any]:
+    """Client-side cost of consuming a streamed chat, raw and through the Streamlit renderer"""
+    from lib.helper_streamlit import StreamlitOllamaHelper
+
+    helper = _helper(stub)
+    messages = [{'role': 'user', 'content': 'hi'}]
+    tokens = stub.config.tokens
+
+    raw = timed(lambda: sum(1 for _ in helper.chat('model-0', messages, stream=True)), repeat)
+
+    streamlit_helper = StreamlitOllamaHelper(stub.host)
+    streamlit_helper.ollama = helper
+    container = _Container()
+    rendered = timed(lambda: streamlit_helper.run_chat('model-0', messages, container=container), repeat)
+
+    return {
+        'tokens': tokens,
+        'raw_median_s': raw['median_s'],
+        'raw_us_per_chunk': round(raw['median_s'] / tokens * 1e6, 2),
+        'streamlit_median_s': rendered['median_s'],
+        'streamlit_us_per_chunk': round(rendered['median_s'] / tokens * 1e6, 2),
+        'renders_per_stream': container.placeholder.renders // repeat,
+    }
+
+
+def catalog_lookups(stub: StubOllamaServer, lookups: int = 10000) -> Dict[str, Any]:
+    """Model catalog cold load and cached lookups"""
+    helper = _helper(stub)
+    names = [f'model-{i % stub.config.models}' for i in range(lookups)]
+
+    cold = timed(helper.refresh_models, repeat=3)
+
+    started = time.perf_counter()
+    for name in names:
+        helper.is_model_installed(name)
+    warm = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for name in names:
+        helper.get_model_size(name)
+    sizes = time.perf_counter() - started
+
+    return {
+        'models': stub.config.models,
+        'cold_load_median_s': cold['median_s'],
+        'is_installed_us': round(warm / lookups * 1e6, 3),
+        'get_size_us': round(sizes / lookups * 1e6, 3),
+        'server_tag_requests': stub.requests.get('/api/tags', 0),
+    }
+
+
+def embedding_batching(stub: StubOllamaServer, texts: int = 512,
+                       batch_sizes=(1, 16, 64)) -> Dict[str, Any]:
+    """Throughput of BatchEmbedder per batch size, then with a warm cache"""
+    helper = _helper(stub)
+    corpus = [f'document number {i} about something' for i in range(texts)]
+    result: Dict[str, Any] = {'texts': texts, 'dim': stub.config.embedding_dim}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for batch_size in batch_sizes:
+            cache = EmbeddingCache(Path(tmp) / f'b{batch_size}.sqlite')
+            embedder = BatchEmbedder(helper, batch_size=batch_size, cache=cache)
+            started = time.perf_counter()
+            embedder.embed('model-0', corpus)
+            elapsed = time.perf_counter() - started
+            result[f'batch_{batch_size}_texts_per_s'] = round(texts / elapsed, 1)
+
+            started = time.perf_counter()
+            embedder.embed('model-0', corpus)
+            result[f'batch_{batch_size}_cached_texts_per_s'] = round(texts / (time.perf_counter() - started), 1)
+
+    return result
+
+
+class _WebClient:
+    """Stands in for the Ollama web_fetch/web_search client"""
+
+    def __init__(self, size: int, search_chars: int = 2000):
+        self.search_chars = search_chars
+        paragraph = (
+            'Lorem ipsum dolor sit amet, consectetur adipiscing elit [a link](https://example.com/page) '
+            'sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.\n'
+        )
+        self.content = paragraph * max(1, size // len(paragraph))
+
+    def web_fetch(self, url: str):
+        return SimpleNamespace(title=url, content=self.content, links=[])
+
+    def web_search(self, query: str, max_results: int = 5):
+        return SimpleNamespace(results=[
+            SimpleNamespace(title=f'{query} {i}', url=f'https://example.com/{i}', content=self.content[:self.search_chars])
+            for i in range(max_results)
+        ])
+
+
+def browser_pages(stub: StubOllamaServer, sizes=(100_000, 1_000_000, 4_000_000),
+                  repeat: int = 3) -> Dict[str, Any]:
+    """Browser page building, scrolling and find on large fetched pages"""
+    from web_search_gpt_oss_helper import Browser, process_markdown_links, wrap_lines
+
+    result: Dict[str, Any] = {}
+    for size in sizes:
+        client = _WebClient(size, search_chars=size)
+        label = f'{size // 1000}kb'
+
+        def open_page():
+            Browser(client=client).open(id='https://example.com/big')
+
+        result[f'{label}_open_s'] = timed(open_page, repeat)['median_s']
+        # Result pages with the full text are only built when opened
+        result[f'{label}_search_s'] = timed(lambda: Browser(client=client).search(query='lorem'), repeat)['median_s']
+
+        text, _ = process_markdown_links(client.content)
+        wrap = timed(lambda: wrap_lines(text), repeat)['median_s']
+        result[f'{label}_wrap_mb_s'] = round(len(text) / 1e6 / wrap, 1) if wrap else None
+
+        browser = Browser(client=client)
+        browser.open(id='https://example.com/big')
+        page = browser.get_state().url_to_page['https://example.com/big']
+        lines = len(page.lines)
+        result[f'{label}_page_mb'] = round(page.nbytes / 1e6, 2)
+        result[f'{label}_scroll_s'] = timed(
+            lambda: browser.open(cursor=0, loc=lines // 2), repeat
+        )['median_s']
+        result[f'{label}_find_s'] = timed(lambda: browser.find(pattern='magna', cursor=0), repeat)['median_s']
+        # A pattern that does not occur scans the whole page index
+        result[f'{label}_find_miss_s'] = timed(lambda: browser.find(pattern='zzz', cursor=0), repeat)['median_s']
+        result[f'{label}_find_terms_s'] = timed(
+            lambda: browser.find(pattern='magna tempor zzz', cursor=0, mode='terms'), repeat
+        )['median_s']
+
+    return result
+
+
+def _weather(city: str, unit: str = 'celsius') -> str:
+    """
+    Get the current weather for a city
+
+    Args:
+        city: Name of the city
+        unit: Temperature unit
+
+    Returns:
+        Weather description
+    """
+    return f'20 degrees {unit} in {city}'
+
+
+def _conditions(city: str, days: int) -> str:
+    """
+    Get the forecast conditions for a city
+
+    Args:
+        city: Name of the city
+        days: Number of days
+
+    Returns:
+        Conditions
+    """
+    return 'sunny'
+
+
+def agent_loop(stub: StubOllamaServer, repeat: int = 5, lookups: int = 1000) -> Dict[str, Any]:
+    """Tool schema compilation and a full agent run with two tool turns"""
+    from ollama._utils import convert_function_to_tool
+
+    from lib.helper_ollama import ToolRegistry, compile_tool
+
+    tools = [_weather, _conditions]
+
+    started = time.perf_counter()
+    for _ in range(lookups):
+        for tool in tools:
+            convert_function_to_tool(tool)
+    introspect = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(lookups):
+        for tool in tools:
+            compile_tool(tool)
+    cached = time.perf_counter() - started
+
+    registry = ToolRegistry(tools)
+    started = time.perf_counter()
+    for _ in range(lookups):
+        registry.tools
+    registry_tools = time.perf_counter() - started
+
+    helper = _helper(stub)
+    stub.config.tool_turns = 2
+    run = timed(lambda: helper.agent('model-0', tools).run([{'role': 'user', 'content': 'weather?'}]), repeat)
+
+    return {
+        'schema_introspect_us': round(introspect / (lookups * len(tools)) * 1e6, 2),
+        'schema_cached_us': round(cached / (lookups * len(tools)) * 1e6, 3),
+        'registry_tools_us': round(registry_tools / lookups * 1e6, 3),
+        'agent_run_median_s': run['median_s'],
+        'chat_requests': stub.requests.get('/api/chat', 0),
+    }
+
+
+class _SlowWebClient(_WebClient):
+    """_WebClient with a fixed network latency per request"""
+
+    def __init__(self, size: int, latency: float):
+        super().__init__(size)
+        self.latency = latency
+        self.requests = 0
+
+    def web_fetch(self, url: str):
+        from ollama import WebFetchResponse
+
+        self.requests += 1
+        time.sleep(self.latency)
+        return WebFetchResponse(title=url, content=self.content, links=[])
+
+
+def web_cache(stub: StubOllamaServer, size: int = 1_000_000, latency: float = 0.05,
+              repeat: int = 5) -> Dict[str, Any]:
+    """Shared web cache: cold fetch, warm hit, revalidation of a stale entry and a second process"""
+    from lib.helper_ollama import CachedWebClient, WebCache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'web.sqlite'
+        client = _SlowWebClient(size, latency)
+        cache = WebCache(path)
+        cached = CachedWebClient(client, cache)
+
+        started = time.perf_counter()
+        cached.web_fetch('https://example.com/big')
+        cold = time.perf_counter() - started
+        warm = timed(lambda: cached.web_fetch('https://example.com/big'), repeat)
+
+        # A second cache on the same file stands in for another process
+        other = CachedWebClient(client, WebCache(path))
+        shared = timed(lambda: other.web_fetch('https://example.com/big'), repeat)
+
+        cache.ttls['fetch'] = 0
+        stale = timed(lambda: cached.web_fetch('https://example.com/big'), repeat)
+        stats = cache.stats()
+
+    return {
+        'cold_fetch_s': round(cold, 6),
+        'warm_fetch_median_s': warm['median_s'],
+        'other_process_median_s': shared['median_s'],
+        'revalidate_median_s': stale['median_s'],
+        'compression_ratio': round(len(client.content) / stats['disk_bytes'], 1),
+        'requests_sent': client.requests,
+        'revalidated': stats['revalidated'],
+    }
+
+
+def cold_start(stub: StubOllamaServer, reruns: int = 10) -> Dict[str, Any]:
+    """Cold import time of the helper packages and per-rerun cost of the Home.py navigation"""
+    import os
+
+    from streamlit.testing.v1 import AppTest
+
+    from .import_times import import_report
+
+    result: Dict[str, Any] = {}
+    for module in ('lib.helper_ollama', 'lib.helper_streamlit'):
+        report = import_report(module, top=0)
+        label = module.rsplit('.', 1)[-1]
+        result[f'{label}_import_ms'] = report.get('total_ms')
+        result[f'{label}_numpy_loaded'] = report.get('numpy_loaded')
+
+    os.environ['OLLAMA_HOST'] = stub.host
+    app = AppTest.from_file(str(ROOT / 'Home.py'), default_timeout=30)
+    started = time.perf_counter()
+    app.run()
+    result['home_first_run_s'] = round(time.perf_counter() - started, 6)
+    result['home_rerun_median_s'] = timed(app.run, reruns)['median_s']
+    return result
+
+
+SCENARIOS: Dict[str, Callable[[StubOllamaServer], Dict[str, Any]]] = {
+    'streaming_parse': streaming_parse,
+    'catalog_lookups': catalog_lookups,
+    'embedding_batching': embedding_batching,
+    'browser_pages': browser_pages,
+    'agent_loop': agent_loop,
+    'web_cache': web_cache,
+    'cold_start': cold_start,
+}
@@ -0,0 +1,247 @@
+"""
+Stub Ollama Server
+
+A local HTTP server that mimics the Ollama endpoints the helpers use
+(`/api/chat`, `/api/generate`, `/api/embed`, `/api/tags`, `/api/ps`,
+`/api/show` and `/api/pull`) with configurable latency, token rate and
+payload sizes, so the client-side cost of the helpers can be measured
+without a GPU or a real model.
+"""
+
+import json
+import threading
+import time
+
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stub server"""
+
+    latency_s: float = 0.0          # Delay before the first byte of every response
+    token_rate: float = 0.0         # Streamed tokens per second (0 = as fast as possible)
+    tokens: int = 256               # Tokens per chat/generate response
+    token_text: str = 'token '      # Text of one token
+    embedding_dim: int = 768        # Length of each embedding vector
+    models: int = 50                # Number of models listed by /api/tags
+    running: int = 2                # Number of models listed by /api/ps
+    pull_steps: int = 100           # Progress messages streamed by /api/pull
+    tool_turns: int = 1             # Chat turns answered with tool calls when tools are offered
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _tool_calls(tools) -> list:
+    """Call every offered tool once with placeholder arguments"""
+    samples = {'integer': 1, 'number': 1.5, 'boolean': True}
+    calls = []
+    for tool in tools:
+        function = tool.get('function', {})
+        properties = (function.get('parameters') or {}).get('properties') or {}
+        calls.append({'function': {
+            'name': function.get('name', ''),
+            'arguments': {name: samples.get(spec.get('type'), 'x') for name, spec in properties.items()},
+        }})
+    return calls
+
+
+def _model_record(i: int) -> Dict[str, Any]:
+    return {
+        'name': f'model-{i}:latest',
+        'model': f'model-{i}:latest',
+        'size': 1_000_000_000 + i,
+        'digest': f'{i:064x}',
+        'modified_at': '2024-01-01T00:00:00Z',
+        'details': {
+            'format': 'gguf',
+            'family': 'llama',
+            'families': ['llama'],
+            'parameter_size': '8B',
+            'quantization_level': 'Q4_K_M',
+        },
+    }
+
+
+class StubOllamaServer:
+    """Threaded stub server; use as a context manager or call start()/stop()"""
+
+    def __init__(self, config: Optional[StubConfig] = None, port: int = 0):
+        """
+        Initialize the server
+
+        Args:
+            config: Stub behaviour (defaults to StubConfig())
+            port: Port to listen on (0 picks a free port)
+        """
+        self.config = config or StubConfig()
+        self.requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        """Base URL to pass as OllamaHelper(host=...)"""
+        return f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def start(self) -> 'StubOllamaServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stub-ollama', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'StubOllamaServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _count(self, path: str) -> None:
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _json(self, payload: Dict[str, Any]) -> None:
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self, chunks) -> None:
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                interval = 1.0 / stub.config.token_rate if stub.config.token_rate else 0.0
+                for chunk in chunks:
+                    data = (json.dumps(chunk) + '\n').encode('utf-8')
+                    self.wfile.write(f'{len(data):x}\r\n'.encode() + data + b'\r\n')
+                    if interval:
+                        time.sleep(interval)
+                self.wfile.write(b'0\r\n\r\n')
+
+            def _final(self, model: str) -> Dict[str, Any]:
+                config = stub.config
+                eval_duration = int(config.tokens / config.token_rate * 1e9) if config.token_rate else 1_000_000
+                return {
+                    'model': model,
+                    'created_at': '2024-01-01T00:00:00Z',
+                    'done': True,
+                    'done_reason': 'stop',
+                    'total_duration': eval_duration + int(config.latency_s * 1e9),
+                    'load_duration': 1_000_000,
+                    'prompt_eval_count': 16,
+                    'prompt_eval_duration': 2_000_000,
+                    'eval_count': config.tokens,
+                    'eval_duration': eval_duration,
+                }
+
+            def do_GET(self):
+                stub._count(self.path)
+                time.sleep(stub.config.latency_s)
+                if self.path == '/api/tags':
+                    self._json({'models': [_model_record(i) for i in range(stub.config.models)]})
+                elif self.path == '/api/ps':
+                    self._json({'models': [
+                        {**_model_record(i), 'size_vram': 1, 'expires_at': '2099-01-01T00:00:00Z'}
+                        for i in range(stub.config.running)
+                    ]})
+                elif self.path == '/api/version':
+                    self._json({'version': '0.0.0-stub'})
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                stub._count(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'{}')
+                time.sleep(stub.config.latency_s)
+
+                config = stub.config
+                model = body.get('model', 'model-0:latest')
+                stream = body.get('stream', True)
+
+                if self.path in ('/api/chat', '/api/generate'):
+                    chat = self.path == '/api/chat'
+
+                    def chunk(text: str) -> Dict[str, Any]:
+                        if chat:
+                            return {'model': model, 'done': False, 'message': {'role': 'assistant', 'content': text}}
+                        return {'model': model, 'done': False, 'response': text}
+
+                    final = self._final(model)
+                    if chat:
+                        final['message'] = {'role': 'assistant', 'content': ''}
+                        # Tool turns: answer with tool calls until enough tool results came back
+                        tool_results = sum(1 for m in body.get('messages', []) if m.get('role') == 'tool')
+                        turns = tool_results // max(1, len(body.get('tools') or [None]))
+                        if body.get('tools') and turns < config.tool_turns:
+                            final['message']['tool_calls'] = _tool_calls(body['tools'])
+                    else:
+                        final['response'] = ''
+
+                    if stream:
+                        self._stream([chunk(config.token_text) for _ in range(config.tokens)] + [final])
+                    else:
+                        if config.token_rate:
+                            time.sleep(config.tokens / config.token_rate)
+                        text = config.token_text * config.tokens
+                        if chat:
+                            final['message']['content'] = text
+                        else:
+                            final['response'] = text
+                        self._json(final)
+
+                elif self.path == '/api/embed':
+                    inputs = body.get('input', '')
+                    inputs = [inputs] if isinstance(inputs, str) else inputs
+                    self._json({
+                        'model': model,
+                        'embeddings': [
+                            [((len(text) + j) % 97) / 97.0 for j in range(config.embedding_dim)]
+                            for text in inputs
+                        ],
+                    })
+
+                elif self.path == '/api/show':
+                    self._json({
+                        'modelfile': '# stub',
+                        'parameters': 'stop "<|eot|>"',
+                        'template': '{{ .Prompt }}',
+                        'details': _model_record(0)['details'],
+                        'modified_at': '2024-01-01T00:00:00Z',
+                        'capabilities': ['completion'],
+                    })
+
+                elif self.path == '/api/pull':
+                    steps = [
+                        {'status': 'pulling', 'digest': 'sha256:stub', 'total': config.pull_steps, 'completed': i}
+                        for i in range(config.pull_steps)
+                    ] + [{'status': 'success'}]
+                    if stream:
+                        self._stream(steps)
+                    else:
+                        self._json(steps[-1])
+
+                else:
+                    self.send_error(404)
+
+        return Handler
@@ -5,68 +5,232 @@ This module provides convenient wrapper functions for the Ollama SDK,
 including model management, chat, generation, embeddings, and more.
 """
 
-from ollama import (
-    Client,
-    AsyncClient,
-    chat,
-    generate,
-    embed,
-    pull,
-    push,
-    create,
-    delete,
-    copy,
-    show,
-    list as list_models,
-    ps,
-)
-from typing import Dict, List, Any, Optional, Iterator, Union
+from ollama import Client, AsyncClient
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Iterator, Union
 
 import asyncio
+import importlib
+import threading
+
+from .catalog import ModelCatalog, get_catalog, invalidate_host, DEFAULT_CATALOG_TTL
+from .clients import PoolConfig, DEFAULT_POOL_CONFIG, get_client, get_async_client, close_clients
+from .backends import Backend, BackendPool, NoBackendAvailable
+from .cache_dir import DEFAULT_CACHE_DIR
+from .context import ContextManager, estimate_tokens
+from .prefix import ChatSession, PrefillTracker, normalize_message, DEFAULT_KEEP_ALIVE
+from .response_cache import ResponseCache, get_response_cache, is_deterministic, request_key
+from .singleflight import SingleFlight, get_single_flight
+from .event_loop import BackgroundLoop, get_background_loop
+from .compare import ModelResult, astream_compare, acompare
+from .batch import BatchRunner, BatchReport, read_jsonl, DEFAULT_BATCH_CONCURRENCY
+from .metrics import MetricsRegistry, get_metrics, instrumented, start_metrics_server
+from .tool_executor import ToolExecutor, ToolResult, tool_call_parts, get_tool_thread_pool, DEFAULT_TOOL_TIMEOUT
+from .tool_registry import (
+    ToolRegistry, ToolArgumentError, compile_tool, compile_tools, tool_schema, validate_arguments, source_hash,
+)
+from .agent import AgentLoop, AgentEvent, AgentResult, DEFAULT_MAX_ITERATIONS
+from .web_cache import (
+    WebCache, CachedWebClient, get_web_cache, get_web_client, web_key, web_search, web_fetch,
+    DEFAULT_FETCH_TTL, DEFAULT_SEARCH_TTL,
+)
+
+if TYPE_CHECKING:
+    from .embeddings import BatchEmbedder, EmbeddingCache, get_default_cache
+    from .vector_index import VectorIndex
+
+# NumPy-backed names are imported on first access to keep the cold start fast
+_LAZY_IMPORTS = {
+    'BatchEmbedder': '.embeddings',
+    'EmbeddingCache': '.embeddings',
+    'get_default_cache': '.embeddings',
+    'text_hash': '.embeddings',
+    'VectorIndex': '.vector_index',
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
 
 
 class OllamaHelper:
     """Main helper class for Ollama operations"""
     
-    def __init__(self, host: Optional[str] = None):
+    def __init__(self, host: Optional[str] = None,
+                 catalog_ttl: float = DEFAULT_CATALOG_TTL,
+                 pool_config: PoolConfig = DEFAULT_POOL_CONFIG,
+                 hosts: Optional[List[str]] = None,
+                 context_window: Optional[ContextManager] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 single_flight: Optional[SingleFlight] = None,
+                 metrics: Optional[MetricsRegistry] = None):
         """
         Initialize Ollama helper
         
         Args:
             host: Optional Ollama server host (e.g., 'http://localhost:11434')
+            catalog_ttl: Seconds the shared model catalog is cached
+            pool_config: Connection pool and timeout settings of the shared client
+            hosts: Optional list of hosts; chat, generate and embed are then
+                routed across them by a BackendPool (model management uses
+                `host`, or the first of `hosts` if `host` is not given)
+            context_window: Optional ContextManager applied to every chat
+            response_cache: Optional ResponseCache for deterministic chat and
+                generate calls (temperature 0 or a fixed seed)
+            single_flight: SingleFlight collapsing identical concurrent
+                requests (defaults to the process-wide one)
+            metrics: MetricsRegistry recording every call (defaults to the
+                process-wide one)
+        """
+        if hosts and not host:
+            host = hosts[0]
+        self.host = host
+        self.pool_config = pool_config
+        self.client: Client = get_client(host, pool_config)
+        self.pool: Optional[BackendPool] = BackendPool(hosts, pool_config) if hosts else None
+        self._embedder: Optional['BatchEmbedder'] = None
+        self.context_window = context_window
+        self.response_cache = response_cache
+        self.single_flight = single_flight or get_single_flight()
+        self.metrics = metrics or get_metrics()
+        self.catalog: ModelCatalog = get_catalog(host, self._fetch_models, ttl=catalog_ttl)
+    
+    @property
+    def async_client(self) -> AsyncClient:
+        """Shared AsyncClient for this host and the running event loop"""
+        return get_async_client(self.host, self.pool_config)
+    
+    def _dispatch(self, model: Optional[str], fn, stream: bool = False) -> Any:
+        """Run a request on the client, or on the best backend if pooled"""
+        if self.pool is None:
+            return fn(self.client)
+        return self.pool.call(model, fn, stream=stream)
+    
+    async def _adispatch(self, model: Optional[str], fn, stream: bool = False) -> Any:
+        """Async variant of `_dispatch`"""
+        if self.pool is None:
+            return await fn(self.async_client)
+        return await self.pool.acall(model, fn, stream=stream)
+    
+    def model_digest(self, model: str) -> str:
+        """Digest identifying the model weights, falling back to the name"""
+        try:
+            record = self.catalog.get(model)
+        except Exception:
+            record = None
+        return record['digest'] if record and record.get('digest') else f'name:{model}'
+    
+    def _request_key(self, endpoint: str, kwargs: Dict[str, Any], cache: Optional[bool]) -> Optional[str]:
+        """Key of a deterministic chat/generate request, or None if it may not be shared"""
+        if cache is False:
+            return None
+        if cache is None and not is_deterministic(kwargs.get('options')):
+            return None
+        return request_key(endpoint, self.model_digest(kwargs['model']), kwargs)
+    
+    def _cached(self, endpoint: str, kwargs: Dict[str, Any], cache: Optional[bool]) -> Any:
+        """Run a chat/generate request through the response cache and single-flight"""
+        request = lambda: self._dispatch(
+            kwargs['model'], lambda client: getattr(client, endpoint)(**kwargs), stream=kwargs['stream']
+        )
+        key = self._request_key(endpoint, kwargs, cache)
+        if key is None:
+            return request()
+        if self.response_cache is not None:
+            call = lambda: self.response_cache.call(endpoint, key, request, kwargs['stream'])
+        else:
+            call = request
+        # Streams are consumed by one caller only and are never coalesced
+        return call() if kwargs['stream'] else self.single_flight.do(key, call)
+    
+    async def _acached(self, endpoint: str, kwargs: Dict[str, Any], cache: Optional[bool]) -> Any:
+        """Async variant of `_cached`"""
+        request = lambda: self._adispatch(
+            kwargs['model'], lambda client: getattr(client, endpoint)(**kwargs), stream=kwargs['stream']
+        )
+        key = self._request_key(endpoint, kwargs, cache)
+        if key is None:
+            return await request()
+        if self.response_cache is not None:
+            call = lambda: self.response_cache.acall(endpoint, key, request, kwargs['stream'])
+        else:
+            call = request
+        return await (call() if kwargs['stream'] else self.single_flight.ado(key, call))
+    
+    def single_flight_stats(self) -> Dict[str, Any]:
+        """
+        Get request coalescing statistics
+        
+        Returns:
+            Dictionary with calls, executed requests and collapsed duplicates
+        """
+        return self.single_flight.stats()
+    
+    def response_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get response cache statistics
+        
+        Returns:
+            Dictionary with hits, misses and sizes (empty without a cache)
         """
-        self.client = Client(host=host) if host else Client()
-        self.async_client = AsyncClient(host=host) if host else AsyncClient()
+        return self.response_cache.stats() if self.response_cache else {}
+    
+    def metrics_snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Get latency and throughput per endpoint and model
+        
+        Returns:
+            List of dictionaries with request counts, percentiles and tokens/sec
+        """
+        return self.metrics.snapshot()
+    
+    def backend_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get the routing state of each backend host
+        
+        Returns:
+            List of backend dictionaries (empty without a backend pool)
+        """
+        return self.pool.stats() if self.pool else []
     
     # ==================== Model Management ====================
     
+    def _fetch_models(self) -> List[Dict[str, Any]]:
+        """Load the installed models from the server (uncached)"""
+        response = self.single_flight.do(('list', self.host), self.client.list)
+
+        return [
+            {
+                'name': model.model,
+                'name_short': model.model.replace(":latest", ""),
+                'size': model.size,
+                'size_mb': round(model.size / 1024 / 1024, 2),
+                'modified_at': model.modified_at,
+                'digest': model.digest,
+                'details': {
+                    'format': model.details.format if model.details else None,
+                    'family': model.details.family if model.details else None,
+                    'parameter_size': model.details.parameter_size if model.details else None,
+                    'quantization_level': model.details.quantization_level if model.details else None,
+                } if model.details else None
+            }
+            for model in response.models
+        ]
+    
+    @instrumented('list')
     def list_models(self) -> List[Dict[str, Any]]:
         """
-        List all installed models
+        List all installed models (served from the shared model catalog)
         
         Returns:
             List of model dictionaries with name, size, and details
         """
         try:
-            response = list_models()
-
-            return [
-                {
-                    'name': model.model,
-                    'name_short': model.model.replace(":latest", ""),
-                    'size': model.size,
-                    'size_mb': round(model.size / 1024 / 1024, 2),
-                    'modified_at': model.modified_at,
-                    'digest': model.digest,
-                    'details': {
-                        'format': model.details.format if model.details else None,
-                        'family': model.details.family if model.details else None,
-                        'parameter_size': model.details.parameter_size if model.details else None,
-                        'quantization_level': model.details.quantization_level if model.details else None,
-                    } if model.details else None
-                }
-                for model in response.models
-            ]
+            return self.catalog.models()
         except Exception as e:
             return []
     
@@ -77,9 +241,38 @@ class OllamaHelper:
         Returns:
             List of model name strings
         """
-        models = self.list_models()
-        return [model['name'] for model in models]
+        try:
+            return self.catalog.names()
+        except Exception as e:
+            return []
+    
+    def refresh_models(self) -> List[Dict[str, Any]]:
+        """
+        Invalidate the model catalog and reload it from the server
+        
+        Returns:
+            List of model dictionaries
+        """
+        invalidate_host(self.host)
+        return self.list_models()
+    
+    def catalog_stats(self) -> Dict[str, Any]:
+        """
+        Get model catalog cache statistics
+        
+        Returns:
+            Dictionary with hits, misses and hit rate
+        """
+        return self.catalog.stats()
     
+    def _invalidate_after(self, progress: Iterator) -> Iterator:
+        """Yield streamed progress and invalidate the catalog once it ends"""
+        try:
+            yield from progress
+        finally:
+            invalidate_host(self.host)
+    
+    @instrumented('pull')
     def pull_model(self, model_name: str, stream: bool = True) -> Union[Dict, Iterator]:
         """
         Pull/download a model from the Ollama library
@@ -91,8 +284,14 @@ class OllamaHelper:
         Returns:
             Progress updates if stream=True, else final response
         """
-        return pull(model_name, stream=stream)
+        if stream:
+            return self._invalidate_after(self.client.pull(model_name, stream=True))
+        try:
+            return self.client.pull(model_name, stream=False)
+        finally:
+            invalidate_host(self.host)
     
+    @instrumented('delete')
     def delete_model(self, model_name: str) -> Dict[str, Any]:
         """
         Delete a model from local storage
@@ -104,11 +303,13 @@ class OllamaHelper:
             Response dictionary
         """
         try:
-            response = delete(model_name)
+            response = self.client.delete(model_name)
+            invalidate_host(self.host)
             return {'success': True, 'message': f'Model {model_name} deleted'}
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    @instrumented('copy')
     def copy_model(self, source: str, destination: str) -> Dict[str, Any]:
         """
         Copy a model to a new name
@@ -121,11 +322,13 @@ class OllamaHelper:
             Response dictionary
         """
         try:
-            copy(source, destination)
+            self.client.copy(source, destination)
+            invalidate_host(self.host)
             return {'success': True, 'message': f'Model copied from {source} to {destination}'}
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    @instrumented('create')
     def create_model(self, name: str, from_model: str, system: Optional[str] = None, 
                      modelfile: Optional[str] = None, stream: bool = False) -> Any:
         """
@@ -151,8 +354,14 @@ class OllamaHelper:
             kwargs['modelfile'] = modelfile
         kwargs['stream'] = stream
         
-        return self.client.create(**kwargs)
+        if stream:
+            return self._invalidate_after(self.client.create(**kwargs))
+        try:
+            return self.client.create(**kwargs)
+        finally:
+            invalidate_host(self.host)
     
+    @instrumented('show')
     def show_model(self, model_name: str) -> Dict[str, Any]:
         """
         Get detailed information about a model
@@ -164,7 +373,9 @@ class OllamaHelper:
             Model details dictionary
         """
         try:
-            response = show(model_name)
+            response = self.single_flight.do(
+                ('show', self.host, model_name), lambda: self.client.show(model_name)
+            )
             return {
                 'name': model_name,
                 'modified_at': response.modified_at,
@@ -184,6 +395,7 @@ class OllamaHelper:
         except Exception as e:
             return {'error': str(e)}
     
+    @instrumented('ps')
     def list_running_models(self) -> List[Dict[str, Any]]:
         """
         List currently running/loaded models
@@ -192,7 +404,7 @@ class OllamaHelper:
             List of running model details
         """
         try:
-            response = ps()
+            response = self.client.ps()
             return [
                 {
                     'name': model.model,
@@ -211,8 +423,30 @@ class OllamaHelper:
     
     # ==================== Chat ====================
     
+    def fit_context(self, messages: List[Dict[str, Any]],
+                    context_window: Union[ContextManager, bool, None] = None) -> List[Dict[str, Any]]:
+        """
+        Trim messages to the context budget, if a context manager is set
+        
+        Args:
+            messages: Chat messages
+            context_window: Optional ContextManager overriding the helper's one
+                (False sends the messages unchanged)
+            
+        Returns:
+            Messages that will be sent to the model
+        """
+        if context_window is False:
+            return messages
+        manager = context_window or self.context_window
+        return manager.fit(messages) if manager else messages
+    
+    @instrumented('chat')
     def chat(self, model: str, messages: List[Dict[str, Any]], 
-             stream: bool = False, **options) -> Any:
+             stream: bool = False, context_window: Union[ContextManager, bool, None] = None,
+             keep_alive: Optional[Union[float, str]] = None,
+             format: Optional[Union[str, Dict[str, Any]]] = None,
+             cache: Optional[bool] = None, **options) -> Any:
         """
         Chat with a model
         
@@ -220,18 +454,26 @@ class OllamaHelper:
             model: Model name
             messages: List of message dictionaries with 'role' and 'content'
             stream: Whether to stream the response
+            context_window: Optional ContextManager overriding the helper's one
+                (False disables it for this call)
+            keep_alive: Optional time the model stays loaded (e.g. '30m', -1)
+            format: Optional output format ('json' or a JSON schema)
+            cache: Use the response cache (None caches deterministic calls only)
             **options: Additional options (temperature, etc.)
             
         Returns:
             Chat response or stream iterator
         """
-        kwargs = {'model': model, 'messages': messages, 'stream': stream}
-        if options:
-            kwargs['options'] = options
-        return chat(**kwargs)
+        messages = self.fit_context(messages, context_window)
+        kwargs = self._request('chat', model, messages, stream, keep_alive, format, options)
+        return self._cached('chat', kwargs, cache)
     
+    @instrumented('chat')
     async def async_chat(self, model: str, messages: List[Dict[str, Any]], 
-                         stream: bool = False, **options) -> Any:
+                         stream: bool = False, context_window: Union[ContextManager, bool, None] = None,
+                         keep_alive: Optional[Union[float, str]] = None,
+                         format: Optional[Union[str, Dict[str, Any]]] = None,
+                         cache: Optional[bool] = None, **options) -> Any:
         """
         Async chat with a model
         
@@ -239,20 +481,29 @@ class OllamaHelper:
             model: Model name
             messages: List of message dictionaries
             stream: Whether to stream the response
+            context_window: Optional ContextManager overriding the helper's one
+                (False disables it for this call)
+            keep_alive: Optional time the model stays loaded (e.g. '30m', -1)
+            format: Optional output format ('json' or a JSON schema)
+            cache: Use the response cache (None caches deterministic calls only)
             **options: Additional options
             
         Returns:
             Async chat response or stream iterator
         """
-        kwargs = {'model': model, 'messages': messages, 'stream': stream}
-        if options:
-            kwargs['options'] = options
-        return await self.async_client.chat(**kwargs)
+        messages = self.fit_context(messages, context_window)
+        kwargs = self._request('chat', model, messages, stream, keep_alive, format, options)
+        return await self._acached('chat', kwargs, cache)
     
     # ==================== Generate ====================
     
+    @instrumented('generate')
     def generate(self, model: str, prompt: str, stream: bool = False,
-                 images: Optional[List] = None, **options) -> Any:
+                 images: Optional[List] = None, suffix: Optional[str] = None,
+                 system: Optional[str] = None,
+                 keep_alive: Optional[Union[float, str]] = None,
+                 format: Optional[Union[str, Dict[str, Any]]] = None,
+                 cache: Optional[bool] = None, **options) -> Any:
         """
         Generate text from a prompt
         
@@ -261,20 +512,32 @@ class OllamaHelper:
             prompt: Input prompt
             stream: Whether to stream the response
             images: Optional list of images (for multimodal models)
+            suffix: Optional text after the completion (fill-in-the-middle)
+            system: Optional system prompt
+            keep_alive: Optional time the model stays loaded (e.g. '30m', -1)
+            format: Optional output format ('json' or a JSON schema)
+            cache: Use the response cache (None caches deterministic calls only)
             **options: Additional options
             
         Returns:
             Generation response or stream iterator
         """
-        kwargs = {'model': model, 'prompt': prompt, 'stream': stream}
+        kwargs = self._request('generate', model, prompt, stream, keep_alive, format, options)
         if images:
             kwargs['images'] = images
-        if options:
-            kwargs['options'] = options
-        return generate(**kwargs)
+        if suffix:
+            kwargs['suffix'] = suffix
+        if system:
+            kwargs['system'] = system
+        return self._cached('generate', kwargs, cache)
     
+    @instrumented('generate')
     async def async_generate(self, model: str, prompt: str, stream: bool = False,
-                            images: Optional[List] = None, **options) -> Any:
+                            images: Optional[List] = None, suffix: Optional[str] = None,
+                            system: Optional[str] = None,
+                            keep_alive: Optional[Union[float, str]] = None,
+                            format: Optional[Union[str, Dict[str, Any]]] = None,
+                            cache: Optional[bool] = None, **options) -> Any:
         """
         Async generate text from a prompt
         
@@ -283,20 +546,43 @@ class OllamaHelper:
             prompt: Input prompt
             stream: Whether to stream
             images: Optional images
+            suffix: Optional text after the completion (fill-in-the-middle)
+            system: Optional system prompt
+            keep_alive: Optional time the model stays loaded (e.g. '30m', -1)
+            format: Optional output format ('json' or a JSON schema)
+            cache: Use the response cache (None caches deterministic calls only)
             **options: Additional options
             
         Returns:
             Async generation response or stream iterator
         """
-        kwargs = {'model': model, 'prompt': prompt, 'stream': stream}
+        kwargs = self._request('generate', model, prompt, stream, keep_alive, format, options)
         if images:
             kwargs['images'] = images
+        if suffix:
+            kwargs['suffix'] = suffix
+        if system:
+            kwargs['system'] = system
+        return await self._acached('generate', kwargs, cache)
+    
+    @staticmethod
+    def _request(endpoint: str, model: str, payload: Any, stream: bool,
+                 keep_alive: Optional[Union[float, str]],
+                 format: Optional[Union[str, Dict[str, Any]]],
+                 options: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the keyword arguments of a chat or generate request"""
+        kwargs = {'model': model, 'messages' if endpoint == 'chat' else 'prompt': payload, 'stream': stream}
+        if keep_alive is not None:
+            kwargs['keep_alive'] = keep_alive
+        if format is not None:
+            kwargs['format'] = format
         if options:
             kwargs['options'] = options
-        return await self.async_client.generate(**kwargs)
+        return kwargs
     
     # ==================== Embeddings ====================
     
+    @instrumented('embed')
     def embed(self, model: str, input_text: Union[str, List[str]]) -> Dict[str, Any]:
         """
         Generate embeddings for text
@@ -308,8 +594,12 @@ class OllamaHelper:
         Returns:
             Embeddings response with 'embeddings' key
         """
-        return embed(model=model, input=input_text)
+        return self.single_flight.do(
+            self._embed_key(model, input_text),
+            lambda: self._dispatch(model, lambda client: client.embed(model=model, input=input_text)),
+        )
     
+    @instrumented('embed')
     async def async_embed(self, model: str, input_text: Union[str, List[str]]) -> Dict[str, Any]:
         """
         Async generate embeddings
@@ -321,25 +611,283 @@ class OllamaHelper:
         Returns:
             Async embeddings response
         """
-        return await self.async_client.embed(model=model, input=input_text)
+        return await self.single_flight.ado(
+            self._embed_key(model, input_text),
+            lambda: self._adispatch(model, lambda client: client.embed(model=model, input=input_text)),
+        )
+    
+    def _embed_key(self, model: str, input_text: Union[str, List[str]]) -> str:
+        """Single-flight key of an embed request"""
+        return request_key('embed', self.host or '', {'model': model, 'input': input_text})
+    
+    @property
+    def embedder(self) -> 'BatchEmbedder':
+        """Batch embedder backed by the shared on-disk vector cache"""
+        if self._embedder is None:
+            from .embeddings import BatchEmbedder, get_default_cache
+            self._embedder = BatchEmbedder(self, cache=get_default_cache())
+        return self._embedder
+    
+    @instrumented('embed_batch')
+    def embed_batch(self, model: str, texts: List[str], batch_size: Optional[int] = None,
+                    concurrency: Optional[int] = None):
+        """
+        Embed many texts in concurrent batches, reusing cached vectors
+        
+        Args:
+            model: Model name
+            texts: List of texts
+            batch_size: Optional number of texts per request
+            concurrency: Optional number of concurrent requests
+            
+        Returns:
+            float32 NumPy matrix with one row per text
+        """
+        return self.embedder.embed(model, texts, batch_size, concurrency)
+    
+    # ==================== Background Loop ====================
+    
+    @property
+    def loop(self) -> BackgroundLoop:
+        """Process-wide background event loop (started on first use)"""
+        return get_background_loop()
+    
+    def run(self, coro: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine (e.g. `helper.async_chat(...)`) from synchronous code
+        
+        The coroutine runs on the background loop, so its AsyncClient and
+        connections are reused across calls instead of per `asyncio.run()`.
+        
+        Args:
+            coro: Coroutine to run
+            timeout: Optional seconds to wait
+            
+        Returns:
+            Result of the coroutine
+        """
+        return self.loop.run(coro, timeout)
+    
+    def submit(self, coro: Any):
+        """
+        Start a coroutine on the background loop without waiting
+        
+        Args:
+            coro: Coroutine to run
+            
+        Returns:
+            concurrent.futures.Future with the result
+        """
+        return self.loop.submit(coro)
+    
+    def gather(self, *coros: Any, return_exceptions: bool = False) -> List[Any]:
+        """
+        Run coroutines concurrently on the background loop
+        
+        Args:
+            *coros: Coroutines to run
+            return_exceptions: Return exceptions as results instead of raising
+            
+        Returns:
+            Results in the order of `coros`
+        """
+        return self.loop.gather(*coros, return_exceptions=return_exceptions)
+    
+    def iterate(self, stream: Any) -> Iterator:
+        """
+        Consume an async stream from synchronous code
+        
+        Args:
+            stream: Async iterator, or a coroutine returning one
+                (e.g. `helper.async_chat(model, messages, stream=True)`)
+            
+        Returns:
+            Iterator yielding the chunks as they arrive
+        """
+        return self.loop.iterate(stream)
+    
+    # ==================== Model Comparison ====================
+    
+    def compare(self, models: List[str], messages: List[Dict[str, Any]],
+                options: Optional[Dict[str, Any]] = None) -> List[ModelResult]:
+        """
+        Send the same conversation to several models concurrently
+        
+        Args:
+            models: Model names
+            messages: Chat messages sent to every model
+            options: Model options sent to every model
+            
+        Returns:
+            One ModelResult (reply, TTFT, tokens/sec, eval_count,
+            load_duration, ...) per model
+        """
+        return self.run(acompare(self, models, messages, options))
+    
+    async def async_compare(self, models: List[str], messages: List[Dict[str, Any]],
+                            options: Optional[Dict[str, Any]] = None) -> List[ModelResult]:
+        """
+        Async variant of `compare`
+        
+        Args:
+            models: Model names
+            messages: Chat messages sent to every model
+            options: Model options sent to every model
+            
+        Returns:
+            One ModelResult per model
+        """
+        return await acompare(self, models, messages, options)
+    
+    def compare_stream(self, models: List[str], messages: List[Dict[str, Any]],
+                       options: Optional[Dict[str, Any]] = None) -> Iterator:
+        """
+        Stream a comparison, e.g. to render the replies side by side
+        
+        Args:
+            models: Model names
+            messages: Chat messages sent to every model
+            options: Model options sent to every model
+            
+        Returns:
+            Iterator of (model, text delta, ModelResult) events as tokens arrive
+        """
+        return self.iterate(astream_compare(self, models, messages, options))
+    
+    # ==================== Batch Processing ====================
+    
+    def run_batch(self, model: str, input_path: str, output_path: str,
+                  concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                  format: Optional[Union[str, Dict[str, Any]]] = None,
+                  **options) -> BatchReport:
+        """
+        Run a JSONL file of prompts with bounded concurrency
+        
+        Results are appended to `output_path` as they finish; running the
+        same batch again resumes after the records already in the output.
+        
+        Args:
+            model: Default model (records may override it)
+            input_path: Input JSONL with 'prompt' or 'messages' records
+            output_path: Output JSONL (doubles as the checkpoint)
+            concurrency: Maximum requests in flight
+            format: Optional output format ('json' or a JSON schema)
+            **options: Model options (temperature, etc.)
+            
+        Returns:
+            BatchReport with counts and throughput
+        """
+        runner = BatchRunner(self, model, concurrency=concurrency, options=options, format=format)
+        return runner.run(input_path, output_path)
     
     # ==================== Tools / Function Calling ====================
     
+    @instrumented('chat_tools')
     def chat_with_tools(self, model: str, messages: List[Dict[str, Any]], 
-                        tools: List, stream: bool = False) -> Any:
+                        tools: List, stream: bool = False,
+                        think: Optional[Union[bool, str]] = None, **options) -> Any:
         """
         Chat with function calling tools
         
         Args:
             model: Model name
             messages: Chat messages
-            tools: List of tool functions or schemas
+            tools: ToolRegistry or a list of tool functions and schemas
+                (functions are compiled to schemas once, not per request)
             stream: Whether to stream
+            think: Enable thinking (True/False or a level like 'low')
+            **options: Model options (temperature, num_predict, etc.)
             
         Returns:
             Chat response with potential tool calls
         """
-        return chat(model=model, messages=messages, tools=tools, stream=stream)
+        compiled = compile_tools(tools)
+        return self._dispatch(
+            model,
+            lambda client: client.chat(model=model, messages=messages, tools=compiled, stream=stream,
+                                       think=think, options=options or None),
+            stream=stream,
+        )
+    
+    @instrumented('chat_tools')
+    async def async_chat_with_tools(self, model: str, messages: List[Dict[str, Any]],
+                                    tools: List, stream: bool = False,
+                                    think: Optional[Union[bool, str]] = None, **options) -> Any:
+        """
+        Async chat with function calling tools
+        
+        Args:
+            model: Model name
+            messages: Chat messages
+            tools: ToolRegistry or a list of tool functions and schemas
+                (functions are compiled to schemas once, not per request)
+            stream: Whether to stream
+            think: Enable thinking (True/False or a level like 'low')
+            **options: Model options (temperature, num_predict, etc.)
+            
+        Returns:
+            Async chat response with potential tool calls or stream iterator
+        """
+        compiled = compile_tools(tools)
+        return await self._adispatch(
+            model,
+            lambda client: client.chat(model=model, messages=messages, tools=compiled, stream=stream,
+                                       think=think, options=options or None),
+            stream=stream,
+        )
+    
+    def run_tools(self, tools: Union[ToolRegistry, Dict[str, Any], List], tool_calls: List[Any],
+                  timeout: Optional[float] = DEFAULT_TOOL_TIMEOUT) -> List[ToolResult]:
+        """
+        Run the tool calls of one turn concurrently
+        
+        Args:
+            tools: ToolRegistry, or tool functions (list or name -> function mapping)
+            tool_calls: Tool calls from the model's message
+            timeout: Seconds per tool call (None for no limit)
+            
+        Returns:
+            One ToolResult per call in the original order; append
+            `result.to_message()` for each to the conversation
+        """
+        return self._tool_executor(tools, timeout).run(tool_calls)
+    
+    async def async_run_tools(self, tools: Union[ToolRegistry, Dict[str, Any], List], tool_calls: List[Any],
+                              timeout: Optional[float] = DEFAULT_TOOL_TIMEOUT) -> List[ToolResult]:
+        """
+        Async variant of `run_tools`
+        
+        Args:
+            tools: ToolRegistry, or tool functions (list or name -> function mapping)
+            tool_calls: Tool calls from the model's message
+            timeout: Seconds per tool call (None for no limit)
+            
+        Returns:
+            One ToolResult per call in the original order
+        """
+        return await self._tool_executor(tools, timeout).arun(tool_calls)
+    
+    @staticmethod
+    def _tool_executor(tools: Any, timeout: Optional[float]) -> ToolExecutor:
+        """Executor for `run_tools`; a ToolRegistry also validates the arguments"""
+        if isinstance(tools, ToolRegistry):
+            return tools.executor(timeout=timeout)
+        return ToolExecutor(tools, timeout=timeout)
+    
+    def agent(self, model: str, tools: Union[ToolRegistry, List], **kwargs) -> AgentLoop:
+        """
+        Create an agent loop for a tool-calling model
+        
+        Args:
+            model: Model name
+            tools: ToolRegistry, or tool functions and/or schema dictionaries
+            **kwargs: AgentLoop settings (max_iterations, max_tokens, think,
+                tool_timeout, format_result, model options, ...)
+            
+        Returns:
+            AgentLoop; iterate `stream(messages)` for events or call `run(messages)`
+        """
+        return AgentLoop(self, model, tools, **kwargs)
     
     # ==================== Utility Functions ====================
     
@@ -353,8 +901,10 @@ class OllamaHelper:
         Returns:
             True if installed, False otherwise
         """
-        installed_models = self.get_model_names()
-        return model_name in installed_models
+        try:
+            return model_name in self.catalog
+        except Exception:
+            return False
     
     def get_model_size(self, model_name: str) -> Optional[float]:
         """
@@ -366,11 +916,11 @@ class OllamaHelper:
         Returns:
             Size in MB or None if not found
         """
-        models = self.list_models()
-        for model in models:
-            if model['name'] == model_name:
-                return model['size_mb']
-        return None
+        try:
+            model = self.catalog.get(model_name)
+        except Exception:
+            return None
+        return model['size_mb'] if model else None
     
     def ensure_model(self, model_name: str) -> bool:
         """
@@ -395,19 +945,30 @@ class OllamaHelper:
 
 
 # Convenience functions for direct use
-_helper = OllamaHelper()
+_helper: Optional[OllamaHelper] = None
+_helper_lock = threading.Lock()
+
+
+def get_helper() -> OllamaHelper:
+    """Get the module-level helper, creating it on first use"""
+    global _helper
+    with _helper_lock:
+        if _helper is None:
+            _helper = OllamaHelper()
+        return _helper
+
 
 def get_installed_models() -> List[str]:
-    return _helper.get_model_names()
+    return get_helper().get_model_names()
 
 def get_model_details() -> List[Dict[str, Any]]:
-    return _helper.list_models()
+    return get_helper().list_models()
 
 def pull_model(model_name: str, stream: bool = True):
-    return _helper.pull_model(model_name, stream)
+    return get_helper().pull_model(model_name, stream)
 
 def delete_model(model_name: str) -> Dict[str, Any]:
-    return _helper.delete_model(model_name)
+    return get_helper().delete_model(model_name)
 
 def is_model_installed(model_name: str) -> bool:
-    return _helper.is_model_installed(model_name)
+    return get_helper().is_model_installed(model_name)
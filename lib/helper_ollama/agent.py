@@ -0,0 +1,216 @@
+"""
+Agent Loop
+
+The tool pages all run the same loop: chat with tools, execute the tool
+calls, append the results and chat again until the model answers without
+calling a tool. `AgentLoop` implements that loop once. Tools are kept in a
+`ToolRegistry`, so schemas are compiled from the Python functions a single
+time and arguments are checked before dispatch; replies are streamed, the
+tool calls of a turn run concurrently through `ToolExecutor`, and the loop
+stops at an iteration or token budget. Progress is reported as `AgentEvent`s, which a UI can render as
+they arrive.
+"""
+
+import time
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from .tool_executor import ToolResult, tool_call_parts, DEFAULT_TOOL_TIMEOUT
+from .tool_registry import ToolRegistry
+
+if TYPE_CHECKING:
+    from . import OllamaHelper
+
+
+DEFAULT_MAX_ITERATIONS = 5
+
+
+@dataclass
+class AgentResult:
+    """Outcome of an agent run"""
+
+    content: str = ''
+    thinking: str = ''
+    messages: List[Any] = field(default_factory=list)
+    iterations: int = 0
+    tool_calls: int = 0
+    eval_tokens: int = 0
+    prompt_tokens: int = 0
+    stop_reason: str = ''           # complete, max_iterations, token_budget or error
+    error: Optional[str] = None
+    elapsed_s: float = 0.0
+
+
+@dataclass
+class AgentEvent:
+    """
+    One step of an agent run
+
+    Types:
+        iteration: A new model turn starts
+        thinking / content: Streamed text delta in `text`
+        tool_call: The model requested `name` with `arguments`
+        tool_result: A tool finished; `result` holds the ToolResult and
+            `text` the content sent back to the model
+        error: The chat request failed (`text` holds the message)
+        done: The run ended; `result` holds the AgentResult
+    """
+
+    type: str
+    iteration: int
+    text: str = ''
+    name: str = ''
+    arguments: Optional[Dict[str, Any]] = None
+    result: Optional[Union[ToolResult, AgentResult]] = None
+
+
+class AgentLoop:
+    """Chat, tool dispatch and budgets for a tool-calling model"""
+
+    def __init__(self, helper: 'OllamaHelper', model: str,
+                 tools: Union[ToolRegistry, Iterable[Union[Callable, Dict[str, Any]]]],
+                 functions: Optional[Dict[str, Callable]] = None,
+                 max_iterations: int = DEFAULT_MAX_ITERATIONS,
+                 max_tokens: Optional[int] = None,
+                 think: Optional[Union[bool, str]] = None,
+                 tool_timeout: Optional[float] = DEFAULT_TOOL_TIMEOUT,
+                 tool_timeouts: Optional[Dict[str, float]] = None,
+                 format_result: Optional[Callable[[ToolResult], str]] = None,
+                 max_result_chars: Optional[int] = None,
+                 **options):
+        """
+        Initialize the loop
+
+        Args:
+            helper: OllamaHelper used for the chat requests
+            model: Model name
+            tools: ToolRegistry, or tool functions and/or schema dictionaries
+                offered to the model
+            functions: Implementations of schema-only tools (name -> function);
+                tool functions in `tools` are added automatically (ignored
+                when `tools` is a ToolRegistry)
+            max_iterations: Maximum model turns
+            max_tokens: Budget of generated tokens over all turns
+            think: Enable thinking (True/False or a level like 'low')
+            tool_timeout: Seconds per tool call (None for no limit)
+            tool_timeouts: Per-tool overrides of `tool_timeout`
+            format_result: Builds the tool message text from a ToolResult
+                (defaults to `result.content`)
+            max_result_chars: Truncate tool messages to this many characters
+            **options: Model options (temperature, etc.)
+        """
+        if not isinstance(tools, ToolRegistry):
+            tools = ToolRegistry(tools, functions)
+        self.helper = helper
+        self.model = model
+        self.registry = tools
+        self.executor = tools.executor(timeout=tool_timeout, timeouts=tool_timeouts)
+        self.max_iterations = max_iterations
+        self.max_tokens = max_tokens
+        self.think = think
+        self.format_result = format_result
+        self.max_result_chars = max_result_chars
+        self.options = options
+
+    def _tool_message(self, result: ToolResult) -> Dict[str, Any]:
+        content = self.format_result(result) if self.format_result and result.ok else result.content
+        if self.max_result_chars is not None:
+            content = content[:self.max_result_chars]
+        return result.to_message(content)
+
+    def stream(self, messages: List[Any]) -> Iterator[AgentEvent]:
+        """
+        Run the loop, yielding events as they happen
+
+        Args:
+            messages: Conversation so far; assistant and tool messages are
+                appended to this list in place
+
+        Returns:
+            Iterator of AgentEvents, ending with a 'done' event
+        """
+        started = time.perf_counter()
+        result = AgentResult(messages=messages)
+
+        while True:
+            if result.iterations >= self.max_iterations:
+                result.stop_reason = 'max_iterations'
+                break
+            if self.max_tokens is not None and result.eval_tokens >= self.max_tokens:
+                result.stop_reason = 'token_budget'
+                break
+
+            result.iterations += 1
+            iteration = result.iterations
+            yield AgentEvent('iteration', iteration)
+
+            options = dict(self.options)
+            if self.max_tokens is not None:
+                options['num_predict'] = self.max_tokens - result.eval_tokens
+
+            thinking: List[str] = []
+            content: List[str] = []
+            tool_calls: List[Any] = []
+            try:
+                stream = self.helper.chat_with_tools(
+                    self.model, messages, self.registry, stream=True, think=self.think, **options
+                )
+                for chunk in stream:
+                    message = chunk.message
+                    if message.thinking:
+                        thinking.append(message.thinking)
+                        yield AgentEvent('thinking', iteration, text=message.thinking)
+                    if message.content:
+                        content.append(message.content)
+                        yield AgentEvent('content', iteration, text=message.content)
+                    for tool_call in message.tool_calls or ():
+                        tool_calls.append(tool_call)
+                        name, arguments = tool_call_parts(tool_call)
+                        yield AgentEvent('tool_call', iteration, name=name, arguments=arguments)
+                    if chunk.done:
+                        result.eval_tokens += chunk.eval_count or 0
+                        result.prompt_tokens += chunk.prompt_eval_count or 0
+            except Exception as e:
+                result.error = str(e) or type(e).__name__
+                result.stop_reason = 'error'
+                yield AgentEvent('error', iteration, text=result.error)
+                break
+
+            result.thinking = ''.join(thinking)
+            result.content = ''.join(content)
+            if result.thinking or result.content or tool_calls:
+                messages.append({
+                    'role': 'assistant',
+                    'thinking': result.thinking,
+                    'content': result.content,
+                    'tool_calls': tool_calls,
+                })
+
+            if not tool_calls:
+                result.stop_reason = 'complete'
+                break
+
+            result.tool_calls += len(tool_calls)
+            for tool_result in self.executor.run(tool_calls):
+                message = self._tool_message(tool_result)
+                messages.append(message)
+                yield AgentEvent('tool_result', iteration, text=message['content'],
+                                 name=tool_result.name, arguments=tool_result.arguments, result=tool_result)
+
+        result.elapsed_s = time.perf_counter() - started
+        yield AgentEvent('done', result.iterations, result=result)
+
+    def run(self, messages: List[Any]) -> AgentResult:
+        """
+        Run the loop to completion
+
+        Args:
+            messages: Conversation so far (extended in place)
+
+        Returns:
+            AgentResult with the final answer, messages and usage
+        """
+        for event in self.stream(messages):
+            if event.type == 'done':
+                return event.result
@@ -0,0 +1,360 @@
+"""
+Multi-Host Backend Pool
+
+This module routes requests across several Ollama servers. Each backend
+tracks its in-flight requests, a moving average of response latency and
+the models currently resident in memory (via `ps()`), and requests go to
+the least-loaded healthy backend that already has the model loaded, failing
+over to the next backend on connection errors.
+"""
+
+import asyncio
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Set
+
+import httpx
+
+from ollama import Client, AsyncClient
+
+from .clients import PoolConfig, DEFAULT_POOL_CONFIG, get_client, get_async_client
+
+
+# Errors after which the request is retried on another backend
+CONNECTION_ERRORS = (ConnectionError, httpx.TransportError)
+
+
+def normalize_model_name(model: str) -> str:
+    """Add the implicit ':latest' tag so names match `ps()` output"""
+    return model if ':' in model else f'{model}:latest'
+
+
+@dataclass
+class Backend:
+    """Routing state of a single Ollama server"""
+
+    host: str
+    client: Client
+    in_flight: int = 0
+    latency_ewma: Optional[float] = None
+    requests: int = 0
+    failures: int = 0
+    down_until: float = 0.0
+    resident: Set[str] = field(default_factory=set)
+    resident_at: float = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'host': self.host,
+            'healthy': self.healthy,
+            'in_flight': self.in_flight,
+            'latency_ms': round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+            'requests': self.requests,
+            'failures': self.failures,
+            'resident': sorted(self.resident),
+        }
+
+
+class NoBackendAvailable(ConnectionError):
+    """Raised when every backend failed with a connection error"""
+
+
+class BackendPool:
+    """Load-aware router over several Ollama hosts"""
+
+    def __init__(self, hosts: List[str], pool_config: PoolConfig = DEFAULT_POOL_CONFIG,
+                 resident_ttl: float = 5.0, cooldown: float = 10.0,
+                 latency_alpha: float = 0.3):
+        """
+        Initialize the backend pool
+
+        Args:
+            hosts: Ollama server hosts (e.g., ['http://gpu1:11434', 'http://gpu2:11434'])
+            pool_config: Connection pool settings for each host's client
+            resident_ttl: Seconds a backend's `ps()` result is trusted
+            cooldown: Seconds a backend is skipped after a connection error
+            latency_alpha: Weight of the newest sample in the latency average
+        """
+        if not hosts:
+            raise ValueError('BackendPool needs at least one host')
+
+        self.pool_config = pool_config
+        self.resident_ttl = resident_ttl
+        self.cooldown = cooldown
+        self.latency_alpha = latency_alpha
+        self.backends = [Backend(host=host, client=get_client(host, pool_config)) for host in hosts]
+        self._lock = threading.Lock()
+        self._refresher: Optional[ThreadPoolExecutor] = None
+
+    # ==================== Routing State ====================
+
+    def _needs_refresh(self, backend: Backend) -> bool:
+        return backend.healthy and time.monotonic() - backend.resident_at >= self.resident_ttl
+
+    def _set_resident(self, backend: Backend, response: Any) -> None:
+        with self._lock:
+            backend.resident = {model.model for model in response.models}
+            backend.resident_at = time.monotonic()
+
+    def _refresh_resident(self, backend: Backend) -> None:
+        if not self._needs_refresh(backend):
+            return
+        try:
+            response = backend.client.ps()
+        except CONNECTION_ERRORS:
+            self._mark_down(backend)
+            return
+        except Exception:
+            return
+        self._set_resident(backend, response)
+
+    async def _arefresh_resident(self, backend: Backend) -> None:
+        if not self._needs_refresh(backend):
+            return
+        try:
+            response = await get_async_client(backend.host, self.pool_config).ps()
+        except CONNECTION_ERRORS:
+            self._mark_down(backend)
+            return
+        except Exception:
+            return
+        self._set_resident(backend, response)
+
+    def _mark_down(self, backend: Backend) -> None:
+        with self._lock:
+            backend.failures += 1
+            backend.down_until = time.monotonic() + self.cooldown
+            backend.resident = set()
+            backend.resident_at = 0.0
+
+    def _begin(self, backend: Backend) -> float:
+        with self._lock:
+            backend.in_flight += 1
+            backend.requests += 1
+        return time.perf_counter()
+
+    def _end(self, backend: Backend, started: Optional[float], model: Optional[str]) -> None:
+        with self._lock:
+            backend.in_flight -= 1
+            if started is None:
+                return
+            elapsed = time.perf_counter() - started
+            if backend.latency_ewma is None:
+                backend.latency_ewma = elapsed
+            else:
+                backend.latency_ewma += self.latency_alpha * (elapsed - backend.latency_ewma)
+            if model:
+                # A successful request leaves the model loaded on that host
+                backend.resident.add(normalize_model_name(model))
+
+    def candidates(self, model: Optional[str] = None) -> List[Backend]:
+        """
+        Order backends by preference for a model
+
+        Healthy backends come first, then backends that have the model
+        resident, then fewest in-flight requests, then lowest latency.
+        Stale `ps()` results are refreshed concurrently, so a slow host
+        delays the request by one timeout at most, not one per host.
+
+        Args:
+            model: Model name the request needs (None for model-agnostic calls)
+
+        Returns:
+            Backends in the order they should be tried
+        """
+        stale = [backend for backend in self.backends if self._needs_refresh(backend)]
+        if len(stale) == 1:
+            self._refresh_resident(stale[0])
+        elif stale:
+            with self._lock:
+                if self._refresher is None:
+                    self._refresher = ThreadPoolExecutor(
+                        max_workers=len(self.backends), thread_name_prefix='ollama-ps'
+                    )
+            list(self._refresher.map(self._refresh_resident, stale))
+        return self._order(model)
+
+    async def acandidates(self, model: Optional[str] = None) -> List[Backend]:
+        """
+        Async variant of `candidates`
+
+        The `ps()` refreshes run concurrently on the async clients, so a
+        backend that is down does not block the event loop.
+
+        Args:
+            model: Model name the request needs (None for model-agnostic calls)
+
+        Returns:
+            Backends in the order they should be tried
+        """
+        await asyncio.gather(*(self._arefresh_resident(backend) for backend in self.backends))
+        return self._order(model)
+
+    def _order(self, model: Optional[str]) -> List[Backend]:
+        wanted = normalize_model_name(model) if model else None
+
+        with self._lock:
+            return sorted(
+                self.backends,
+                key=lambda b: (
+                    not b.healthy,
+                    wanted is not None and wanted not in b.resident,
+                    b.in_flight,
+                    b.latency_ewma if b.latency_ewma is not None else 0.0,
+                    b.down_until,
+                ),
+            )
+
+    # ==================== Dispatch ====================
+
+    def call(self, model: Optional[str], fn: Callable[[Client], Any], stream: bool = False) -> Any:
+        """
+        Run a request on the best backend, failing over on connection errors
+
+        Args:
+            model: Model name used for routing
+            fn: Callable issuing the request on a given Client
+            stream: Whether fn returns a stream iterator
+
+        Returns:
+            The result of fn (a stream iterator if stream=True)
+        """
+        if stream:
+            return self._call_stream(model, fn)
+
+        last_error: Optional[BaseException] = None
+        for backend in self.candidates(model):
+            started = self._begin(backend)
+            try:
+                result = fn(backend.client)
+            except CONNECTION_ERRORS as e:
+                self._end(backend, None, None)
+                self._mark_down(backend)
+                last_error = e
+                continue
+            except BaseException:
+                self._end(backend, None, None)
+                raise
+            self._end(backend, started, model)
+            return result
+
+        raise NoBackendAvailable(f'All Ollama backends failed: {last_error}') from last_error
+
+    def _call_stream(self, model: Optional[str], fn: Callable[[Client], Iterator]) -> Iterator:
+        last_error: Optional[BaseException] = None
+        for backend in self.candidates(model):
+            started = self._begin(backend)
+            try:
+                # The request is only sent on the first read, so fail over until then
+                stream = iter(fn(backend.client))
+                first = next(stream)
+            except StopIteration:
+                self._end(backend, started, model)
+                return
+            except CONNECTION_ERRORS as e:
+                self._end(backend, None, None)
+                self._mark_down(backend)
+                last_error = e
+                continue
+            except BaseException:
+                self._end(backend, None, None)
+                raise
+
+            # Latency is measured to the first chunk; in-flight lasts the whole stream
+            with self._lock:
+                backend.in_flight += 1
+            self._end(backend, started, model)
+            try:
+                yield first
+                yield from stream
+            finally:
+                self._end(backend, None, None)
+            return
+
+        raise NoBackendAvailable(f'All Ollama backends failed: {last_error}') from last_error
+
+    async def acall(self, model: Optional[str], fn: Callable[[AsyncClient], Awaitable[Any]],
+                    stream: bool = False) -> Any:
+        """
+        Async variant of `call`
+
+        Args:
+            model: Model name used for routing
+            fn: Callable issuing the request on a given AsyncClient
+            stream: Whether fn returns an async stream iterator
+
+        Returns:
+            The awaited result of fn (an async iterator if stream=True)
+        """
+        if stream:
+            return self._acall_stream(model, fn)
+
+        last_error: Optional[BaseException] = None
+        for backend in await self.acandidates(model):
+            started = self._begin(backend)
+            try:
+                result = await fn(get_async_client(backend.host, self.pool_config))
+            except CONNECTION_ERRORS as e:
+                self._end(backend, None, None)
+                self._mark_down(backend)
+                last_error = e
+                continue
+            except BaseException:
+                self._end(backend, None, None)
+                raise
+            self._end(backend, started, model)
+            return result
+
+        raise NoBackendAvailable(f'All Ollama backends failed: {last_error}') from last_error
+
+    async def _acall_stream(self, model: Optional[str],
+                            fn: Callable[[AsyncClient], Awaitable[AsyncIterator]]) -> AsyncIterator:
+        last_error: Optional[BaseException] = None
+        for backend in await self.acandidates(model):
+            started = self._begin(backend)
+            try:
+                # The request is only sent on the first read, so fail over until then
+                stream = (await fn(get_async_client(backend.host, self.pool_config))).__aiter__()
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                self._end(backend, started, model)
+                return
+            except CONNECTION_ERRORS as e:
+                self._end(backend, None, None)
+                self._mark_down(backend)
+                last_error = e
+                continue
+            except BaseException:
+                self._end(backend, None, None)
+                raise
+
+            # Latency is measured to the first chunk; in-flight lasts the whole stream
+            with self._lock:
+                backend.in_flight += 1
+            self._end(backend, started, model)
+            try:
+                yield first
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                self._end(backend, None, None)
+            return
+
+        raise NoBackendAvailable(f'All Ollama backends failed: {last_error}') from last_error
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Get the routing state of every backend
+
+        Returns:
+            List of backend dictionaries
+        """
+        with self._lock:
+            return [backend.to_dict() for backend in self.backends]
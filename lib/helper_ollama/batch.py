@@ -0,0 +1,244 @@
+"""
+Bulk Prompt Batch Runner
+
+This module runs a JSONL file of prompts through `OllamaHelper.chat` or
+`generate` with bounded concurrency. Input records are read lazily, results
+are appended to an output JSONL file as soon as they finish, and the output
+file doubles as the checkpoint: re-running the same batch skips every record
+whose id is already in it, so a killed run resumes where it stopped.
+
+Input records (one JSON object per line):
+    {"id": "q1", "prompt": "Why is the sky blue?"}
+    {"id": "q2", "messages": [{"role": "user", "content": "Hi"}], "model": "gemma3"}
+    {"prompt": "...", "options": {"temperature": 0}, "format": {...}, "system": "..."}
+
+Records without an id are identified by their line number.
+"""
+
+import asyncio
+import json
+import os
+import time
+
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Set, Union
+
+if TYPE_CHECKING:
+    from . import OllamaHelper
+
+
+DEFAULT_BATCH_CONCURRENCY = 4
+
+
+def read_jsonl(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily read prompt records from a JSONL file
+
+    Args:
+        path: Input file
+
+    Returns:
+        Iterator of records, each with an 'id' (the line number if missing)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, str):
+                record = {'prompt': record}
+            record.setdefault('id', number)
+            yield record
+
+
+def _completed_ids(path: Path, retry_errors: bool) -> Set[str]:
+    """Ids already in the output file, dropping a partially written last line"""
+    if not path.exists():
+        return set()
+
+    with open(path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            # The previous run was killed mid-write
+            f.truncate(data.rfind(b'\n') + 1)
+            data = data[:data.rfind(b'\n') + 1]
+
+    done = set()
+    for line in data.splitlines():
+        try:
+            result = json.loads(line)
+        except ValueError:
+            continue
+        if retry_errors and result.get('error'):
+            continue
+        done.add(str(result.get('id')))
+    return done
+
+
+@dataclass
+class BatchReport:
+    """Throughput summary of a batch run"""
+
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    eval_tokens: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def requests_per_s(self) -> float:
+        return (self.completed + self.failed) / self.elapsed_s if self.elapsed_s else 0.0
+
+    @property
+    def tokens_per_s(self) -> float:
+        return self.eval_tokens / self.elapsed_s if self.elapsed_s else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            'elapsed_s': round(self.elapsed_s, 3),
+            'requests_per_s': round(self.requests_per_s, 2),
+            'tokens_per_s': round(self.tokens_per_s, 1),
+        }
+
+
+class BatchRunner:
+    """Runs prompt records through an OllamaHelper with bounded concurrency"""
+
+    def __init__(self, helper: 'OllamaHelper', model: str,
+                 concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                 options: Optional[Dict[str, Any]] = None,
+                 format: Optional[Union[str, Dict[str, Any]]] = None,
+                 keep_alive: Optional[Union[float, str]] = None,
+                 retry_errors: bool = False,
+                 on_result: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Initialize the runner
+
+        Args:
+            helper: OllamaHelper used for the requests
+            model: Default model (records may override it with 'model')
+            concurrency: Maximum requests in flight
+            options: Default model options (merged with each record's 'options')
+            format: Default output format ('json' or a JSON schema)
+            keep_alive: Optional time the model stays loaded between requests
+            retry_errors: Re-run records that failed in a previous run
+            on_result: Optional callback receiving every result record
+        """
+        self.helper = helper
+        self.model = model
+        self.concurrency = concurrency
+        self.options = dict(options or {})
+        self.format = format
+        self.keep_alive = keep_alive
+        self.retry_errors = retry_errors
+        self.on_result = on_result
+
+    async def _run_one(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        model = record.get('model', self.model)
+        options = {**self.options, **record.get('options', {})}
+        kwargs = {
+            'keep_alive': self.keep_alive,
+            'format': record.get('format', self.format),
+            **options,
+        }
+
+        result: Dict[str, Any] = {'id': record['id'], 'model': model}
+        started = time.perf_counter()
+        try:
+            if 'messages' in record:
+                response = await self.helper.async_chat(model, record['messages'], **kwargs)
+                result['response'] = response.message.content
+            else:
+                if record.get('system'):
+                    kwargs['system'] = record['system']
+                response = await self.helper.async_generate(model, record['prompt'], **kwargs)
+                result['response'] = response.response
+            result['eval_count'] = response.eval_count
+            result['prompt_eval_count'] = response.prompt_eval_count
+            result['total_duration'] = response.total_duration
+            result['error'] = None
+        except Exception as e:
+            result['response'] = None
+            result['error'] = str(e)
+        result['elapsed_s'] = round(time.perf_counter() - started, 3)
+        return result
+
+    async def arun(self, records: Union[str, Path, Iterator[Dict[str, Any]]],
+                   output: Union[str, Path]) -> BatchReport:
+        """
+        Run a batch, appending results to `output`
+
+        Args:
+            records: Input JSONL path or an iterator of records
+            output: Output JSONL path (also used to resume an interrupted run)
+
+        Returns:
+            BatchReport with counts and throughput
+        """
+        if isinstance(records, (str, Path)):
+            records = read_jsonl(records)
+
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        done = _completed_ids(output, self.retry_errors)
+
+        report = BatchReport()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks: Set[asyncio.Task] = set()
+        started = time.perf_counter()
+
+        with open(output, 'a', encoding='utf-8') as out:
+
+            async def run(record: Dict[str, Any]) -> None:
+                try:
+                    result = await self._run_one(record)
+                    out.write(json.dumps(result, ensure_ascii=False, default=str) + '\n')
+                    out.flush()
+                    if result['error']:
+                        report.failed += 1
+                    else:
+                        report.completed += 1
+                        report.eval_tokens += result.get('eval_count') or 0
+                    if self.on_result is not None:
+                        self.on_result(result)
+                finally:
+                    semaphore.release()
+
+            try:
+                for record in records:
+                    report.total += 1
+                    if str(record['id']) in done:
+                        report.skipped += 1
+                        continue
+                    # Acquire before reading on, so at most `concurrency` records are held
+                    await semaphore.acquire()
+                    task = asyncio.create_task(run(record))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                if tasks:
+                    await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                os.fsync(out.fileno())
+
+        report.elapsed_s = time.perf_counter() - started
+        return report
+
+    def run(self, records: Union[str, Path, Iterator[Dict[str, Any]]],
+            output: Union[str, Path]) -> BatchReport:
+        """
+        Run a batch from synchronous code (on the helper's background loop)
+
+        Args:
+            records: Input JSONL path or an iterator of records
+            output: Output JSONL path (also used to resume an interrupted run)
+
+        Returns:
+            BatchReport with counts and throughput
+        """
+        return self.helper.run(self.arun(records, output))
@@ -0,0 +1,15 @@
+"""
+Shared Cache Location
+
+Directory used by the on-disk caches (embeddings, vector indexes, responses).
+Set OLLAMA_HELPER_CACHE_DIR to move it.
+"""
+
+import os
+
+from pathlib import Path
+
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get('OLLAMA_HELPER_CACHE_DIR', Path.home() / '.cache' / 'helper_ollama')
+)
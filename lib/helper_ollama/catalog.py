@@ -0,0 +1,178 @@
+"""
+Model Catalog Cache
+
+This module provides a TTL-cached catalog of installed models so that
+lookups like model names, sizes and installation checks do not hit the
+Ollama `/api/tags` endpoint on every call (e.g. on every Streamlit rerun).
+"""
+
+import threading
+import time
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_CATALOG_TTL = 30.0
+
+
+class ModelCatalog:
+    """TTL-cached, name-indexed list of installed models"""
+
+    def __init__(self, loader: Callable[[], List[Dict[str, Any]]],
+                 ttl: float = DEFAULT_CATALOG_TTL):
+        """
+        Initialize the catalog
+
+        Args:
+            loader: Callable returning the list of model records from the server
+            ttl: Seconds a loaded catalog stays valid (0 disables caching)
+        """
+        self.loader = loader
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._models: Optional[List[Dict[str, Any]]] = None
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at = 0.0
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._models is not None
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    def _load(self) -> None:
+        models = self.loader()
+
+        index = {}
+        for model in models:
+            index[model['name']] = model
+            index.setdefault(model['name_short'], model)
+
+        self._models = models
+        self._index = index
+        self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        # Return a snapshot: another session may invalidate the catalog once the lock is released
+        with self._lock:
+            if self._is_fresh():
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._load()
+            return self._models, self._index
+
+    def models(self) -> List[Dict[str, Any]]:
+        """
+        Get all model records, loading them from the server if stale
+
+        Returns:
+            List of model dictionaries
+        """
+        models, _ = self._ensure_loaded()
+        return list(models)
+
+    def names(self) -> List[str]:
+        """
+        Get the names of all installed models
+
+        Returns:
+            List of model name strings
+        """
+        return [model['name'] for model in self.models()]
+
+    def get(self, model_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a model record by full or short (without ':latest') name
+
+        Args:
+            model_name: Model name
+
+        Returns:
+            Model dictionary or None if not installed
+        """
+        _, index = self._ensure_loaded()
+        return index.get(model_name)
+
+    def __contains__(self, model_name: str) -> bool:
+        return self.get(model_name) is not None
+
+    def invalidate(self) -> None:
+        """Drop the cached catalog so the next lookup reloads it"""
+        with self._lock:
+            self._models = None
+            self._index = {}
+            self._loaded_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with hits, misses, hit rate, age and size of the catalog
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'age_s': round(time.monotonic() - self._loaded_at, 3) if self._models is not None else None,
+                'size': len(self._models) if self._models is not None else 0,
+                'ttl': self.ttl,
+            }
+
+
+# Catalogs are shared by all helpers talking to the same host with the same TTL
+_catalogs: Dict[Tuple[Optional[str], float], ModelCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(host: Optional[str], loader: Callable[[], List[Dict[str, Any]]],
+                ttl: float = DEFAULT_CATALOG_TTL) -> ModelCatalog:
+    """
+    Get the process-wide catalog for a host and TTL, creating it on first use
+
+    Helpers asking for a different TTL get their own catalog, so every
+    helper's `catalog_ttl` takes effect. The loader of the first caller for
+    a (host, ttl) pair is used.
+
+    Args:
+        host: Ollama server host (None for the default host)
+        loader: Callable used to load the catalog if it does not exist yet
+        ttl: Cache TTL in seconds
+
+    Returns:
+        Shared ModelCatalog instance
+    """
+    key = (host, ttl)
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = ModelCatalog(loader, ttl=ttl)
+            _catalogs[key] = catalog
+        return catalog
+
+
+def invalidate_host(host: Optional[str]) -> None:
+    """
+    Invalidate every shared catalog of a host, whatever its TTL
+
+    Args:
+        host: Ollama server host (None for the default host)
+    """
+    with _catalogs_lock:
+        catalogs = [catalog for (catalog_host, _), catalog in _catalogs.items() if catalog_host == host]
+    for catalog in catalogs:
+        catalog.invalidate()
+
+
+def invalidate_all() -> None:
+    """Invalidate every shared catalog"""
+    with _catalogs_lock:
+        catalogs = list(_catalogs.values())
+    for catalog in catalogs:
+        catalog.invalidate()
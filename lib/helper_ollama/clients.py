@@ -0,0 +1,126 @@
+"""
+Shared Ollama Clients
+
+This module keeps one pooled `Client` per host (and one `AsyncClient` per
+host and event loop) for the whole process, so every OllamaHelper talking
+to the same server reuses keep-alive connections instead of opening a new
+TCP connection per call.
+"""
+
+import asyncio
+import threading
+import weakref
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from ollama import Client, AsyncClient
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection pool and timeout settings for a shared client"""
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 10.0
+    read_timeout: Optional[float] = None
+
+    def client_kwargs(self) -> Dict[str, object]:
+        """
+        Build the httpx keyword arguments for this configuration
+
+        Returns:
+            Dictionary with 'limits' and 'timeout' entries
+        """
+        return {
+            'limits': httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            'timeout': httpx.Timeout(
+                self.read_timeout,
+                connect=self.connect_timeout,
+            ),
+        }
+
+
+DEFAULT_POOL_CONFIG = PoolConfig()
+
+_ClientKey = Tuple[Optional[str], PoolConfig]
+
+_clients: Dict[_ClientKey, Client] = {}
+# AsyncClients are bound to the event loop they first ran in
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[_ClientKey, AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+
+
+def _new_client(cls, host: Optional[str], config: PoolConfig):
+    kwargs = config.client_kwargs()
+    return cls(host=host, **kwargs) if host else cls(**kwargs)
+
+
+def get_client(host: Optional[str] = None,
+               config: PoolConfig = DEFAULT_POOL_CONFIG) -> Client:
+    """
+    Get the shared pooled Client for a host
+
+    Args:
+        host: Ollama server host (None uses OLLAMA_HOST or the default)
+        config: Pool and timeout settings
+
+    Returns:
+        Process-wide Client instance
+    """
+    key = (host, config)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _new_client(Client, host, config)
+            _clients[key] = client
+        return client
+
+
+def get_async_client(host: Optional[str] = None,
+                     config: PoolConfig = DEFAULT_POOL_CONFIG) -> AsyncClient:
+    """
+    Get the shared pooled AsyncClient for a host and the running event loop
+
+    Outside of a running loop a new, unshared client is returned because
+    its connections could not be reused by a later loop.
+
+    Args:
+        host: Ollama server host (None uses OLLAMA_HOST or the default)
+        config: Pool and timeout settings
+
+    Returns:
+        AsyncClient instance
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _new_client(AsyncClient, host, config)
+
+    key = (host, config)
+    with _lock:
+        per_loop = _async_clients.setdefault(loop, {})
+        client = per_loop.get(key)
+        if client is None:
+            client = _new_client(AsyncClient, host, config)
+            per_loop[key] = client
+        return client
+
+
+def close_clients() -> None:
+    """Close and forget all shared sync clients"""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client._client.close()
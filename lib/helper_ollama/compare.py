@@ -0,0 +1,141 @@
+"""
+Multi-Model Comparison
+
+This module sends the same conversation to several models concurrently over
+the async client and merges their streams into one sequence of events, so a
+caller can render the replies side by side as tokens arrive. Each model gets
+a `ModelResult` with its reply, time-to-first-token, throughput and the
+server-reported counts and durations.
+"""
+
+import asyncio
+import time
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from . import OllamaHelper
+
+
+@dataclass
+class ModelResult:
+    """Reply and timings of one model in a comparison"""
+
+    model: str
+    text: str = ''
+    thinking: str = ''
+    done: bool = False
+    error: Optional[str] = None
+    ttft_s: Optional[float] = None
+    total_s: Optional[float] = None
+    eval_count: Optional[int] = None
+    eval_duration: Optional[int] = None
+    prompt_eval_count: Optional[int] = None
+    load_duration: Optional[int] = None
+
+    @property
+    def tokens_per_s(self) -> Optional[float]:
+        """Server-side generation speed"""
+        if self.eval_count and self.eval_duration:
+            return self.eval_count / (self.eval_duration / 1e9)
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'model': self.model,
+            'ttft_s': round(self.ttft_s, 3) if self.ttft_s is not None else None,
+            'tokens_per_s': round(self.tokens_per_s, 1) if self.tokens_per_s else None,
+            'eval_count': self.eval_count,
+            'prompt_eval_count': self.prompt_eval_count,
+            'load_duration_s': round(self.load_duration / 1e9, 3) if self.load_duration else None,
+            'total_s': round(self.total_s, 3) if self.total_s is not None else None,
+            'error': self.error,
+        }
+
+
+# (model, text delta, result) - the delta is '' for the final event of a model
+CompareEvent = Tuple[str, str, ModelResult]
+
+
+async def _stream_one(helper: 'OllamaHelper', result: ModelResult, messages: List[Dict[str, Any]],
+                      options: Dict[str, Any], events: 'asyncio.Queue[CompareEvent]') -> None:
+    started = time.perf_counter()
+    try:
+        # Never served from the response cache: the timings are the point
+        stream = await helper.async_chat(result.model, messages, stream=True, cache=False, **options)
+        async for chunk in stream:
+            message = chunk.message
+            delta = message.content or ''
+            if message.thinking:
+                result.thinking += message.thinking
+            if (delta or message.thinking) and result.ttft_s is None:
+                result.ttft_s = time.perf_counter() - started
+            if delta:
+                result.text += delta
+                await events.put((result.model, delta, result))
+            if chunk.done:
+                result.eval_count = chunk.eval_count
+                result.eval_duration = chunk.eval_duration
+                result.prompt_eval_count = chunk.prompt_eval_count
+                result.load_duration = chunk.load_duration
+    except Exception as e:
+        result.error = str(e)
+    finally:
+        result.total_s = time.perf_counter() - started
+        result.done = True
+        await events.put((result.model, '', result))
+
+
+async def astream_compare(helper: 'OllamaHelper', models: List[str], messages: List[Dict[str, Any]],
+                          options: Optional[Dict[str, Any]] = None) -> AsyncIterator[CompareEvent]:
+    """
+    Stream the same conversation to several models concurrently
+
+    Args:
+        helper: OllamaHelper used for the requests
+        models: Model names
+        messages: Chat messages sent to every model
+        options: Model options sent to every model
+
+    Returns:
+        Async iterator of (model, text delta, result) events in arrival
+        order; each model ends with an event whose result has done=True
+    """
+    events: 'asyncio.Queue[CompareEvent]' = asyncio.Queue()
+    results = [ModelResult(model) for model in dict.fromkeys(models)]
+    tasks = [
+        asyncio.create_task(_stream_one(helper, result, messages, options or {}, events))
+        for result in results
+    ]
+
+    try:
+        remaining = len(tasks)
+        while remaining:
+            event = await events.get()
+            if event[2].done and not event[1]:
+                remaining -= 1
+            yield event
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def acompare(helper: 'OllamaHelper', models: List[str], messages: List[Dict[str, Any]],
+                   options: Optional[Dict[str, Any]] = None) -> List[ModelResult]:
+    """
+    Run a comparison to completion
+
+    Args:
+        helper: OllamaHelper used for the requests
+        models: Model names
+        messages: Chat messages sent to every model
+        options: Model options sent to every model
+
+    Returns:
+        One ModelResult per model, in the order of `models`
+    """
+    results: Dict[str, ModelResult] = {}
+    async for model, _, result in astream_compare(helper, models, messages, options):
+        results[model] = result
+    return [results[model] for model in models]
@@ -0,0 +1,245 @@
+"""
+Conversation Context Window Manager
+
+This module keeps a chat conversation under a token budget before it is
+sent to the model: system messages are pinned, the newest turns are kept in
+a sliding window and older turns are either dropped or folded into a running
+summary written by a (cheap) summary model.
+
+The window start only moves when the budget is exceeded, and then jumps down
+to a low-water mark, so consecutive turns share the same prompt prefix and
+the server's KV cache stays reusable between truncations.
+"""
+
+import hashlib
+import threading
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from . import OllamaHelper
+
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = (
+    'Summarize the following conversation in a few sentences. Keep names, '
+    'facts, decisions and open questions; omit small talk.'
+)
+SUMMARY_PREFIX = 'Summary of the earlier conversation: '
+
+
+def _field(message: Any, name: str, default: Any = None) -> Any:
+    """Read a field from a message dict or ollama Message object"""
+    if isinstance(message, dict):
+        return message.get(name, default)
+    return getattr(message, name, default)
+
+
+@lru_cache(maxsize=8192)
+def _estimate(role: str, content: str) -> int:
+    return MESSAGE_OVERHEAD_TOKENS + (len(role) + len(content) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_tokens(message: Any) -> int:
+    """
+    Estimate the prompt tokens of one message (cached per role/content)
+
+    Args:
+        message: Message dict or ollama Message
+
+    Returns:
+        Approximate token count
+    """
+    return _estimate(_field(message, 'role', '') or '', _field(message, 'content', '') or '')
+
+
+@lru_cache(maxsize=8192)
+def _key(role: str, content: str) -> str:
+    return hashlib.sha1(f'{role}\0{content}'.encode('utf-8')).hexdigest()
+
+
+def _message_key(message: Any) -> str:
+    return _key(_field(message, 'role', '') or '', _field(message, 'content', '') or '')
+
+
+class ContextManager:
+    """Fits a conversation into a token budget"""
+
+    def __init__(self, budget: int = 4096, strategy: str = 'truncate',
+                 helper: Optional['OllamaHelper'] = None,
+                 summary_model: Optional[str] = None,
+                 low_water: float = 0.6):
+        """
+        Initialize the context manager
+
+        A ContextManager remembers where it cut the conversation, so use one
+        instance per conversation.
+
+        Args:
+            budget: Maximum estimated prompt tokens sent to the model
+            strategy: 'truncate' drops old turns, 'summarize' folds them into
+                a summary message written by `summary_model`
+            helper: OllamaHelper used for summaries (required for 'summarize')
+            summary_model: Model used to summarize old turns
+            low_water: Fraction of the budget the window shrinks to when it
+                has to move (lower values keep the prefix stable for longer)
+        """
+        if strategy not in ('truncate', 'summarize'):
+            raise ValueError(f'Unknown context strategy: {strategy}')
+        if strategy == 'summarize' and not (helper and summary_model):
+            raise ValueError("The 'summarize' strategy needs a helper and a summary_model")
+
+        self.budget = budget
+        self.strategy = strategy
+        self.helper = helper
+        self.summary_model = summary_model
+        self.low_water = low_water
+
+        self.dropped_messages = 0
+        self.summaries = 0
+        self.window_moves = 0
+
+        # Index and key of the first kept turn; the cut stays there while it fits
+        self._anchor: Optional[Tuple[int, str]] = None
+
+        # Running summary: keys of the summarized messages and the summary text
+        self._summary: Tuple[Tuple[str, ...], str] = ((), '')
+        self._lock = threading.Lock()
+
+    def count(self, messages: List[Any]) -> int:
+        """
+        Estimate the prompt tokens of a conversation
+
+        Args:
+            messages: Chat messages
+
+        Returns:
+            Approximate token count
+        """
+        return sum(estimate_tokens(m) for m in messages)
+
+    def _window_start(self, turns: List[Any], budget: int) -> int:
+        """Index of the first turn that fits, keeping at least the newest one"""
+        used = 0
+        start = len(turns)
+        while start > 0:
+            cost = estimate_tokens(turns[start - 1])
+            if used + cost > budget and start < len(turns):
+                break
+            used += cost
+            start -= 1
+
+        # Do not open the window on an orphaned assistant or tool message
+        while start < len(turns) - 1 and _field(turns[start], 'role') != 'user':
+            start += 1
+        return start
+
+    def _anchored_start(self, turns: List[Any], budget: int) -> Optional[int]:
+        """Index of the previous cut if it still fits the budget"""
+        if self._anchor is None:
+            return None
+        i, key = self._anchor
+        if i >= len(turns) or _message_key(turns[i]) != key:
+            return None
+        return i if self.count(turns[i:]) <= budget else None
+
+    def _start(self, turns: List[Any], budget: int) -> int:
+        """Window start, reusing the previous cut unless it overflows"""
+        start = self._anchored_start(turns, budget)
+        if start is None:
+            start = self._window_start(turns, int(budget * self.low_water))
+            self._anchor = (start, _message_key(turns[start])) if start < len(turns) else None
+            self.window_moves += 1
+        return start
+
+    def _summarize(self, dropped: List[Any]) -> str:
+        keys = tuple(_message_key(m) for m in dropped)
+
+        with self._lock:
+            done_keys, summary = self._summary
+        if keys == done_keys:
+            return summary
+
+        # Extend the previous summary with the newly dropped turns only
+        if done_keys and keys[:len(done_keys)] == done_keys:
+            new = dropped[len(done_keys):]
+            transcript = f'Previous summary: {summary}\n\n'
+        else:
+            new = dropped
+            transcript = ''
+        transcript += '\n'.join(
+            f"{_field(m, 'role')}: {_field(m, 'content', '') or ''}" for m in new
+        )
+
+        # Bypass the helper's context window: it may be this manager, which
+        # would budget (and summarize) the summary request itself
+        response = self.helper.chat(
+            self.summary_model,
+            [
+                {'role': 'system', 'content': SUMMARY_PROMPT},
+                {'role': 'user', 'content': transcript},
+            ],
+            context_window=False,
+            temperature=0,
+        )
+        summary = response['message']['content'].strip()
+
+        with self._lock:
+            self._summary = (keys, summary)
+            self.summaries += 1
+        return summary
+
+    def fit(self, messages: List[Any]) -> List[Any]:
+        """
+        Return the messages to send, within the token budget
+
+        System messages are always kept; the newest turns are kept as long
+        as they fit, and the turns before them are dropped or summarized.
+
+        Args:
+            messages: Full conversation
+
+        Returns:
+            Conversation that fits the budget (the input list if it already fits)
+        """
+        if self.count(messages) <= self.budget:
+            return messages
+
+        pinned = [m for m in messages if _field(m, 'role') == 'system']
+        turns = [m for m in messages if _field(m, 'role') != 'system']
+
+        budget = self.budget - self.count(pinned)
+        start = self._start(turns, budget)
+        dropped, kept = turns[:start], turns[start:]
+
+        if self.strategy == 'summarize' and dropped:
+            summary = {'role': 'system', 'content': SUMMARY_PREFIX + self._summarize(dropped)}
+            # Make room for the summary by sliding the window further if needed
+            if self.count(kept) + estimate_tokens(summary) > budget:
+                self._anchor = None
+                start = self._start(kept, budget - estimate_tokens(summary))
+                dropped, kept = dropped + kept[:start], kept[start:]
+                summary['content'] = SUMMARY_PREFIX + self._summarize(dropped)
+            pinned = pinned + [summary]
+
+        self.dropped_messages += len(dropped)
+        return pinned + kept
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get context manager statistics
+
+        Returns:
+            Dictionary with budget, dropped messages and summaries written
+        """
+        return {
+            'budget': self.budget,
+            'strategy': self.strategy,
+            'dropped_messages': self.dropped_messages,
+            'summaries': self.summaries,
+            'window_moves': self.window_moves,
+            'estimate_cache': _estimate.cache_info()._asdict(),
+        }
@@ -0,0 +1,261 @@
+"""
+Batched Embedding Pipeline
+
+This module embeds large lists of texts by splitting them into batches that
+are sent concurrently over the async client, and caches the resulting
+vectors on disk keyed by (model digest, text hash) so that re-embedding an
+unchanged corpus does not call the server at all.
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .cache_dir import DEFAULT_CACHE_DIR
+
+if TYPE_CHECKING:
+    from . import OllamaHelper
+
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_CONCURRENCY = 4
+
+
+def text_hash(text: str) -> str:
+    """Stable hash of a text used as cache key"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed store of float32 vectors keyed by (model digest, text hash)"""
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file path (defaults to embeddings.sqlite in DEFAULT_CACHE_DIR)
+        """
+        self.path = Path(path) if path else DEFAULT_CACHE_DIR / 'embeddings.sqlite'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS embeddings ('
+            ' digest TEXT NOT NULL,'
+            ' text_hash TEXT NOT NULL,'
+            ' vector BLOB NOT NULL,'
+            ' PRIMARY KEY (digest, text_hash))'
+        )
+        self._conn.commit()
+
+    def get_many(self, digest: str, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up cached vectors
+
+        Args:
+            digest: Model digest
+            hashes: Text hashes to look up
+
+        Returns:
+            Dictionary of text hash to vector for the hashes that were found
+        """
+        found: Dict[str, np.ndarray] = {}
+        hashes = list(hashes)
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT text_hash, vector FROM embeddings '
+                    f'WHERE digest = ? AND text_hash IN ({placeholders})',
+                    [digest, *chunk],
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, digest: str, vectors: Dict[str, np.ndarray]) -> None:
+        """
+        Store vectors
+
+        Args:
+            digest: Model digest
+            vectors: Dictionary of text hash to vector
+        """
+        rows = [
+            (digest, h, np.asarray(v, dtype=np.float32).tobytes())
+            for h, v in vectors.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO embeddings (digest, text_hash, vector) VALUES (?, ?, ?)',
+                rows,
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM embeddings').fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove all cached vectors"""
+        with self._lock:
+            self._conn.execute('DELETE FROM embeddings')
+            self._conn.commit()
+
+
+_default_cache: Optional[EmbeddingCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache, creating it on first use"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = EmbeddingCache()
+        return _default_cache
+
+
+class BatchEmbedder:
+    """Concurrent, cached batch embedding on top of an OllamaHelper"""
+
+    def __init__(self, helper: 'OllamaHelper', batch_size: int = DEFAULT_BATCH_SIZE,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 cache: Optional[EmbeddingCache] = None):
+        """
+        Initialize the embedder
+
+        Args:
+            helper: OllamaHelper used for the embed requests
+            batch_size: Number of texts per embed request
+            concurrency: Maximum number of batches in flight at once
+            cache: Vector cache (None disables caching)
+        """
+        self.helper = helper
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.cache = cache
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.server_calls = 0
+
+    def model_digest(self, model: str) -> str:
+        """Digest identifying the model weights, falling back to the name"""
+        return self.helper.model_digest(model)
+
+    async def _embed_batches(self, model: str, texts: List[str], batch_size: int,
+                             concurrency: int) -> List[List[float]]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                self.server_calls += 1
+                response = await self.helper.async_embed(model, batch)
+                return response['embeddings']
+
+        batches = [
+            texts[start:start + batch_size]
+            for start in range(0, len(texts), batch_size)
+        ]
+        results = await asyncio.gather(*(run(batch) for batch in batches))
+        return [vector for batch in results for vector in batch]
+
+    async def aembed(self, model: str, texts: Sequence[str], batch_size: Optional[int] = None,
+                     concurrency: Optional[int] = None) -> np.ndarray:
+        """
+        Embed texts, using cached vectors where available
+
+        Args:
+            model: Embedding model name
+            texts: Texts to embed
+            batch_size: Override the number of texts per request
+            concurrency: Override the number of concurrent requests
+
+        Returns:
+            C-contiguous float32 matrix of shape (len(texts), dim)
+        """
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        hashes = [text_hash(t) for t in texts]
+        digest = self.model_digest(model)
+
+        vectors: Dict[str, np.ndarray] = {}
+        if self.cache is not None:
+            vectors = self.cache.get_many(digest, set(hashes))
+
+        # Each distinct missing text is sent once
+        missing: Dict[str, str] = {}
+        for h, t in zip(hashes, texts):
+            if h not in vectors and h not in missing:
+                missing[h] = t
+
+        self.cache_hits += len(texts) - sum(1 for h in hashes if h in missing)
+        self.cache_misses += len(missing)
+
+        if missing:
+            embedded = await self._embed_batches(
+                model,
+                list(missing.values()),
+                max(1, batch_size or self.batch_size),
+                max(1, concurrency or self.concurrency),
+            )
+            fresh = {
+                h: np.asarray(v, dtype=np.float32)
+                for h, v in zip(missing.keys(), embedded)
+            }
+            if self.cache is not None:
+                self.cache.put_many(digest, fresh)
+            vectors.update(fresh)
+
+        dim = len(next(iter(vectors.values())))
+        matrix = np.empty((len(texts), dim), dtype=np.float32)
+        for i, h in enumerate(hashes):
+            matrix[i] = vectors[h]
+        return matrix
+
+    def embed(self, model: str, texts: Sequence[str], batch_size: Optional[int] = None,
+              concurrency: Optional[int] = None) -> np.ndarray:
+        """
+        Synchronous wrapper around `aembed`
+
+        Runs on the helper's background loop, so the pooled AsyncClient is
+        reused and the call also works while another event loop is running.
+
+        Args:
+            model: Embedding model name
+            texts: Texts to embed
+            batch_size: Override the number of texts per request
+            concurrency: Override the number of concurrent requests
+
+        Returns:
+            C-contiguous float32 matrix of shape (len(texts), dim)
+        """
+        return self.helper.run(self.aembed(model, texts, batch_size, concurrency))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get embedding cache statistics
+
+        Returns:
+            Dictionary with cache hits, misses and server calls
+        """
+        return {
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'server_calls': self.server_calls,
+            'cached_vectors': len(self.cache) if self.cache is not None else 0,
+        }
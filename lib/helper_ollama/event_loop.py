@@ -0,0 +1,149 @@
+"""
+Background Event Loop
+
+Streamlit runs page scripts synchronously, so pages used to call
+`asyncio.run()` per click, creating an event loop and a fresh AsyncClient
+every time. This module runs one long-lived event loop in a daemon thread;
+coroutines are submitted to it from synchronous code, and async streams are
+exposed as ordinary iterators. Async clients created on this loop (see
+`clients.get_async_client`) are reused across calls and sessions.
+"""
+
+import asyncio
+import inspect
+import queue
+import threading
+
+from concurrent.futures import Future
+from typing import Any, AsyncIterable, Awaitable, Iterator, List, Optional, Union
+
+
+_DONE = object()
+
+
+class BackgroundLoop:
+    """An asyncio event loop running forever in a daemon thread"""
+
+    def __init__(self, name: str = 'ollama-helper-loop'):
+        """
+        Start the loop thread
+
+        Args:
+            name: Thread name
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @property
+    def running(self) -> bool:
+        """Whether the loop thread is alive"""
+        return self._thread.is_alive() and not self.loop.is_closed()
+
+    def submit(self, coro: Awaitable[Any]) -> Future:
+        """
+        Schedule a coroutine on the loop
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            concurrent.futures.Future with the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and wait for its result
+
+        Args:
+            coro: Coroutine to run
+            timeout: Optional seconds to wait
+
+        Returns:
+            Result of the coroutine
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError('BackgroundLoop.run() cannot be called from the loop thread')
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def gather(self, *coros: Awaitable[Any], return_exceptions: bool = False) -> List[Any]:
+        """
+        Run coroutines concurrently on the loop and wait for all of them
+
+        Args:
+            *coros: Coroutines to run
+            return_exceptions: Return exceptions as results instead of raising
+
+        Returns:
+            Results in the order of `coros`
+        """
+        async def _gather():
+            return await asyncio.gather(*coros, return_exceptions=return_exceptions)
+        return self.run(_gather())
+
+    def iterate(self, stream: Union[AsyncIterable[Any], Awaitable[AsyncIterable[Any]]]) -> Iterator[Any]:
+        """
+        Consume an async stream on the loop as a synchronous iterator
+
+        Args:
+            stream: Async iterable, or a coroutine returning one
+                (e.g. `helper.async_chat(..., stream=True)`)
+
+        Returns:
+            Iterator yielding the stream's items as they arrive
+        """
+        items: 'queue.Queue[Any]' = queue.Queue()
+
+        async def _pump():
+            try:
+                source = await stream if inspect.isawaitable(stream) else stream
+                async for item in source:
+                    items.put(item)
+            except BaseException as e:
+                items.put(e)
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+            finally:
+                items.put(_DONE)
+
+        future = self.submit(_pump())
+        try:
+            while True:
+                item = items.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Stop the request if the consumer stops early
+            future.cancel()
+
+    def stop(self) -> None:
+        """Stop the loop and wait for its thread to exit"""
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+_background_loop: Optional[BackgroundLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """Get the process-wide background loop, starting it on first use"""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None or not _background_loop.running:
+            _background_loop = BackgroundLoop()
+        return _background_loop
@@ -0,0 +1,387 @@
+"""
+Request Instrumentation
+
+This module records latency and throughput of every OllamaHelper call:
+client-side wall time and time-to-first-chunk, plus the timing fields the
+server returns (`total_duration`, `load_duration`, `prompt_eval_count`,
+`prompt_eval_duration`, `eval_count`, `eval_duration`). Observations are
+aggregated into per-endpoint/per-model histograms that can be rendered in
+the Prometheus text exposition format, served over HTTP, or summarized for
+a dashboard.
+"""
+
+import asyncio
+import bisect
+import functools
+import math
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+PREFIX = 'ollama_helper'
+
+# Histogram name -> (help text, server field in nanoseconds or None for client-side)
+HISTOGRAMS = {
+    'request_seconds': ('Client-side wall time of helper calls', None),
+    'ttft_seconds': ('Time to the first streamed chunk', None),
+    'server_total_seconds': ('Server-reported total_duration', 'total_duration'),
+    'load_seconds': ('Server-reported load_duration', 'load_duration'),
+    'prompt_eval_seconds': ('Server-reported prompt_eval_duration', 'prompt_eval_duration'),
+    'eval_seconds': ('Server-reported eval_duration', 'eval_duration'),
+}
+
+# Counter name -> (help text, server field or None)
+COUNTERS = {
+    'requests_total': ('Helper calls', None),
+    'errors_total': ('Helper calls that failed', None),
+    'prompt_tokens_total': ('Server-reported prompt_eval_count', 'prompt_eval_count'),
+    'eval_tokens_total': ('Server-reported eval_count', 'eval_count'),
+}
+
+
+def _field(obj: Any, name: str) -> Any:
+    """Read a field from a response object or dict"""
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)"""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside its bucket"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.bounds[-1]
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+
+class MetricsRegistry:
+    """Thread-safe store of per-endpoint/per-model histograms and counters"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self._counters: Dict[Tuple[str, str, str], float] = {}
+
+    def _histogram(self, name: str, labels: Tuple[str, str]) -> Histogram:
+        key = (name,) + labels
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(self.buckets)
+        return histogram
+
+    def _count(self, name: str, labels: Tuple[str, str], value: float = 1) -> None:
+        key = (name,) + labels
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, endpoint: str, model: Optional[str], wall_s: float,
+                ttft_s: Optional[float] = None, response: Any = None, error: bool = False) -> None:
+        """
+        Record one helper call
+
+        Args:
+            endpoint: Helper endpoint (e.g. 'chat', 'embed', 'show')
+            model: Model name, if the call has one
+            wall_s: Client-side wall time in seconds
+            ttft_s: Time to the first streamed chunk in seconds
+            response: Final response (or last streamed chunk) with server timings
+            error: Whether the call failed
+        """
+        labels = (endpoint, model or '')
+        with self._lock:
+            self._count('requests_total', labels)
+            if error:
+                self._count('errors_total', labels)
+            self._histogram('request_seconds', labels).observe(wall_s)
+            if ttft_s is not None:
+                self._histogram('ttft_seconds', labels).observe(ttft_s)
+            if response is None:
+                return
+            for name, (_, source) in HISTOGRAMS.items():
+                value = _field(response, source) if source else None
+                if value:
+                    self._histogram(name, labels).observe(value / 1e9)
+            for name, (_, source) in COUNTERS.items():
+                value = _field(response, source) if source else None
+                if value:
+                    self._count(name, labels, value)
+
+    def reset(self) -> None:
+        """Drop all recorded metrics"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Summarize the metrics per endpoint and model
+
+        Returns:
+            List of dictionaries with request/error counts, wall time and TTFT
+            percentiles, mean load time, token counts and tokens/sec
+        """
+        with self._lock:
+            labels = sorted({key[1:] for key in self._counters})
+            rows = []
+            for endpoint, model in labels:
+                wall = self._histograms.get(('request_seconds', endpoint, model))
+                ttft = self._histograms.get(('ttft_seconds', endpoint, model))
+                load = self._histograms.get(('load_seconds', endpoint, model))
+                evals = self._histograms.get(('eval_seconds', endpoint, model))
+                eval_tokens = self._counters.get(('eval_tokens_total', endpoint, model), 0)
+
+                rows.append({
+                    'endpoint': endpoint,
+                    'model': model,
+                    'requests': int(self._counters.get(('requests_total', endpoint, model), 0)),
+                    'errors': int(self._counters.get(('errors_total', endpoint, model), 0)),
+                    'p50_ms': _ms(wall.quantile(0.5)) if wall else None,
+                    'p95_ms': _ms(wall.quantile(0.95)) if wall else None,
+                    'ttft_p50_ms': _ms(ttft.quantile(0.5)) if ttft else None,
+                    'load_mean_ms': _ms(load.mean) if load else None,
+                    'prompt_tokens': int(self._counters.get(('prompt_tokens_total', endpoint, model), 0)),
+                    'eval_tokens': int(eval_tokens),
+                    'tokens_per_s': round(eval_tokens / evals.sum, 1) if evals and evals.sum else None,
+                })
+            return rows
+
+    def render_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+
+        Returns:
+            Text suitable for a /metrics endpoint
+        """
+        lines: List[str] = []
+        with self._lock:
+            for name, (help_text, _) in COUNTERS.items():
+                series = sorted((k[1:], v) for k, v in self._counters.items() if k[0] == name)
+                if not series:
+                    continue
+                lines.append(f'# HELP {PREFIX}_{name} {help_text}')
+                lines.append(f'# TYPE {PREFIX}_{name} counter')
+                for (endpoint, model), value in series:
+                    lines.append(f'{PREFIX}_{name}{{{_labels(endpoint, model)}}} {_number(value)}')
+
+            for name, (help_text, _) in HISTOGRAMS.items():
+                series = sorted((k[1:], h) for k, h in self._histograms.items() if k[0] == name)
+                if not series:
+                    continue
+                lines.append(f'# HELP {PREFIX}_{name} {help_text}')
+                lines.append(f'# TYPE {PREFIX}_{name} histogram')
+                for (endpoint, model), histogram in series:
+                    labels = _labels(endpoint, model)
+                    cumulative = 0
+                    for bound, n in zip(histogram.bounds + (float('inf'),), histogram.counts):
+                        cumulative += n
+                        le = _number(bound)
+                        lines.append(f'{PREFIX}_{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                    lines.append(f'{PREFIX}_{name}_sum{{{labels}}} {_number(histogram.sum)}')
+                    lines.append(f'{PREFIX}_{name}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def _number(value: float) -> str:
+    """Format a sample value without losing precision (`:g` keeps 6 digits)"""
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    if value.is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _labels(endpoint: str, model: str) -> str:
+    model = model.replace('\\', '\\\\').replace('"', '\\"')
+    return f'endpoint="{endpoint}",model="{model}"'
+
+
+_default_metrics: Optional[MetricsRegistry] = None
+_default_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry shared by all helpers"""
+    global _default_metrics
+    with _default_metrics_lock:
+        if _default_metrics is None:
+            _default_metrics = MetricsRegistry()
+        return _default_metrics
+
+
+# ==================== Method Instrumentation ====================
+
+def _model_of(args: tuple, kwargs: Dict[str, Any]) -> Optional[str]:
+    model = kwargs.get('model', kwargs.get('model_name', kwargs.get('source')))
+    if model is None and args and isinstance(args[0], str):
+        model = args[0]
+    return model
+
+
+def _track(metrics: MetricsRegistry, endpoint: str, model: Optional[str],
+           started: float, stream: Iterator) -> Iterator:
+    ttft = None
+    last = None
+    error = False
+    try:
+        for chunk in stream:
+            if ttft is None:
+                ttft = time.perf_counter() - started
+            last = chunk
+            yield chunk
+    except Exception:
+        error = True
+        raise
+    finally:
+        metrics.observe(endpoint, model, time.perf_counter() - started, ttft, last, error)
+
+
+async def _atrack(metrics: MetricsRegistry, endpoint: str, model: Optional[str],
+                  started: float, stream: AsyncIterator) -> AsyncIterator:
+    ttft = None
+    last = None
+    error = False
+    try:
+        async for chunk in stream:
+            if ttft is None:
+                ttft = time.perf_counter() - started
+            last = chunk
+            yield chunk
+    except Exception:
+        error = True
+        raise
+    finally:
+        metrics.observe(endpoint, model, time.perf_counter() - started, ttft, last, error)
+
+
+def instrumented(endpoint: str) -> Callable:
+    """
+    Decorate an OllamaHelper method so every call is recorded in `self.metrics`
+
+    Streamed results are wrapped so the observation covers the whole stream
+    and includes the time to the first chunk.
+
+    Args:
+        endpoint: Endpoint label of the method
+
+    Returns:
+        Method decorator
+    """
+    def decorate(method: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                metrics = self.metrics
+                if metrics is None:
+                    return await method(self, *args, **kwargs)
+                model = _model_of(args, kwargs)
+                started = time.perf_counter()
+                try:
+                    result = await method(self, *args, **kwargs)
+                except Exception:
+                    metrics.observe(endpoint, model, time.perf_counter() - started, error=True)
+                    raise
+                if hasattr(result, '__aiter__'):
+                    return _atrack(metrics, endpoint, model, started, result)
+                metrics.observe(endpoint, model, time.perf_counter() - started, response=result)
+                return result
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = self.metrics
+            if metrics is None:
+                return method(self, *args, **kwargs)
+            model = _model_of(args, kwargs)
+            started = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            except Exception:
+                metrics.observe(endpoint, model, time.perf_counter() - started, error=True)
+                raise
+            if isinstance(result, Iterator):
+                return _track(metrics, endpoint, model, started, result)
+            # Model management methods report failures as {'error': ...}
+            error = isinstance(result, dict) and 'error' in result
+            metrics.observe(endpoint, model, time.perf_counter() - started, response=result, error=error)
+            return result
+        return wrapper
+
+    return decorate
+
+
+# ==================== HTTP Endpoint ====================
+
+def start_metrics_server(port: int = 9464, host: str = '127.0.0.1',
+                         registry: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+    """
+    Serve the metrics at http://host:port/metrics in a daemon thread
+
+    Args:
+        port: Port to listen on (0 picks a free port)
+        host: Interface to bind
+        registry: Registry to expose (defaults to the process-wide one)
+
+    Returns:
+        The running server (call `shutdown()` to stop it)
+    """
+    registry = registry or get_metrics()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name='ollama-helper-metrics', daemon=True).start()
+    return server
@@ -0,0 +1,239 @@
+"""
+KV-Cache-Friendly Chat Sessions
+
+Ollama reuses its KV cache when a new prompt starts with exactly the same
+tokens as the previous one. This module keeps multi-turn conversations
+append-only with a deterministic message layout, and measures how much of
+each prompt was served from the cache using the `prompt_eval_count` and
+`prompt_eval_duration` fields of the responses.
+"""
+
+import threading
+
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .context import ContextManager, _field, _message_key
+
+if TYPE_CHECKING:
+    from . import OllamaHelper
+
+
+# Field order of normalized messages
+MESSAGE_FIELDS = ('role', 'content', 'thinking', 'images', 'tool_calls', 'tool_name')
+
+DEFAULT_KEEP_ALIVE = '30m'
+
+
+def _plain(value: Any) -> Any:
+    """Convert pydantic models (e.g. tool calls) into plain containers"""
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(exclude_none=True)
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
+
+
+def normalize_message(message: Any) -> Dict[str, Any]:
+    """
+    Build a message dict with a fixed field order and no empty fields
+
+    Args:
+        message: Message dict or ollama Message
+
+    Returns:
+        Plain message dictionary that serializes identically every turn
+    """
+    normalized: Dict[str, Any] = {}
+    for name in MESSAGE_FIELDS:
+        value = _field(message, name)
+        if value or name in ('role', 'content'):
+            normalized[name] = _plain(value) if value is not None else ''
+    return normalized
+
+
+class PrefillTracker:
+    """Estimates the prompt tokens served from the KV cache per turn"""
+
+    def __init__(self):
+        self.turns: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._sent: Tuple[str, ...] = ()
+        self._context_tokens = 0
+
+    def is_prefix_stable(self, messages: List[Any]) -> bool:
+        """
+        Check whether the previously sent messages are a prefix of `messages`
+
+        Args:
+            messages: Messages about to be sent
+
+        Returns:
+            True if the server can reuse the previous prompt's cache
+        """
+        with self._lock:
+            sent = self._sent
+        if not sent or len(messages) < len(sent):
+            return False
+        return tuple(_message_key(m) for m in messages[:len(sent)]) == sent
+
+    def record(self, messages: List[Any], response: Any) -> Dict[str, Any]:
+        """
+        Record a finished turn
+
+        Args:
+            messages: Messages that were sent
+            response: Final (non-streaming or last streamed) chat response
+
+        Returns:
+            Turn statistics with evaluated and (estimated) cached prompt tokens
+        """
+        prompt_eval_count = _field(response, 'prompt_eval_count') or 0
+        prompt_eval_duration = _field(response, 'prompt_eval_duration') or 0
+        eval_count = _field(response, 'eval_count') or 0
+
+        stable = self.is_prefix_stable(messages)
+        with self._lock:
+            # Tokens of the previous prompt and reply that a stable prefix can reuse.
+            # If the server evaluated at least that many, the cache was not used.
+            reusable = self._context_tokens if stable else 0
+            cached = reusable if prompt_eval_count < reusable else 0
+            prompt_tokens = cached + prompt_eval_count
+
+            per_token = prompt_eval_duration / prompt_eval_count if prompt_eval_count else 0
+            turn = {
+                'prefix_stable': stable,
+                'prompt_tokens': prompt_tokens,
+                'prompt_eval_count': prompt_eval_count,
+                'cached_tokens': cached,
+                'prompt_eval_ms': round(prompt_eval_duration / 1e6, 1),
+                'saved_ms_estimate': round(cached * per_token / 1e6, 1),
+            }
+            self.turns.append(turn)
+
+            reply = _field(response, 'message')
+            self._sent = tuple(_message_key(m) for m in messages) + (
+                (_message_key(reply),) if reply is not None else ()
+            )
+            self._context_tokens = prompt_tokens + eval_count
+        return turn
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get totals over all recorded turns
+
+        Returns:
+            Dictionary with prompt tokens, cached tokens, cache ratio and
+            estimated prefill time saved
+        """
+        with self._lock:
+            prompt = sum(t['prompt_tokens'] for t in self.turns)
+            cached = sum(t['cached_tokens'] for t in self.turns)
+            return {
+                'turns': len(self.turns),
+                'prompt_tokens': prompt,
+                'cached_tokens': cached,
+                'cache_ratio': round(cached / prompt, 4) if prompt else 0.0,
+                'saved_ms_estimate': round(sum(t['saved_ms_estimate'] for t in self.turns), 1),
+            }
+
+
+class ChatSession:
+    """Append-only multi-turn conversation with stable prompt prefixes"""
+
+    def __init__(self, helper: 'OllamaHelper', model: str, system: Optional[str] = None,
+                 keep_alive: Optional[Union[float, str]] = DEFAULT_KEEP_ALIVE,
+                 options: Optional[Dict[str, Any]] = None,
+                 context_window: Optional[ContextManager] = None):
+        """
+        Initialize the session
+
+        Args:
+            helper: OllamaHelper used for the requests
+            model: Model name
+            system: Optional system prompt
+            keep_alive: How long the server keeps the model (and its cache) loaded
+            options: Model options sent with every turn (changing them between
+                turns would invalidate the cache)
+            context_window: Optional ContextManager for long conversations
+        """
+        self.helper = helper
+        self.model = model
+        self.keep_alive = keep_alive
+        self.options = dict(options or {})
+        self.context_window = context_window
+        self.prefill = PrefillTracker()
+
+        self._messages: List[Dict[str, Any]] = []
+        if system:
+            self._messages.append(normalize_message({'role': 'system', 'content': system}))
+
+    @property
+    def messages(self) -> Tuple[Dict[str, Any], ...]:
+        """Read-only view of the conversation"""
+        return tuple(self._messages)
+
+    def append(self, message: Any) -> None:
+        """
+        Append a message (e.g. a tool result) to the conversation
+
+        Args:
+            message: Message dict or ollama Message
+        """
+        self._messages.append(normalize_message(message))
+
+    def _prompt(self) -> List[Dict[str, Any]]:
+        messages = list(self._messages)
+        return self.context_window.fit(messages) if self.context_window else messages
+
+    def send(self, content: str, stream: bool = False, images: Optional[List] = None) -> Any:
+        """
+        Send a user message and append the reply to the conversation
+
+        Args:
+            content: User message
+            stream: Whether to stream the reply
+            images: Optional images attached to the message
+
+        Returns:
+            Chat response, or an iterator of chunks if stream=True
+        """
+        message = {'role': 'user', 'content': content}
+        if images:
+            message['images'] = images
+        self.append(message)
+
+        prompt = self._prompt()
+        response = self.helper.chat(
+            self.model, prompt, stream=stream, keep_alive=self.keep_alive, **self.options
+        )
+        if stream:
+            return self._consume(prompt, response)
+
+        self.append(response['message'])
+        self.prefill.record(prompt, response)
+        return response
+
+    def _consume(self, prompt: List[Dict[str, Any]], chunks: Iterator) -> Iterator:
+        content: List[str] = []
+        thinking: List[str] = []
+        tool_calls: List[Any] = []
+        last = None
+        for chunk in chunks:
+            message = chunk['message']
+            content.append(message.content or '')
+            thinking.append(message.thinking or '')
+            tool_calls.extend(message.tool_calls or [])
+            last = chunk
+            yield chunk
+
+        reply = {
+            'role': 'assistant',
+            'content': ''.join(content),
+            'thinking': ''.join(thinking),
+            'tool_calls': tool_calls,
+        }
+        self.append(reply)
+        if last is not None:
+            self.prefill.record(prompt, {**dict(last), 'message': reply})
@@ -0,0 +1,388 @@
+"""
+Response Cache for Deterministic Calls
+
+This module caches chat and generate responses for requests that are
+deterministic (temperature 0 or a fixed seed), keyed by the model digest and
+the full request payload (messages or prompt, format schema, options and a
+hash of any images). Entries live in an in-memory LRU tier backed by a
+size-bounded SQLite tier, and cached results are replayed as a stream when
+the caller asked for one.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Union
+
+from ollama import ChatResponse, GenerateResponse
+
+from .cache_dir import DEFAULT_CACHE_DIR
+
+
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_DISK_BYTES = 64 * 1024 * 1024
+
+_RESPONSE_TYPES = {'chat': ChatResponse, 'generate': GenerateResponse}
+# Field holding the generated text for each endpoint
+_TEXT_FIELD = {'chat': 'content', 'generate': 'response'}
+
+_PIECE = re.compile(r'\s*\S+\s*|\s+')
+
+
+def is_deterministic(options: Optional[Dict[str, Any]]) -> bool:
+    """Whether sampling options make a response reproducible"""
+    if not options:
+        return False
+    return options.get('temperature') == 0 or options.get('seed') is not None
+
+
+def _hash_image(image: Any) -> str:
+    if isinstance(image, bytes):
+        data = image
+    elif isinstance(image, (str, Path)) and len(str(image)) < 4096 and os.path.isfile(image):
+        data = Path(image).read_bytes()
+    elif hasattr(image, 'model_dump'):
+        data = json.dumps(image.model_dump(), default=str).encode('utf-8')
+    else:
+        data = str(image).encode('utf-8')
+    return 'sha256:' + hashlib.sha256(data).hexdigest()
+
+
+def _canonical(value: Any, key: Optional[str] = None) -> Any:
+    """Convert a request payload into JSON-serializable data with hashed images"""
+    if key == 'images' and value:
+        return [_hash_image(image) for image in value]
+    if hasattr(value, 'model_dump'):
+        value = value.model_dump(exclude_none=True)
+    if isinstance(value, dict):
+        return {k: _canonical(v, k) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, bytes):
+        return 'sha256:' + hashlib.sha256(value).hexdigest()
+    if callable(value):
+        return getattr(value, '__qualname__', repr(value))
+    return value
+
+
+def request_key(endpoint: str, digest: str, payload: Dict[str, Any]) -> str:
+    """
+    Build the cache key of a request
+
+    Args:
+        endpoint: 'chat' or 'generate'
+        digest: Model digest
+        payload: Request keyword arguments (stream and keep_alive are ignored)
+
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = {k: v for k, v in payload.items() if k not in ('stream', 'keep_alive')}
+    blob = json.dumps(
+        {'endpoint': endpoint, 'digest': digest, 'payload': _canonical(payload)},
+        sort_keys=True,
+        separators=(',', ':'),
+        default=str,
+    )
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + SQLite) cache of chat/generate responses"""
+
+    def __init__(self, path: Union[str, Path, None] = None,
+                 max_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 max_bytes: int = DEFAULT_DISK_BYTES):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file (defaults to responses.sqlite in the cache dir;
+                pass ':memory:' to disable the disk tier)
+            max_entries: Maximum entries in the in-memory LRU tier
+            max_bytes: Maximum compressed bytes in the disk tier
+        """
+        self.path = str(path) if path else str(DEFAULT_CACHE_DIR / 'responses.sqlite')
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._memory: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' data BLOB NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)')
+        self._conn.commit()
+        self._disk_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    # ==================== Storage ====================
+
+    def _remember(self, key: str, data: Dict[str, Any]) -> None:
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Request key
+
+        Returns:
+            Response data dictionary or None
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return data
+
+            row = self._conn.execute('SELECT data FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+            data = json.loads(zlib.decompress(row[0]))
+            self._remember(key, data)
+            self.disk_hits += 1
+            return data
+
+    def put(self, key: str, data: Dict[str, Any]) -> None:
+        """
+        Store a response, evicting least recently used disk entries if needed
+
+        Args:
+            key: Request key
+            data: Response data dictionary
+        """
+        blob = zlib.compress(json.dumps(data, default=str).encode('utf-8'))
+        with self._lock:
+            self._remember(key, data)
+
+            old = self._conn.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, data, size, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, blob, len(blob), time.time()),
+            )
+            self._disk_bytes += len(blob) - (old[0] if old else 0)
+
+            while self._disk_bytes > self.max_bytes:
+                victim = self._conn.execute(
+                    'SELECT key, size FROM responses ORDER BY accessed_at LIMIT 1'
+                ).fetchone()
+                if victim is None or victim[0] == key:
+                    break
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (victim[0],))
+                self._memory.pop(victim[0], None)
+                self._disk_bytes -= victim[1]
+                self.evictions += 1
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+            self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with hits per tier, misses, evictions and sizes
+        """
+        with self._lock:
+            total = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.memory_hits + self.disk_hits) / total, 4) if total else 0.0,
+                'evictions': self.evictions,
+                'memory_entries': len(self._memory),
+                'disk_bytes': self._disk_bytes,
+            }
+
+    # ==================== Call Wrapping ====================
+
+    def call(self, endpoint: str, key: str, request: Callable[[], Any], stream: bool) -> Any:
+        """
+        Serve a request from the cache, or run it and cache the result
+
+        Args:
+            endpoint: 'chat' or 'generate'
+            key: Request key from `request_key`
+            request: Callable sending the request to the server
+            stream: Whether the caller expects a stream iterator
+
+        Returns:
+            Response object, or an iterator of chunks if stream=True
+        """
+        data = self.get(key)
+        if data is not None:
+            return replay(endpoint, data) if stream else _RESPONSE_TYPES[endpoint].model_validate(data)
+
+        if stream:
+            return self._record(endpoint, key, request())
+
+        response = request()
+        self.put(key, response.model_dump(exclude_none=True))
+        return response
+
+    async def acall(self, endpoint: str, key: str, request: Callable[[], Awaitable[Any]],
+                    stream: bool) -> Any:
+        """
+        Async variant of `call`
+
+        Args:
+            endpoint: 'chat' or 'generate'
+            key: Request key from `request_key`
+            request: Coroutine function sending the request to the server
+            stream: Whether the caller expects a stream iterator
+
+        Returns:
+            Response object, or an async iterator of chunks if stream=True
+        """
+        data = self.get(key)
+        if data is not None:
+            return _areplay(endpoint, data) if stream else _RESPONSE_TYPES[endpoint].model_validate(data)
+
+        if stream:
+            return self._arecord(endpoint, key, await request())
+
+        response = await request()
+        self.put(key, response.model_dump(exclude_none=True))
+        return response
+
+    def _record(self, endpoint: str, key: str, chunks: Iterator) -> Iterator:
+        seen: List[Any] = []
+        for chunk in chunks:
+            seen.append(chunk)
+            yield chunk
+        # Only complete streams are cached
+        if seen and seen[-1].done:
+            self.put(key, aggregate(endpoint, seen))
+
+    async def _arecord(self, endpoint: str, key: str, chunks: AsyncIterator) -> AsyncIterator:
+        seen: List[Any] = []
+        async for chunk in chunks:
+            seen.append(chunk)
+            yield chunk
+        if seen and seen[-1].done:
+            self.put(key, aggregate(endpoint, seen))
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache, creating it on first use"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
+
+
+def aggregate(endpoint: str, chunks: List[Any]) -> Dict[str, Any]:
+    """
+    Merge streamed chunks into the equivalent non-streaming response
+
+    Args:
+        endpoint: 'chat' or 'generate'
+        chunks: Response chunks, the last one carrying the final metadata
+
+    Returns:
+        Response data dictionary
+    """
+    data = chunks[-1].model_dump(exclude_none=True)
+    text_field = _TEXT_FIELD[endpoint]
+
+    if endpoint == 'chat':
+        message = data.setdefault('message', {'role': 'assistant'})
+        message['content'] = ''.join(c.message.content or '' for c in chunks)
+        thinking = ''.join(c.message.thinking or '' for c in chunks)
+        tool_calls = [
+            call.model_dump(exclude_none=True)
+            for c in chunks for call in (c.message.tool_calls or [])
+        ]
+        for name, value in (('thinking', thinking), ('tool_calls', tool_calls)):
+            if value:
+                message[name] = value
+            else:
+                message.pop(name, None)
+    else:
+        data[text_field] = ''.join(getattr(c, text_field) or '' for c in chunks)
+        thinking = ''.join(c.thinking or '' for c in chunks)
+        if thinking:
+            data['thinking'] = thinking
+    return data
+
+
+def replay(endpoint: str, data: Dict[str, Any]) -> Iterator:
+    """
+    Replay a cached response as a stream of word-sized chunks
+
+    Args:
+        endpoint: 'chat' or 'generate'
+        data: Cached response data
+
+    Returns:
+        Iterator of response objects ending with the final (done) chunk
+    """
+    cls = _RESPONSE_TYPES[endpoint]
+    head = {k: data[k] for k in ('model', 'created_at') if k in data}
+
+    if endpoint == 'chat':
+        message = data.get('message', {})
+        role = message.get('role', 'assistant')
+        for field in ('thinking', 'content'):
+            for piece in _PIECE.findall(message.get(field) or ''):
+                yield cls.model_validate({**head, 'done': False, 'message': {'role': role, field: piece}})
+        if message.get('tool_calls'):
+            yield cls.model_validate({
+                **head, 'done': False,
+                'message': {'role': role, 'content': '', 'tool_calls': message['tool_calls']},
+            })
+        final = dict(data, message={'role': role, 'content': ''})
+    else:
+        for field in ('thinking', 'response'):
+            for piece in _PIECE.findall(data.get(field) or ''):
+                yield cls.model_validate({**head, 'done': False, 'response': '', field: piece})
+        final = dict(data, response='', thinking=None)
+
+    yield cls.model_validate(final)
+
+
+async def _areplay(endpoint: str, data: Dict[str, Any]) -> AsyncIterator:
+    for chunk in replay(endpoint, data):
+        yield chunk
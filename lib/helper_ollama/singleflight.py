@@ -0,0 +1,159 @@
+"""
+Single-Flight Request Coalescing
+
+When several callers (e.g. Streamlit sessions) send the same request at the
+same time, only the first one reaches the server; the others wait for it and
+receive the same result. Coalescing applies to calls that are in flight at
+the same time only - nothing is cached afterwards (see `ResponseCache`).
+"""
+
+import asyncio
+import threading
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """A request in flight and the result its waiters receive"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _LeaderCancelled(Exception):
+    """Set on an async call whose leader was cancelled; a waiter takes over"""
+
+
+class SingleFlight:
+    """Collapses identical concurrent calls into one"""
+
+    def __init__(self):
+        self.calls = 0
+        self.executed = 0
+        self.collapsed = 0
+
+        self._lock = threading.Lock()
+        self._sync: Dict[Hashable, _Call] = {}
+        self._async: Dict[Tuple[int, Hashable], 'asyncio.Future'] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run `fn`, or wait for the identical call already in flight
+
+        Args:
+            key: Request key (equal keys must mean interchangeable results)
+            fn: Callable sending the request
+
+        Returns:
+            Result of the (shared) call; the object is shared by all waiters
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._sync.get(key)
+            leader = call is None
+            if leader:
+                call = self._sync[key] = _Call()
+                self.executed += 1
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._sync[key]
+            call.done.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of `do`, coalescing calls on the same event loop
+
+        Args:
+            key: Request key
+            fn: Coroutine function sending the request
+
+        Returns:
+            Result of the (shared) call
+
+        If the leader is cancelled, its waiters are not: the first of them to
+        wake up sends the request itself and the others wait for it.
+        """
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+
+        with self._lock:
+            self.calls += 1
+        while True:
+            with self._lock:
+                future = self._async.get(slot)
+                leader = future is None
+                if leader:
+                    future = self._async[slot] = loop.create_future()
+                    self.executed += 1
+                else:
+                    self.collapsed += 1
+            if leader:
+                break
+            try:
+                # shield() keeps one cancelled waiter from cancelling the others
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                with self._lock:
+                    self.collapsed -= 1
+
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(_LeaderCancelled() if isinstance(e, asyncio.CancelledError) else e)
+            # Mark the exception as retrieved if nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._async[slot]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics
+
+        Returns:
+            Dictionary with calls, requests actually sent, collapsed
+            duplicates and the calls currently in flight
+        """
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'executed': self.executed,
+                'collapsed': self.collapsed,
+                'collapse_rate': round(self.collapsed / self.calls, 4) if self.calls else 0.0,
+                'in_flight': len(self._sync) + len(self._async),
+            }
+
+
+_default_flight: Optional[SingleFlight] = None
+_default_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide SingleFlight shared by all helpers"""
+    global _default_flight
+    with _default_flight_lock:
+        if _default_flight is None:
+            _default_flight = SingleFlight()
+        return _default_flight
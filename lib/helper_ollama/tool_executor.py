@@ -0,0 +1,188 @@
+"""
+Parallel Tool Execution
+
+A model turn can request several tool calls at once, e.g. `web_fetch` on
+three URLs. Running them one after another costs one round trip per call;
+`ToolExecutor` runs the calls of one turn concurrently on the background
+event loop - coroutine functions as tasks, plain functions on a shared
+thread pool - with a timeout per tool, and returns the results in the
+order the model requested them so the tool messages line up with the
+calls.
+"""
+
+import asyncio
+import inspect
+import json
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .event_loop import get_background_loop
+
+
+DEFAULT_TOOL_TIMEOUT = 30.0
+DEFAULT_TOOL_WORKERS = 16
+
+
+@dataclass
+class ToolResult:
+    """Outcome of one tool call"""
+
+    name: str
+    arguments: Dict[str, Any] = field(default_factory=dict)
+    output: Any = None
+    error: Optional[str] = None
+    timed_out: bool = False
+    elapsed_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def content(self) -> str:
+        """Text sent back to the model"""
+        return str(self.output) if self.ok else f'Error: {self.error}'
+
+    def to_message(self, content: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the tool message for the conversation
+
+        Args:
+            content: Text to send instead of `content` (e.g. a formatted or truncated output)
+
+        Returns:
+            Message dictionary with role 'tool'
+        """
+        return {'role': 'tool', 'content': self.content if content is None else content, 'tool_name': self.name}
+
+
+def tool_call_parts(tool_call: Any) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extract the function name and arguments of a tool call
+
+    Args:
+        tool_call: ollama Message.ToolCall or a {'function': {'name', 'arguments'}} dictionary
+
+    Returns:
+        Tuple of (name, arguments)
+    """
+    function = tool_call['function'] if isinstance(tool_call, dict) else tool_call.function
+    if isinstance(function, dict):
+        name, arguments = function.get('name', ''), function.get('arguments')
+    else:
+        name, arguments = function.name, function.arguments
+    if isinstance(arguments, str):
+        arguments = json.loads(arguments) if arguments.strip() else {}
+    return name, dict(arguments or {})
+
+
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_thread_pool_lock = threading.Lock()
+
+
+def get_tool_thread_pool() -> ThreadPoolExecutor:
+    """Get the process-wide thread pool for synchronous tools"""
+    global _thread_pool
+    with _thread_pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(max_workers=DEFAULT_TOOL_WORKERS, thread_name_prefix='ollama-tool')
+        return _thread_pool
+
+
+class ToolExecutor:
+    """Runs the tool calls of one model turn concurrently"""
+
+    def __init__(self, tools: Union[Dict[str, Callable], Iterable[Callable]],
+                 timeout: Optional[float] = DEFAULT_TOOL_TIMEOUT,
+                 timeouts: Optional[Dict[str, float]] = None,
+                 thread_pool: Optional[ThreadPoolExecutor] = None,
+                 validate: Optional[Callable[[str, Dict[str, Any]], Dict[str, Any]]] = None):
+        """
+        Initialize the executor
+
+        Args:
+            tools: Tool functions, as a name -> callable mapping or a list
+                (named after `__name__`)
+            timeout: Default seconds per tool call (None for no limit)
+            timeouts: Per-tool overrides of `timeout`
+            thread_pool: Pool for synchronous tools (defaults to a shared pool)
+            validate: Checks (and converts) the arguments of a call before it
+                runs, raising ValueError if they are invalid
+        """
+        if isinstance(tools, dict):
+            self.tools = dict(tools)
+        else:
+            self.tools = {fn.__name__: fn for fn in tools}
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.thread_pool = thread_pool
+        self.validate = validate
+
+    async def _call(self, tool_call: Any) -> ToolResult:
+        try:
+            name, arguments = tool_call_parts(tool_call)
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            return ToolResult(name='', error=f'Invalid tool call: {e}')
+
+        fn = self.tools.get(name)
+        if fn is None:
+            return ToolResult(name=name, arguments=arguments, error=f'Tool {name} not found')
+
+        if self.validate is not None:
+            try:
+                arguments = self.validate(name, arguments)
+            except ValueError as e:
+                return ToolResult(name=name, arguments=arguments, error=f'Invalid arguments for {name}: {e}')
+
+        timeout = self.timeouts.get(name, self.timeout)
+        started = time.perf_counter()
+        result = ToolResult(name=name, arguments=arguments)
+        try:
+            if inspect.iscoroutinefunction(fn):
+                work = fn(**arguments)
+            else:
+                # A timed out thread cannot be stopped; it finishes in the background
+                loop = asyncio.get_running_loop()
+                work = loop.run_in_executor(self.thread_pool or get_tool_thread_pool(), lambda: fn(**arguments))
+            output = await asyncio.wait_for(work, timeout)
+            if inspect.isawaitable(output):
+                output = await asyncio.wait_for(output, timeout)
+            result.output = output
+        except asyncio.TimeoutError:
+            result.timed_out = True
+            result.error = f'Tool {name} timed out after {timeout:g}s'
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+        result.elapsed_s = time.perf_counter() - started
+        return result
+
+    async def arun(self, tool_calls: Iterable[Any]) -> List[ToolResult]:
+        """
+        Run tool calls concurrently on the current event loop
+
+        Args:
+            tool_calls: Tool calls of one model turn
+
+        Returns:
+            One ToolResult per call, in the order of `tool_calls`
+        """
+        return list(await asyncio.gather(*(self._call(tool_call) for tool_call in tool_calls)))
+
+    def run(self, tool_calls: Iterable[Any]) -> List[ToolResult]:
+        """
+        Run tool calls concurrently from synchronous code
+
+        Args:
+            tool_calls: Tool calls of one model turn
+
+        Returns:
+            One ToolResult per call, in the order of `tool_calls`
+        """
+        tool_calls = list(tool_calls)
+        if not tool_calls:
+            return []
+        return get_background_loop().run(self.arun(tool_calls))
@@ -0,0 +1,342 @@
+"""
+Tool Registry
+
+Passing plain functions as `tools` makes the SDK inspect the signature and
+parse the docstring of every function on every request. This module
+compiles each function to a `Tool` once - keyed on the function object and,
+for functions redefined on a Streamlit rerun, on a hash of their source -
+checks the arguments of a tool call against the compiled schema before the
+function runs, and keeps the tools list of a `ToolRegistry` until the
+set of tools changes.
+"""
+
+import hashlib
+import inspect
+import json
+import marshal
+import threading
+import weakref
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from ollama._types import Tool
+from ollama._utils import convert_function_to_tool
+
+from .tool_executor import ToolExecutor, DEFAULT_TOOL_TIMEOUT
+
+
+ToolLike = Union[Callable, Dict[str, Any], Tool]
+
+
+class ToolArgumentError(ValueError):
+    """Arguments of a tool call do not match the tool's schema"""
+
+
+_by_function: 'weakref.WeakKeyDictionary[Callable, Tool]' = weakref.WeakKeyDictionary()
+_by_source: Dict[Tuple[str, str, str], Tool] = {}
+_compile_lock = threading.Lock()
+
+
+def source_hash(fn: Callable) -> str:
+    """
+    Hash the source of a function
+
+    Args:
+        fn: Function to hash
+
+    Returns:
+        Hex digest of the source (or of the bytecode if the source is unavailable)
+    """
+    try:
+        data = inspect.getsource(fn).encode('utf-8')
+    except (OSError, TypeError):
+        code = getattr(fn, '__code__', None)
+        data = marshal.dumps(code) if code is not None else repr(fn).encode('utf-8')
+        data += (inspect.getdoc(fn) or '').encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def compile_tool(tool: ToolLike) -> Tool:
+    """
+    Compile a tool definition, converting each function only once
+
+    Args:
+        tool: Python function (with type hints and a docstring), schema dictionary or Tool
+
+    Returns:
+        Validated Tool as sent to the chat endpoint
+    """
+    if isinstance(tool, Tool):
+        return tool
+    if not callable(tool):
+        return Tool.model_validate(tool)
+
+    try:
+        compiled = _by_function.get(tool)
+    except TypeError:
+        compiled = None
+    if compiled is not None:
+        return compiled
+
+    key = (getattr(tool, '__module__', '') or '', getattr(tool, '__qualname__', repr(tool)), source_hash(tool))
+    with _compile_lock:
+        compiled = _by_source.get(key)
+        if compiled is None:
+            compiled = _optional_defaults(convert_function_to_tool(tool), tool)
+            _by_source[key] = compiled
+        try:
+            _by_function[tool] = compiled
+        except TypeError:
+            pass
+    return compiled
+
+
+def _optional_defaults(compiled: Tool, fn: Callable) -> Tool:
+    """Drop parameters with a default from `required` (the SDK only looks at annotations)"""
+    parameters = compiled.function.parameters if compiled.function else None
+    if not parameters or not parameters.required:
+        return compiled
+    try:
+        signature = inspect.signature(fn)
+    except (TypeError, ValueError):
+        return compiled
+    defaulted = {name for name, p in signature.parameters.items() if p.default is not inspect.Parameter.empty}
+    parameters.required = [name for name in parameters.required if name not in defaulted]
+    return compiled
+
+
+def tool_schema(tool: ToolLike) -> Dict[str, Any]:
+    """
+    Get the JSON schema of a tool
+
+    Args:
+        tool: Python function, schema dictionary or Tool
+
+    Returns:
+        Tool schema dictionary
+    """
+    if isinstance(tool, dict):
+        return tool
+    return compile_tool(tool).model_dump(exclude_none=True, by_alias=True)
+
+
+def compile_tools(tools: Union['ToolRegistry', Iterable[ToolLike], None]) -> Optional[List[Tool]]:
+    """
+    Compile the `tools` argument of a chat request
+
+    Args:
+        tools: ToolRegistry or a list of functions, schema dictionaries and Tools
+
+    Returns:
+        List of Tools (None if `tools` is None)
+    """
+    if tools is None:
+        return None
+    if isinstance(tools, ToolRegistry):
+        return tools.tools
+    return [compile_tool(tool) for tool in tools]
+
+
+# ==================== Argument Validation ====================
+
+_TYPES = {
+    'string': lambda v: isinstance(v, str),
+    'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'boolean': lambda v: isinstance(v, bool),
+    'array': lambda v: isinstance(v, (list, tuple)),
+    'object': lambda v: isinstance(v, dict),
+    'null': lambda v: v is None,
+}
+
+
+def _types(spec: Any) -> List[str]:
+    kind = spec.type if spec is not None else None
+    if not kind:
+        return []
+    kinds = [kind] if isinstance(kind, str) else list(kind)
+    # convert_function_to_tool joins union types with ', '
+    return [k.strip() for entry in kinds for k in entry.split(',') if k.strip()]
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    """Convert a value a model sent in the wrong JSON type, raising ValueError if lossy"""
+    if kind == 'integer':
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str):
+            return int(value.strip())
+    elif kind == 'number' and isinstance(value, str):
+        return float(value.strip())
+    elif kind == 'boolean' and isinstance(value, str) and value.strip().lower() in ('true', 'false'):
+        return value.strip().lower() == 'true'
+    elif kind == 'string' and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    elif kind in ('array', 'object') and isinstance(value, str):
+        parsed = json.loads(value)
+        if _TYPES[kind](parsed):
+            return parsed
+    raise ValueError(kind)
+
+
+def validate_arguments(tool: Tool, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check tool call arguments against a compiled schema
+
+    Values of the wrong JSON type are converted when that loses nothing
+    (e.g. "3" for an integer), since models often quote numbers.
+
+    Args:
+        tool: Compiled Tool
+        arguments: Arguments from the tool call
+
+    Returns:
+        Arguments, converted to the schema's types
+
+    Raises:
+        ToolArgumentError: A required argument is missing, an argument is
+            unknown, or a value cannot be converted
+    """
+    parameters = tool.function.parameters if tool.function else None
+    properties = dict(parameters.properties or {}) if parameters else {}
+    required = list(parameters.required or []) if parameters else []
+
+    missing = [name for name in required if name not in arguments]
+    if missing:
+        raise ToolArgumentError(f"missing required argument(s): {', '.join(missing)}")
+    unknown = [name for name in arguments if name not in properties]
+    if unknown:
+        raise ToolArgumentError(f"unexpected argument(s): {', '.join(unknown)}")
+
+    validated = {}
+    for name, value in arguments.items():
+        spec = properties[name]
+        kinds = [kind for kind in _types(spec) if kind in _TYPES]
+        if kinds and not any(_TYPES[kind](value) for kind in kinds):
+            for kind in kinds:
+                try:
+                    value = _coerce(value, kind)
+                    break
+                except (ValueError, TypeError):
+                    continue
+            else:
+                raise ToolArgumentError(f"argument '{name}' should be {' or '.join(kinds)}, got {value!r}")
+        if spec.enum and value not in spec.enum:
+            raise ToolArgumentError(f"argument '{name}' should be one of {list(spec.enum)}, got {value!r}")
+        validated[name] = value
+    return validated
+
+
+# ==================== Registry ====================
+
+class ToolRegistry:
+    """Compiled tools and their implementations"""
+
+    def __init__(self, tools: Iterable[ToolLike] = (), functions: Optional[Dict[str, Callable]] = None):
+        """
+        Initialize the registry
+
+        Args:
+            tools: Tool functions, schema dictionaries or Tools
+            functions: Implementations of schema-only tools (name -> function)
+        """
+        self.version = 0
+        self._tools: Dict[str, Tool] = {}
+        self._functions: Dict[str, Callable] = {}
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Tuple[int, List[Tool]]] = None
+        functions = functions or {}
+        for tool in tools:
+            name = self.register(tool)
+            if name in functions:
+                self._functions[name] = functions[name]
+
+    def register(self, tool: ToolLike, function: Optional[Callable] = None) -> str:
+        """
+        Add or replace a tool
+
+        Args:
+            tool: Tool function, schema dictionary or Tool
+            function: Implementation (defaults to `tool` if it is a function)
+
+        Returns:
+            Name of the tool
+        """
+        compiled = compile_tool(tool)
+        name = compiled.function.name
+        function = function or (tool if callable(tool) else None)
+        with self._lock:
+            if self._tools.get(name) is not compiled or self._functions.get(name) is not function:
+                self._tools[name] = compiled
+                if function is not None:
+                    self._functions[name] = function
+                self.version += 1
+        return name
+
+    def unregister(self, name: str) -> None:
+        """
+        Remove a tool
+
+        Args:
+            name: Tool name
+        """
+        with self._lock:
+            if self._tools.pop(name, None) is not None:
+                self._functions.pop(name, None)
+                self.version += 1
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._tools)
+
+    @property
+    def functions(self) -> Dict[str, Callable]:
+        """Tool name -> implementation"""
+        return dict(self._functions)
+
+    @property
+    def tools(self) -> List[Tool]:
+        """Compiled tools to pass as `tools=` (rebuilt only when the registry changes)"""
+        with self._lock:
+            if self._snapshot is None or self._snapshot[0] != self.version:
+                self._snapshot = (self.version, list(self._tools.values()))
+            return self._snapshot[1]
+
+    def validate(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Check the arguments of a call to a registered tool
+
+        Args:
+            name: Tool name
+            arguments: Arguments from the tool call
+
+        Returns:
+            Arguments converted to the schema's types
+
+        Raises:
+            ToolArgumentError: The arguments do not match the schema
+        """
+        tool = self._tools.get(name)
+        if tool is None:
+            return arguments
+        return validate_arguments(tool, arguments)
+
+    def executor(self, timeout: Optional[float] = DEFAULT_TOOL_TIMEOUT,
+                 timeouts: Optional[Dict[str, float]] = None) -> ToolExecutor:
+        """
+        Create an executor that validates arguments before each call
+
+        Args:
+            timeout: Seconds per tool call (None for no limit)
+            timeouts: Per-tool overrides of `timeout`
+
+        Returns:
+            ToolExecutor over the registered implementations
+        """
+        return ToolExecutor(self.functions, timeout=timeout, timeouts=timeouts, validate=self.validate)
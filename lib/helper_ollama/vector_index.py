@@ -0,0 +1,282 @@
+"""
+Vector Similarity Index
+
+This module stores L2-normalized float32 embeddings in a (optionally
+memory-mapped) matrix and answers top-k cosine similarity queries with a
+single matrix-vector product plus `argpartition`.
+"""
+
+import json
+import threading
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from . import OllamaHelper
+
+
+_INITIAL_CAPACITY = 1024
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Return float32 rows scaled to unit L2 norm (zero rows stay zero)"""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class VectorIndex:
+    """Top-k cosine similarity index with incremental add and delete"""
+
+    def __init__(self, dim: Optional[int] = None, path: Union[str, Path, None] = None):
+        """
+        Initialize the index, loading it from disk if `path` already holds one
+
+        Args:
+            dim: Vector dimension (inferred from the first add if None)
+            path: Directory for the memory-mapped matrix and metadata
+                (None keeps everything in memory)
+        """
+        self.dim = dim
+        self.path = Path(path) if path else None
+
+        self._lock = threading.RLock()
+        self._matrix: Optional[np.ndarray] = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0
+        self._ids: List[Optional[str]] = []
+        self._texts: List[Optional[str]] = []
+        self._row_of: Dict[str, int] = {}
+
+        if self.path and (self.path / 'meta.json').exists():
+            self._load()
+
+    # ==================== Storage ====================
+
+    @property
+    def _matrix_file(self) -> Path:
+        return self.path / 'vectors.npy'
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        if self.path is None:
+            return np.zeros((capacity, self.dim), dtype=np.float32)
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self.path / 'vectors.npy.tmp'
+        matrix = np.lib.format.open_memmap(
+            tmp, mode='w+', dtype=np.float32, shape=(capacity, self.dim)
+        )
+        return matrix
+
+    def _grow(self, needed: int) -> None:
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if needed <= capacity:
+            return
+
+        new_capacity = max(_INITIAL_CAPACITY, capacity)
+        while new_capacity < needed:
+            new_capacity *= 2
+
+        matrix = self._allocate(new_capacity)
+        if self._size:
+            matrix[:self._size] = self._matrix[:self._size]
+        if self.path is not None:
+            matrix.flush()
+            del self._matrix
+            (self.path / 'vectors.npy.tmp').replace(self._matrix_file)
+            matrix = np.load(self._matrix_file, mmap_mode='r+')
+        self._matrix = matrix
+
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._alive = alive
+
+    def _load(self) -> None:
+        meta = json.loads((self.path / 'meta.json').read_text())
+        self.dim = meta['dim']
+        self._size = meta['size']
+        self._ids = meta['ids']
+        self._texts = meta['texts']
+        if not self._size:
+            return
+        self._matrix = np.load(self._matrix_file, mmap_mode='r+')
+        self._alive = np.zeros(self._matrix.shape[0], dtype=bool)
+        for row, id_ in enumerate(self._ids):
+            if id_ is not None:
+                self._alive[row] = True
+                self._row_of[id_] = row
+
+    def save(self) -> None:
+        """Flush the matrix and write the id/text metadata (no-op in memory)"""
+        if self.path is None:
+            return
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            if self._matrix is not None:
+                self._matrix.flush()
+            meta = {'dim': self.dim, 'size': self._size, 'ids': self._ids, 'texts': self._texts}
+            tmp = self.path / 'meta.json.tmp'
+            tmp.write_text(json.dumps(meta))
+            tmp.replace(self.path / 'meta.json')
+
+    # ==================== Mutation ====================
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray,
+            texts: Optional[Sequence[str]] = None) -> None:
+        """
+        Add or replace vectors
+
+        Args:
+            ids: Ids, one per vector (existing ids are replaced; of repeated ids
+                the last one wins)
+            vectors: Matrix of shape (len(ids), dim)
+            texts: Optional source texts stored alongside the vectors
+        """
+        vectors = normalize_rows(vectors)
+        if len(ids) != vectors.shape[0]:
+            raise ValueError('ids and vectors must have the same length')
+        if texts is not None and len(texts) != len(ids):
+            raise ValueError('ids and texts must have the same length')
+
+        # A repeated id keeps its last vector, as if the rows were added one by one
+        last = {id_: i for i, id_ in enumerate(ids)}
+        if len(last) != len(ids):
+            keep = sorted(last.values())
+            ids = [ids[i] for i in keep]
+            vectors = vectors[keep]
+            texts = [texts[i] for i in keep] if texts is not None else None
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            if vectors.shape[1] != self.dim:
+                raise ValueError(f'Expected vectors of dimension {self.dim}, got {vectors.shape[1]}')
+
+            self.delete([id_ for id_ in ids if id_ in self._row_of])
+            self._grow(self._size + len(ids))
+
+            start = self._size
+            self._matrix[start:start + len(ids)] = vectors
+            self._alive[start:start + len(ids)] = True
+            for offset, id_ in enumerate(ids):
+                self._row_of[id_] = start + offset
+                self._ids.append(id_)
+                self._texts.append(texts[offset] if texts is not None else None)
+            self._size += len(ids)
+
+    def add_texts(self, helper: 'OllamaHelper', model: str, texts: Sequence[str],
+                  ids: Optional[Sequence[str]] = None) -> None:
+        """
+        Embed texts with the helper's batch embedder and add them
+
+        Args:
+            helper: OllamaHelper used to embed the texts
+            model: Embedding model name
+            texts: Texts to index
+            ids: Optional ids (defaults to the texts themselves)
+        """
+        texts = list(texts)
+        if not texts:
+            return
+        vectors = helper.embed_batch(model, texts)
+        self.add(list(ids) if ids is not None else texts, vectors, texts)
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """
+        Delete vectors by id (rows are tombstoned until `compact`)
+
+        Args:
+            ids: Ids to delete
+
+        Returns:
+            Number of ids that were present
+        """
+        removed = 0
+        with self._lock:
+            for id_ in ids:
+                row = self._row_of.pop(id_, None)
+                if row is None:
+                    continue
+                self._alive[row] = False
+                self._ids[row] = None
+                self._texts[row] = None
+                removed += 1
+        return removed
+
+    def compact(self) -> None:
+        """Drop tombstoned rows and shrink the matrix to the live vectors"""
+        with self._lock:
+            if self._matrix is None:
+                return
+            rows = np.flatnonzero(self._alive[:self._size])
+            vectors = np.array(self._matrix[rows])
+            ids = [self._ids[r] for r in rows]
+            texts = [self._texts[r] for r in rows]
+
+            self._matrix = None
+            self._alive = np.zeros(0, dtype=bool)
+            self._size = 0
+            self._ids, self._texts, self._row_of = [], [], {}
+            if len(ids):
+                self.add(ids, vectors, texts)
+
+    def clear(self) -> None:
+        """Remove every vector"""
+        with self._lock:
+            self.delete(list(self._row_of))
+            self.compact()
+
+    # ==================== Query ====================
+
+    def search(self, query: np.ndarray, k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Find the k most similar vectors by cosine similarity
+
+        Args:
+            query: Query vector of shape (dim,)
+            k: Number of results
+
+        Returns:
+            List of {'id', 'text', 'score'} dictionaries, best first
+        """
+        with self._lock:
+            if self._matrix is None or len(self) == 0 or k <= 0:
+                return []
+
+            q = normalize_rows(query)[0]
+            scores = self._matrix[:self._size] @ q
+            scores[~self._alive[:self._size]] = -np.inf
+
+            k = min(k, len(self))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            return [
+                {'id': self._ids[row], 'text': self._texts[row], 'score': float(scores[row])}
+                for row in top
+            ]
+
+    def search_text(self, helper: 'OllamaHelper', model: str, text: str,
+                    k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Embed a query text and search for it
+
+        Args:
+            helper: OllamaHelper used to embed the query
+            model: Embedding model name (must match the indexed vectors)
+            text: Query text
+            k: Number of results
+
+        Returns:
+            List of {'id', 'text', 'score'} dictionaries, best first
+        """
+        return self.search(helper.embed_batch(model, [text])[0], k)
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, id_: str) -> bool:
+        return id_ in self._row_of
@@ -0,0 +1,338 @@
+"""
+Web Fetch and Search Cache
+
+`web_fetch` and `web_search` call Ollama's hosted API every time, even when
+another session, the MCP server or an earlier agent turn asked for the same
+page minutes ago. `WebCache` keeps the responses zlib-compressed in a SQLite
+file in the shared cache directory, keyed by URL or by query and result
+count, so every process on the machine reuses them. Entries are fresh for a
+TTL; a stale entry is revalidated by sending the request again - the API has
+no ETags, so the response is compared by content hash and an unchanged one
+only renews the entry - and the stale copy is served if that request fails.
+Identical requests in flight at the same time are sent once.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from ollama import Client, WebFetchResponse, WebSearchResponse
+
+from .cache_dir import DEFAULT_CACHE_DIR
+from .singleflight import SingleFlight
+
+
+DEFAULT_FETCH_TTL = 24 * 60 * 60
+DEFAULT_SEARCH_TTL = 60 * 60
+DEFAULT_WEB_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def web_key(kind: str, request: Dict[str, Any]) -> str:
+    """
+    Build the cache key of a web request
+
+    Args:
+        kind: 'fetch' or 'search'
+        request: Request arguments (url, or query and max_results)
+
+    Returns:
+        Hex digest identifying the request
+    """
+    blob = json.dumps({'kind': kind, **request}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+class WebCache:
+    """Compressed SQLite cache of web_fetch and web_search responses"""
+
+    def __init__(self, path: Union[str, Path, None] = None,
+                 fetch_ttl: float = DEFAULT_FETCH_TTL,
+                 search_ttl: float = DEFAULT_SEARCH_TTL,
+                 max_bytes: int = DEFAULT_WEB_CACHE_BYTES):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file (defaults to web.sqlite in the cache dir)
+            fetch_ttl: Seconds a fetched page stays fresh
+            search_ttl: Seconds search results stay fresh
+            max_bytes: Maximum compressed bytes on disk
+        """
+        self.path = str(path) if path else str(DEFAULT_CACHE_DIR / 'web.sqlite')
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttls = {'fetch': fetch_ttl, 'search': search_ttl}
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.refreshed = 0
+        self.stale_served = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        # Other processes may write the same file; wait for their locks
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS web ('
+            ' key TEXT PRIMARY KEY,'
+            ' kind TEXT NOT NULL,'
+            ' request TEXT NOT NULL,'
+            ' data BLOB NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' content_hash TEXT NOT NULL,'
+            ' validated_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS web_lru ON web (accessed_at)')
+        self._conn.commit()
+
+    # ==================== Storage ====================
+
+    def get(self, kind: str, request: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """
+        Look up a cached response
+
+        Args:
+            kind: 'fetch' or 'search'
+            request: Request arguments
+
+        Returns:
+            Tuple of (response data, whether it is still fresh) or None
+        """
+        key = web_key(kind, request)
+        with self._lock:
+            row = self._conn.execute('SELECT data, validated_at FROM web WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            self._conn.execute('UPDATE web SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+        fresh = now - row[1] < self.ttls.get(kind, DEFAULT_FETCH_TTL)
+        return json.loads(zlib.decompress(row[0])), fresh
+
+    def put(self, kind: str, request: Dict[str, Any], data: Dict[str, Any]) -> bool:
+        """
+        Store a response, evicting least recently used entries if needed
+
+        Args:
+            kind: 'fetch' or 'search'
+            request: Request arguments
+            data: Response data dictionary
+
+        Returns:
+            True if the content changed (or was new), False if only renewed
+        """
+        key = web_key(kind, request)
+        raw = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+        content_hash = hashlib.sha256(raw).hexdigest()
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute('SELECT content_hash FROM web WHERE key = ?', (key,)).fetchone()
+            if old is not None and old[0] == content_hash:
+                self._conn.execute(
+                    'UPDATE web SET validated_at = ?, accessed_at = ? WHERE key = ?', (now, now, key)
+                )
+                self._conn.commit()
+                return False
+
+            blob = zlib.compress(raw)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO web'
+                ' (key, kind, request, data, size, content_hash, validated_at, accessed_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, kind, json.dumps(request, sort_keys=True), blob, len(blob), content_hash, now, now),
+            )
+            # Summed from the table, as other processes share the file
+            disk_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM web').fetchone()[0]
+            while disk_bytes > self.max_bytes:
+                victim = self._conn.execute('SELECT key, size FROM web ORDER BY accessed_at LIMIT 1').fetchone()
+                if victim is None or victim[0] == key:
+                    break
+                self._conn.execute('DELETE FROM web WHERE key = ?', (victim[0],))
+                disk_bytes -= victim[1]
+                self.evictions += 1
+            self._conn.commit()
+            return True
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        with self._lock:
+            self._conn.execute('DELETE FROM web')
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with hits, misses, revalidations, stale responses
+            served, evictions and the size on disk
+        """
+        with self._lock:
+            entries, disk_bytes = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM web').fetchone()
+            total = self.hits + self.misses + self.revalidated + self.refreshed + self.stale_served
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidated': self.revalidated,
+                'refreshed': self.refreshed,
+                'stale_served': self.stale_served,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'evictions': self.evictions,
+                'entries': entries,
+                'disk_bytes': disk_bytes,
+            }
+
+    # ==================== Call Wrapping ====================
+
+    def call(self, kind: str, request: Dict[str, Any], send: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Serve a request from the cache, or send it and cache the response
+
+        Args:
+            kind: 'fetch' or 'search'
+            request: Request arguments
+            send: Callable sending the request, returning the response data
+
+        Returns:
+            Response data dictionary
+        """
+        cached = self.get(kind, request)
+        if cached is not None and cached[1]:
+            self.hits += 1
+            return cached[0]
+
+        def refresh() -> Dict[str, Any]:
+            try:
+                data = send()
+            except Exception:
+                if cached is None:
+                    raise
+                self.stale_served += 1
+                return cached[0]
+            changed = self.put(kind, request, data)
+            if cached is None:
+                self.misses += 1
+            elif changed:
+                self.refreshed += 1
+            else:
+                self.revalidated += 1
+            return data
+
+        return self._flight.do(web_key(kind, request), refresh)
+
+
+class CachedWebClient:
+    """`web_search` and `web_fetch` of an ollama Client, served through a WebCache"""
+
+    def __init__(self, client: Optional[Client] = None, cache: Optional[WebCache] = None):
+        """
+        Initialize the client
+
+        Args:
+            client: ollama Client sending the requests (defaults to Client())
+            cache: Cache to use (defaults to the process-wide cache)
+        """
+        self.client = client or Client()
+        self.cache = cache or get_web_cache()
+
+    def web_search(self, query: str, max_results: int = 3) -> WebSearchResponse:
+        """
+        Search the web, reusing cached results
+
+        Args:
+            query: The query to search for
+            max_results: The maximum number of results to return
+
+        Returns:
+            WebSearchResponse with the search results
+        """
+        data = self.cache.call(
+            'search',
+            {'query': query, 'max_results': max_results},
+            lambda: self.client.web_search(query=query, max_results=max_results).model_dump(),
+        )
+        return WebSearchResponse.model_validate(data)
+
+    def web_fetch(self, url: str) -> WebFetchResponse:
+        """
+        Fetch a web page, reusing a cached copy
+
+        Args:
+            url: The URL to fetch
+
+        Returns:
+            WebFetchResponse with the fetched result
+        """
+        data = self.cache.call('fetch', {'url': url}, lambda: self.client.web_fetch(url=url).model_dump())
+        return WebFetchResponse.model_validate(data)
+
+    def __getattr__(self, name: str) -> Any:
+        # Everything else (chat, ...) goes to the wrapped client
+        if name == 'client':
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+
+_default_cache: Optional[WebCache] = None
+_default_cache_lock = threading.Lock()
+_default_client: Optional[CachedWebClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_web_cache() -> WebCache:
+    """Get the process-wide web cache, creating it on first use"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = WebCache()
+        return _default_cache
+
+
+def get_web_client() -> CachedWebClient:
+    """Get the process-wide cached web client, creating it on first use"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = CachedWebClient()
+        return _default_client
+
+
+# ==================== Tool Functions ====================
+# Drop-in replacements for ollama.web_search and ollama.web_fetch as tools
+
+def web_search(query: str, max_results: int = 3) -> WebSearchResponse:
+    """
+    Performs a web search
+
+    Args:
+        query: The query to search for
+        max_results: The maximum number of results to return (default: 3)
+
+    Returns:
+        WebSearchResponse with the search results
+    """
+    return get_web_client().web_search(query, max_results)
+
+
+def web_fetch(url: str) -> WebFetchResponse:
+    """
+    Fetches the content of a web page for the provided URL.
+
+    Args:
+        url: The URL to fetch
+
+    Returns:
+        WebFetchResponse with the fetched result
+    """
+    return get_web_client().web_fetch(url)
@@ -7,21 +7,43 @@ Ollama models into Streamlit applications.
 
 import sys
 import os
+import threading
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 
 import streamlit as st
 
-from ollama import chat as ollama_chat, generate as ollama_generate
+from lib.helper_ollama import OllamaHelper, ContextManager, PrefillTracker, AgentResult
 
-from lib.helper_ollama import OllamaHelper
+from .streaming import StreamRenderer, DEFAULT_FLUSH_INTERVAL, DEFAULT_FLUSH_TOKENS
+from .agent import AgentRenderer
 
 
 class StreamlitOllamaHelper:
     """Helper class for Ollama integration in Streamlit"""
 
-    def __init__(self):
-        self.ollama = OllamaHelper()
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        flush_tokens: int = DEFAULT_FLUSH_TOKENS,
+    ):
+        self.ollama = OllamaHelper(host=host)
+        self.flush_interval = flush_interval
+        self.flush_tokens = flush_tokens
+        self.last_stream_stats: Optional[Dict[str, Any]] = None
+        self.last_prefill_stats: Optional[Dict[str, Any]] = None
+
+    def _renderer(
+        self, placeholder: Any, on_flush: Optional[Callable[[str], None]] = None
+    ) -> StreamRenderer:
+        """Create a throttled renderer with this helper's flush budget"""
+        return StreamRenderer(
+            placeholder,
+            flush_interval=self.flush_interval,
+            flush_tokens=self.flush_tokens,
+            on_flush=on_flush,
+        )
 
     # ==================== UI Components ====================
 
@@ -177,6 +199,7 @@ class StreamlitOllamaHelper:
         stream: bool = True,
         options: Optional[Dict[str, Any]] = None,
         container: Optional[Any] = None,
+        show_stats: bool = False,
     ) -> str:
         """
         Run a chat interaction and display results
@@ -187,6 +210,7 @@ class StreamlitOllamaHelper:
             stream: Whether to stream the response
             options: Optional model options (temperature, etc.)
             container: Optional Streamlit container to render in
+            show_stats: Show time-to-first-token and tokens/sec below a stream
 
         Returns:
             Complete response text
@@ -195,25 +219,18 @@ class StreamlitOllamaHelper:
             container = st
 
         if stream:
-            response_placeholder = container.empty()
-            full_response = ""
-
-            kwargs = {"model": model, "messages": messages, "stream": True}
-            if options:
-                kwargs["options"] = options
-
-            for chunk in ollama_chat(**kwargs):
-                full_response += chunk["message"]["content"]
-                response_placeholder.markdown(full_response + "▌")
+            renderer = self._renderer(container.empty())
+            full_response = renderer.consume(
+                self.ollama.chat(model, messages, stream=True, **(options or {})),
+                lambda chunk: chunk["message"]["content"],
+            )
 
-            response_placeholder.markdown(full_response)
+            self.last_stream_stats = renderer.stats()
+            if show_stats:
+                container.caption(renderer.caption())
             return full_response
         else:
-            kwargs = {"model": model, "messages": messages, "stream": False}
-            if options:
-                kwargs["options"] = options
-
-            response = ollama_chat(**kwargs)
+            response = self.ollama.chat(model, messages, stream=False, **(options or {}))
             content = response["message"]["content"]
             container.write(content)
             return content
@@ -224,6 +241,10 @@ class StreamlitOllamaHelper:
         session_key: str = "chat_history",
         initial_messages: Optional[List[Dict[str, Any]]] = None,
         options: Optional[Dict[str, Any]] = None,
+        show_stats: bool = False,
+        placeholder: str = "Your message...",
+        context_window: Optional[ContextManager] = None,
+        keep_alive: Optional[Any] = None,
     ):
         """
         Run a chat interface with session-based history
@@ -233,18 +254,25 @@ class StreamlitOllamaHelper:
             session_key: Session state key for chat history
             initial_messages: Initial message history
             options: Optional model options
+            show_stats: Show time-to-first-token and tokens/sec below replies
+            placeholder: Placeholder text of the chat input
+            context_window: Optional ContextManager keeping the prompt under
+                a token budget (the full history stays in session state)
+            keep_alive: How long the model (and its prompt cache) stays loaded
         """
         # Initialize chat history in session state
         if session_key not in st.session_state:
             st.session_state[session_key] = initial_messages or []
 
+        self._recover_interrupted_reply(session_key)
+
         # Display chat history
         for msg in st.session_state[session_key]:
             with st.chat_message(msg["role"]):
                 st.write(msg["content"])
 
         # Chat input
-        if user_input := st.chat_input("Your message..."):
+        if user_input := st.chat_input(placeholder):
             # Add user message
             st.session_state[session_key].append(
                 {"role": "user", "content": user_input}
@@ -253,21 +281,102 @@ class StreamlitOllamaHelper:
             with st.chat_message("user"):
                 st.write(user_input)
 
-            # Get assistant response
+            # Stream assistant response
             with st.chat_message("assistant"):
-                with st.spinner("Thinking..."):
-                    kwargs = {"model": model, "messages": st.session_state[session_key]}
-                    if options:
-                        kwargs["options"] = options
+                self.stream_reply(
+                    model,
+                    session_key=session_key,
+                    options=options,
+                    show_stats=show_stats,
+                    context_window=context_window,
+                    keep_alive=keep_alive,
+                )
 
-                    response = ollama_chat(**kwargs)
-                    assistant_message = response["message"]["content"]
-                    st.write(assistant_message)
+    def stream_reply(
+        self,
+        model: str,
+        session_key: str = "chat_history",
+        options: Optional[Dict[str, Any]] = None,
+        show_stats: bool = False,
+        context_window: Optional[ContextManager] = None,
+        keep_alive: Optional[Any] = None,
+    ) -> str:
+        """
+        Stream the assistant's reply to the history in session state
+
+        The reply is appended to the history before the first token arrives
+        and its content is updated on every flush, so a rerun in the middle
+        of the stream keeps the partial answer. The history is append-only,
+        so the prompt prefix stays identical between turns and the server
+        can reuse its KV cache; the reuse is tracked per session.
+
+        Args:
+            model: Model name
+            session_key: Session state key for chat history
+            options: Optional model options
+            show_stats: Show time-to-first-token and tokens/sec below the reply
+            context_window: Optional ContextManager for the prompt
+            keep_alive: How long the model (and its prompt cache) stays loaded
 
-                    # Add to history
-                    st.session_state[session_key].append(
-                        {"role": "assistant", "content": assistant_message}
-                    )
+        Returns:
+            Complete response text
+        """
+        history = st.session_state[session_key]
+        messages = self.ollama.fit_context(list(history), context_window)
+        prefill = st.session_state.setdefault(f"{session_key}_prefill", PrefillTracker())
+
+        reply = {"role": "assistant", "content": ""}
+        history.append(reply)
+        st.session_state[f"{session_key}_streaming"] = True
+
+        def commit(text: str):
+            reply["content"] = text
+
+        # A rerun interrupts the stream with a BaseException, which leaves the
+        # streaming flag set so the next run can recover the partial reply
+        renderer = self._renderer(st.empty(), on_flush=commit)
+        try:
+            full_response = renderer.consume(
+                self.ollama.chat(
+                    model,
+                    messages,
+                    stream=True,
+                    keep_alive=keep_alive,
+                    **(options or {}),
+                ),
+                lambda chunk: chunk["message"]["content"],
+            )
+        except Exception:
+            if not reply["content"] and history and history[-1] is reply:
+                history.pop()
+            st.session_state.pop(f"{session_key}_streaming", None)
+            raise
+        st.session_state.pop(f"{session_key}_streaming", None)
+
+        self.last_stream_stats = renderer.stats()
+        if renderer.final_chunk is not None:
+            turn = prefill.record(messages, {**dict(renderer.final_chunk), "message": reply})
+            self.last_prefill_stats = {**turn, "session": prefill.stats()}
+
+        if show_stats:
+            caption = renderer.caption()
+            if self.last_prefill_stats and self.last_prefill_stats["prompt_tokens"]:
+                caption += (
+                    f" · prompt cache {self.last_prefill_stats['cached_tokens']}"
+                    f"/{self.last_prefill_stats['prompt_tokens']} tokens"
+                )
+            st.caption(caption)
+        return full_response
+
+    def _recover_interrupted_reply(self, session_key: str):
+        """Clean up after a reply stream that was cut off by a rerun"""
+        if not st.session_state.pop(f"{session_key}_streaming", False):
+            return
+
+        # Partial replies stay in the history; empty ones are dropped
+        history = st.session_state[session_key]
+        if history and history[-1]["role"] == "assistant" and not history[-1]["content"]:
+            history.pop()
 
     def clear_chat_history(self, session_key: str = "chat_history"):
         """Clear chat history from session state"""
@@ -284,6 +393,7 @@ class StreamlitOllamaHelper:
         options: Optional[Dict[str, Any]] = None,
         images: Optional[List] = None,
         container: Optional[Any] = None,
+        show_stats: bool = False,
     ) -> str:
         """
         Run text generation and display results
@@ -295,6 +405,7 @@ class StreamlitOllamaHelper:
             options: Optional model options
             images: Optional images for multimodal models
             container: Optional container to render in
+            show_stats: Show time-to-first-token and tokens/sec below a stream
 
         Returns:
             Generated text
@@ -303,33 +414,63 @@ class StreamlitOllamaHelper:
             container = st
 
         if stream:
-            response_placeholder = container.empty()
-            full_response = ""
-
-            kwargs = {"model": model, "prompt": prompt, "stream": True}
-            if options:
-                kwargs["options"] = options
-            if images:
-                kwargs["images"] = images
-
-            for chunk in ollama_generate(**kwargs):
-                full_response += chunk["response"]
-                response_placeholder.markdown(full_response + "▌")
+            renderer = self._renderer(container.empty())
+            full_response = renderer.consume(
+                self.ollama.generate(
+                    model, prompt, stream=True, images=images, **(options or {})
+                ),
+                lambda chunk: chunk["response"],
+            )
 
-            response_placeholder.markdown(full_response)
+            self.last_stream_stats = renderer.stats()
+            if show_stats:
+                container.caption(renderer.caption())
             return full_response
         else:
-            kwargs = {"model": model, "prompt": prompt, "stream": False}
-            if options:
-                kwargs["options"] = options
-            if images:
-                kwargs["images"] = images
-
-            response = ollama_generate(**kwargs)
+            response = self.ollama.generate(
+                model, prompt, stream=False, images=images, **(options or {})
+            )
             content = response["response"]
             container.write(content)
             return content
 
+    # ==================== Tool Functions ====================
+
+    def run_agent(
+        self,
+        model: str,
+        messages: List[Any],
+        tools: List,
+        container: Optional[Any] = None,
+        show_iterations: bool = True,
+        show_thinking: bool = True,
+        **kwargs,
+    ) -> AgentResult:
+        """
+        Run a tool-calling agent loop and render its progress
+
+        Args:
+            model: Model name
+            messages: Conversation so far (extended in place)
+            tools: Tool functions and/or schema dictionaries
+            container: Optional container to render in
+            show_iterations: Show a subheader per model turn
+            show_thinking: Show the model's thinking
+            **kwargs: AgentLoop settings (max_iterations, max_tokens, think,
+                tool_timeout, format_result, model options, ...)
+
+        Returns:
+            AgentResult with the final answer and usage
+        """
+        renderer = AgentRenderer(
+            container,
+            show_iterations=show_iterations,
+            show_thinking=show_thinking,
+            flush_interval=self.flush_interval,
+            flush_tokens=self.flush_tokens,
+        )
+        return renderer.consume(self.ollama.agent(model, tools, **kwargs).stream(messages))
+
     # ==================== Model Management UI ====================
 
     def render_model_list(self):
@@ -426,8 +567,19 @@ class StreamlitOllamaHelper:
                         st.write(f"**Expires:** {model['expires_at']}")
 
 
-# Convenience instance
-_helper = StreamlitOllamaHelper()
+# Convenience instance, created on first use so importing this module stays cheap
+_helper: Optional[StreamlitOllamaHelper] = None
+_helper_lock = threading.Lock()
+
+
+def get_helper() -> StreamlitOllamaHelper:
+    """Get the module-level helper, creating it on first use"""
+    global _helper
+    with _helper_lock:
+        if _helper is None:
+            _helper = StreamlitOllamaHelper()
+        return _helper
+
 
 # Convenience functions
 # Select Model", ["gemma3", "llama3.1", "llama3.2", "qwen2.5"], index=0)
@@ -440,20 +592,20 @@ def select_model(
     use_installed=True,
     **kwargs,
 ) -> str:
-    return _helper.render_model_selector(key=key, location=location, label=label, use_installed=use_installed, **kwargs)
+    return get_helper().render_model_selector(key=key, location=location, label=label, use_installed=use_installed, **kwargs)
 
 
 def render_settings(
     key_prefix: str = "settings", location: str = "sidebar", **kwargs
 ) -> Dict[str, Any]:
-    return _helper.render_model_settings(
+    return get_helper().render_model_settings(
         key_prefix=key_prefix, location=location, **kwargs
     )
 
 
 def chat(model: str, session_key: str = "chat_history", **kwargs):
-    return _helper.run_chat_with_history(model=model, session_key=session_key, **kwargs)
+    return get_helper().run_chat_with_history(model=model, session_key=session_key, **kwargs)
 
 
 def generate_text(model: str, prompt: str, stream: bool = True, **kwargs) -> str:
-    return _helper.run_generate(model=model, prompt=prompt, stream=stream, **kwargs)
+    return get_helper().run_generate(model=model, prompt=prompt, stream=stream, **kwargs)
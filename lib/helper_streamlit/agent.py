@@ -0,0 +1,127 @@
+"""
+Agent Loop Rendering
+
+This module renders the events of `lib.helper_ollama.AgentLoop` into
+Streamlit: one section per model turn, thinking in an expander, content
+through the throttled `StreamRenderer`, and a line per tool call with its
+result.
+"""
+
+from typing import Any, Iterable, Optional
+
+import streamlit as st
+
+from lib.helper_ollama import AgentEvent, AgentResult
+
+from .streaming import StreamRenderer, DEFAULT_FLUSH_INTERVAL, DEFAULT_FLUSH_TOKENS
+
+
+class AgentRenderer:
+    """Renders AgentLoop events as they arrive"""
+
+    def __init__(
+        self,
+        container: Any = None,
+        show_iterations: bool = True,
+        show_thinking: bool = True,
+        preview_chars: int = 500,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        flush_tokens: int = DEFAULT_FLUSH_TOKENS,
+    ):
+        """
+        Initialize the renderer
+
+        Args:
+            container: Streamlit container to render into (defaults to st)
+            show_iterations: Show a subheader per model turn
+            show_thinking: Show the model's thinking in an expander
+            preview_chars: Tool results longer than this are shown in an expander, truncated
+            flush_interval: Maximum seconds between two renders of streamed text
+            flush_tokens: Maximum chunks between two renders of streamed text
+        """
+        self.container = container or st
+        self.show_iterations = show_iterations
+        self.show_thinking = show_thinking
+        self.preview_chars = preview_chars
+        self.flush_interval = flush_interval
+        self.flush_tokens = flush_tokens
+
+        self._thinking: Optional[StreamRenderer] = None
+        self._content: Optional[StreamRenderer] = None
+        self._tools_header = False
+
+    def _renderer(self, placeholder: Any) -> StreamRenderer:
+        return StreamRenderer(placeholder, flush_interval=self.flush_interval, flush_tokens=self.flush_tokens)
+
+    def _close_text(self) -> None:
+        for renderer in (self._thinking, self._content):
+            if renderer is not None:
+                renderer.finish()
+        self._thinking = None
+        self._content = None
+
+    def render(self, event: AgentEvent) -> None:
+        """
+        Render one event
+
+        Args:
+            event: AgentEvent from AgentLoop.stream()
+        """
+        c = self.container
+
+        if event.type == "iteration":
+            self._close_text()
+            self._tools_header = False
+            if self.show_iterations:
+                c.subheader(f"Iteration {event.iteration}")
+
+        elif event.type == "thinking":
+            if not self.show_thinking:
+                return
+            if self._thinking is None:
+                self._thinking = self._renderer(c.expander("🤔 Thinking", expanded=False).empty())
+            self._thinking.write(event.text)
+
+        elif event.type == "content":
+            if self._content is None:
+                self._content = self._renderer(c.empty())
+            self._content.write(event.text)
+
+        elif event.type == "tool_result":
+            if not self._tools_header:
+                # Close the streamed text before the tool section starts
+                self._close_text()
+                c.write("**🔧 Tool Calls:**")
+                self._tools_header = True
+            tool_result = event.result
+            if not tool_result.ok:
+                c.error(f"`{event.name}` with args `{event.arguments}`: {tool_result.error}")
+            elif len(event.text) <= self.preview_chars and "\n" not in event.text:
+                c.write(f"- `{event.name}` with args `{event.arguments}` → {event.text}")
+            else:
+                c.write(f"- `{event.name}` with args `{event.arguments}`")
+                with c.expander("📊 Results Preview"):
+                    st.markdown(event.text[:self.preview_chars])
+
+        elif event.type == "error":
+            c.error(f"Error: {event.text}")
+
+        elif event.type == "done":
+            self._close_text()
+
+    def consume(self, events: Iterable[AgentEvent]) -> Optional[AgentResult]:
+        """
+        Render a whole agent run
+
+        Args:
+            events: Iterator from AgentLoop.stream()
+
+        Returns:
+            AgentResult of the run
+        """
+        result = None
+        for event in events:
+            self.render(event)
+            if event.type == "done":
+                result = event.result
+        return result
@@ -0,0 +1,184 @@
+"""
+Throttled Streaming Renderer
+
+This module renders streamed model output into a Streamlit placeholder
+without re-sending the whole markdown on every token: chunks are collected
+in a list and flushed to the placeholder at most every `flush_interval`
+seconds or `flush_tokens` chunks, and time-to-first-token and throughput
+are recorded along the way.
+"""
+
+import time
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+DEFAULT_FLUSH_INTERVAL = 0.05
+DEFAULT_FLUSH_TOKENS = 32
+CURSOR = "▌"
+
+
+class StreamRenderer:
+    """Accumulates streamed text and flushes it to a placeholder on a budget"""
+
+    def __init__(
+        self,
+        placeholder: Any,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        flush_tokens: int = DEFAULT_FLUSH_TOKENS,
+        cursor: str = CURSOR,
+        on_flush: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        Initialize the renderer
+
+        Args:
+            placeholder: Object with a `markdown(text)` method (e.g. st.empty())
+            flush_interval: Maximum seconds between two flushes
+            flush_tokens: Maximum number of chunks between two flushes
+            cursor: Suffix shown while the stream is still running
+            on_flush: Optional callback receiving the full text on every flush
+                (e.g. to persist partial output in session state)
+        """
+        self.placeholder = placeholder
+        self.flush_interval = flush_interval
+        self.flush_tokens = flush_tokens
+        self.cursor = cursor
+        self.on_flush = on_flush
+
+        self.tokens = 0
+        self.flushes = 0
+        self.eval_count: Optional[int] = None
+        self.eval_duration: Optional[int] = None
+        self.final_chunk: Optional[Any] = None
+
+        self._text = ""
+        self._pending: List[str] = []
+        self._started = time.perf_counter()
+        self._first_token: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._last_flush = self._started
+
+    @property
+    def text(self) -> str:
+        """Full text received so far"""
+        if self._pending:
+            self._text += "".join(self._pending)
+            self._pending = []
+        return self._text
+
+    def write(self, chunk: str) -> None:
+        """
+        Add a streamed chunk, flushing if the time or token budget is spent
+
+        Args:
+            chunk: Text of one streamed chunk
+        """
+        if not chunk:
+            return
+
+        now = time.perf_counter()
+        if self._first_token is None:
+            self._first_token = now
+
+        self._pending.append(chunk)
+        self.tokens += 1
+
+        if (
+            len(self._pending) >= self.flush_tokens
+            or now - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self, final: bool = False) -> None:
+        """
+        Render the accumulated text into the placeholder
+
+        Args:
+            final: Render without the cursor
+        """
+        text = self.text
+        if self.on_flush is not None:
+            self.on_flush(text)
+        self.placeholder.markdown(text if final else text + self.cursor)
+        self.flushes += 1
+        self._last_flush = time.perf_counter()
+
+    def finish(self, final_chunk: Optional[Any] = None) -> str:
+        """
+        Render the complete text and stop the clock
+
+        Args:
+            final_chunk: Optional last response object carrying server timings
+
+        Returns:
+            Complete response text
+        """
+        self._finished = time.perf_counter()
+        if final_chunk is not None:
+            self.final_chunk = final_chunk
+            self.eval_count = _field(final_chunk, "eval_count")
+            self.eval_duration = _field(final_chunk, "eval_duration")
+        self.flush(final=True)
+        return self.text
+
+    def consume(self, stream: Iterable[Any], extract: Callable[[Any], Optional[str]]) -> str:
+        """
+        Render a whole stream
+
+        Args:
+            stream: Iterator of response chunks
+            extract: Function returning the text of a chunk
+
+        Returns:
+            Complete response text
+        """
+        last = None
+        for chunk in stream:
+            self.write(extract(chunk) or "")
+            last = chunk
+        return self.finish(last)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get streaming statistics
+
+        Returns:
+            Dictionary with chunk count, flushes, time-to-first-token,
+            elapsed time and tokens/sec (server-side if reported)
+        """
+        end = self._finished or time.perf_counter()
+        ttft = self._first_token - self._started if self._first_token else None
+
+        tokens_per_s = None
+        if self.eval_count and self.eval_duration:
+            tokens_per_s = self.eval_count / (self.eval_duration / 1e9)
+        elif self._first_token and end > self._first_token:
+            tokens_per_s = self.tokens / (end - self._first_token)
+
+        return {
+            "tokens": self.eval_count or self.tokens,
+            "flushes": self.flushes,
+            "ttft_s": round(ttft, 3) if ttft is not None else None,
+            "elapsed_s": round(end - self._started, 3),
+            "tokens_per_s": round(tokens_per_s, 1) if tokens_per_s else None,
+        }
+
+    def caption(self) -> str:
+        """Short human-readable summary of `stats()`"""
+        stats = self.stats()
+        parts = [f"{stats['tokens']} tokens"]
+        if stats["ttft_s"] is not None:
+            parts.append(f"TTFT {stats['ttft_s']:.2f}s")
+        if stats["tokens_per_s"]:
+            parts.append(f"{stats['tokens_per_s']:.1f} tok/s")
+        parts.append(f"{stats['elapsed_s']:.2f}s total")
+        return " · ".join(parts)
+
+
+def _field(obj: Any, name: str) -> Any:
+    """Read a field from a response object or dict"""
+    try:
+        return obj[name]
+    except (KeyError, TypeError):
+        return getattr(obj, name, None)
@@ -0,0 +1,75 @@
+"""
+Run a JSONL file of prompts through Ollama with bounded concurrency.
+
+Each input line is {"id": ..., "prompt": ...} or {"id": ..., "messages": [...]}
+(optionally with "model", "options", "format" and "system"). Results are
+appended to the output JSONL as they finish; re-running the same command
+resumes after the records that are already in the output.
+
+Example:
+  python src/batch-prompts.py prompts.jsonl results.jsonl --model gemma3 --concurrency 8 --temperature 0
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lib.helper_ollama import BatchRunner, OllamaHelper  # noqa: E402
+
+
+def main():
+  parser = argparse.ArgumentParser(description='Run a JSONL file of prompts through Ollama')
+  parser.add_argument('input', help='input JSONL file')
+  parser.add_argument('output', help='output JSONL file (also the resume checkpoint)')
+  parser.add_argument('--model', default='gemma3', help='default model')
+  parser.add_argument('--host', default=None, help='Ollama host')
+  parser.add_argument('--concurrency', type=int, default=4, help='maximum requests in flight')
+  parser.add_argument('--temperature', type=float, default=None)
+  parser.add_argument('--num-predict', type=int, default=None)
+  parser.add_argument('--format', default=None, help="'json' or a path to a JSON schema file")
+  parser.add_argument('--keep-alive', default=None, help="e.g. '30m'")
+  parser.add_argument('--retry-errors', action='store_true', help='re-run records that failed before')
+  args = parser.parse_args()
+
+  options = {}
+  if args.temperature is not None:
+    options['temperature'] = args.temperature
+  if args.num_predict is not None:
+    options['num_predict'] = args.num_predict
+
+  format = args.format
+  if format and format != 'json':
+    format = json.loads(Path(format).read_text())
+
+  progress = {'done': 0}
+
+  def on_result(result):
+    progress['done'] += 1
+    status = 'error: ' + result['error'] if result['error'] else f"{result.get('eval_count') or 0} tokens"
+    print(f"[{progress['done']}] {result['id']} ({result['elapsed_s']:.2f}s, {status})", file=sys.stderr)
+
+  runner = BatchRunner(
+    OllamaHelper(args.host),
+    args.model,
+    concurrency=args.concurrency,
+    options=options,
+    format=format,
+    keep_alive=args.keep_alive,
+    retry_errors=args.retry_errors,
+    on_result=on_result,
+  )
+
+  try:
+    report = runner.run(args.input, args.output)
+  except KeyboardInterrupt:
+    print('\nInterrupted - run the same command again to resume', file=sys.stderr)
+    sys.exit(130)
+
+  print(json.dumps(report.to_dict(), indent=2))
+
+
+if __name__ == '__main__':
+  main()
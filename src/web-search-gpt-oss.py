@@ -4,16 +4,23 @@
 #     "ollama",
 # ]
 # ///
+import sys
+from pathlib import Path
 from typing import Any, Dict, List
 
 from web_search_gpt_oss_helper import Browser
 
 from ollama import Client
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lib.helper_ollama import CachedWebClient  # noqa: E402
+
 
 def main() -> None:
   client = Client()
-  browser = Browser(initial_state=None, client=client)
+  # Pages and searches are reused from the shared on-disk web cache
+  browser = Browser(initial_state=None, client=CachedWebClient(client))
 
   def browser_search(query: str, topn: int = 10) -> str:
     return browser.search(query=query, topn=topn)['pageText']
@@ -21,8 +28,8 @@ def main() -> None:
   def browser_open(id: int | str | None = None, cursor: int = -1, loc: int = -1, num_lines: int = -1) -> str:
     return browser.open(id=id, cursor=cursor, loc=loc, num_lines=num_lines)['pageText']
 
-  def browser_find(pattern: str, cursor: int = -1, **_: Any) -> str:
-    return browser.find(pattern=pattern, cursor=cursor)['pageText']
+  def browser_find(pattern: str, cursor: int = -1, mode: str = 'substring', **_: Any) -> str:
+    return browser.find(pattern=pattern, cursor=cursor, mode=mode)['pageText']
 
   browser_search_schema = {
     'type': 'function',
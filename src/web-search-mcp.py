@@ -9,6 +9,9 @@
 """
 MCP stdio server exposing Ollama web_search and web_fetch as tools.
 
+Responses are cached in the shared on-disk web cache (lib.helper_ollama.WebCache),
+so repeated searches and fetches are not sent again while they are fresh.
+
 Environment:
 - OLLAMA_API_KEY (required): if set, will be used as Authorization header.
 """
@@ -16,10 +19,16 @@ Environment:
 from __future__ import annotations
 
 import asyncio
+import sys
+from pathlib import Path
 from typing import Any, Dict
 
 from ollama import Client
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lib.helper_ollama import CachedWebClient  # noqa: E402
+
 try:
   # Preferred high-level API (if available)
   from mcp.server.fastmcp import FastMCP  # type: ignore
@@ -34,7 +43,7 @@ if not _FASTMCP_AVAILABLE:
   from mcp.server.stdio import stdio_server  # type: ignore
 
 
-client = Client()
+client = CachedWebClient(Client())
 
 
 def _web_search_impl(query: str, max_results: int = 3) -> Dict[str, Any]:
@@ -1,29 +1,206 @@
 from __future__ import annotations
 
 import re
+import sys
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Protocol, Tuple
+from itertools import accumulate
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, Tuple
 from urllib.parse import urlparse
 
 from ollama import Client
 
 
-@dataclass
+class PageLines(Sequence[str]):
+  """Read-only view of wrapped lines stored as one buffer plus offsets."""
+
+  __slots__ = ('_buffer', '_offsets')
+
+  def __init__(self, buffer: str, offsets: array):
+    self._buffer = buffer
+    self._offsets = offsets
+
+  def __len__(self) -> int:
+    return len(self._offsets) - 1
+
+  def __getitem__(self, i):
+    buffer = self._buffer
+    offsets = self._offsets
+    count = len(offsets) - 1
+    if isinstance(i, slice):
+      return [buffer[offsets[j] : offsets[j + 1]] for j in range(*i.indices(count))]
+    if i < 0:
+      i += count
+    if i < 0 or i >= count:
+      raise IndexError('line index out of range')
+    return buffer[offsets[i] : offsets[i + 1]]
+
+  def __iter__(self) -> Iterator[str]:
+    buffer = self._buffer
+    offsets = self._offsets
+    for i in range(len(offsets) - 1):
+      yield buffer[offsets[i] : offsets[i + 1]]
+
+
 class Page:
-  url: str
-  title: str
-  text: str
-  lines: List[str]
-  links: Dict[int, str]
-  fetched_at: datetime
+  """A browser page.
+
+  Link extraction and line wrapping run on first access to `text`, `lines`
+  or `links`, so result pages that are never opened only hold their raw text.
+  Wrapped lines are kept as one string plus an offset array; once they are
+  built, `text` is the wrapped text. `source` tells the browser how to build
+  the page again after the page store evicted it.
+  """
+
+  __slots__ = (
+    'url',
+    'title',
+    'fetched_at',
+    'source',
+    '_raw',
+    '_process_links',
+    '_text',
+    '_buffer',
+    '_offsets',
+    '_index',
+    '_links',
+    '_nbytes',
+  )
+
+  def __init__(
+    self,
+    url: str,
+    title: str,
+    text: str = '',
+    lines: Optional[List[str]] = None,
+    links: Optional[Dict[int, str]] = None,
+    fetched_at: Optional[datetime] = None,
+    raw: Optional[str] = None,
+    process_links: bool = False,
+    source: Optional[Tuple[Any, ...]] = None,
+  ):
+    self.url = url
+    self.title = title
+    self.fetched_at = fetched_at or datetime.utcnow()
+    self.source = source
+    self._raw = raw
+    self._process_links = process_links
+    self._text: Optional[str] = text
+    self._buffer: Optional[str] = None
+    self._offsets: Optional[array] = None
+    self._index: Optional[PageIndex] = None
+    self._links = links if links is not None else {}
+    self._nbytes: Optional[int] = None
+    if lines is not None:
+      self.lines = lines
+
+  @property
+  def built(self) -> bool:
+    return self._raw is None and self._buffer is not None
+
+  def _process(self) -> None:
+    if self._raw is None:
+      return
+    if self._process_links:
+      self._text, self._links = process_markdown_links(self._raw)
+    else:
+      self._text = self._raw
+    self._raw = None
+    self._nbytes = None
+
+  @property
+  def text(self) -> str:
+    if self._text is None:
+      return '\n'.join(self.lines)
+    self._process()
+    return self._text
+
+  @text.setter
+  def text(self, value: str) -> None:
+    self._raw = None
+    self._text = value
+    self._buffer = None
+    self._offsets = None
+    self._index = None
+    self._nbytes = None
+
+  @property
+  def lines(self) -> PageLines:
+    if self._buffer is None:
+      self.lines = wrap_lines(self.text, WRAP_WIDTH)
+      # The wrapped lines replace the text
+      self._text = None
+      self._nbytes = None
+    return PageLines(self._buffer, self._offsets)
+
+  @lines.setter
+  def lines(self, value: List[str]) -> None:
+    self._buffer = ''.join(value)
+    self._offsets = line_offsets(value)
+    self._index = None
+    self._nbytes = None
+
+  @property
+  def line_offsets(self) -> array:
+    """Cumulative line lengths: `line_offsets[i]` is the length of `lines[:i]`."""
+    if self._offsets is None:
+      self.lines
+    return self._offsets
+
+  @property
+  def index(self) -> PageIndex:
+    """Lowercase search index over `lines`, built on the first `find`."""
+    if self._index is None:
+      self._index = PageIndex(self.lines, self.line_offsets)
+      self._nbytes = None
+    return self._index
+
+  @property
+  def links(self) -> Dict[int, str]:
+    self._process()
+    return self._links
+
+  @links.setter
+  def links(self, value: Dict[int, str]) -> None:
+    self._links = value
+    self._nbytes = None
+
+  @property
+  def nbytes(self) -> int:
+    """Approximate memory held by the page's text, lines, index and links."""
+    if self._nbytes is not None:
+      return self._nbytes
+    size = sys.getsizeof(self.url) + sys.getsizeof(self.title)
+    for value in (self._raw, self._text, self._buffer):
+      if value is not None:
+        size += sys.getsizeof(value)
+    if self._offsets is not None:
+      size += self._offsets.itemsize * len(self._offsets)
+    if self._index is not None:
+      size += sys.getsizeof(self._index.text) + self._index.starts.itemsize * len(self._index.starts)
+    size += sys.getsizeof(self._links) + sum(sys.getsizeof(u) for u in self._links.values())
+    self._nbytes = size
+    return size
 
 
 @dataclass
 class BrowserStateData:
-  page_stack: List[str] = field(default_factory=list)
+  page_stack: PageStack = field(default_factory=lambda: PageStack())
   view_tokens: int = 1024
-  url_to_page: Dict[str, Page] = field(default_factory=dict)
+  url_to_page: PageStore = field(default_factory=lambda: PageStore())
+
+  def __post_init__(self):
+    # Plain lists and dicts from older callers are wrapped
+    if not isinstance(self.page_stack, PageStack):
+      self.page_stack = PageStack(self.page_stack)
+    if not isinstance(self.url_to_page, PageStore):
+      store = PageStore()
+      for url, page in self.url_to_page.items():
+        store[url] = page
+      self.url_to_page = store
 
 
 @dataclass
@@ -45,6 +222,18 @@ class CrawlClient(Protocol):
 
 DEFAULT_VIEW_TOKENS = 1024
 CAPPED_TOOL_CONTENT_LEN = 8000
+WRAP_WIDTH = 80
+FIND_MAX_RESULTS = 50
+FIND_SNIPPET_LINES = 4
+FIND_MODES = ('substring', 'terms', 'regex')
+DEFAULT_PAGE_STORE_BYTES = 64 * 1024 * 1024
+DEFAULT_PAGE_STACK_SIZE = 256
+MAX_EVICTED_SOURCES = 4096
+MAX_REBUILD_DEPTH = 16
+
+_MULTILINE_LINK_PATTERN = re.compile(r'\[([^\]]+)\]\s*\n\s*\(([^)]+)\)')
+_LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+_WRAP_PATTERNS: Dict[int, re.Pattern] = {}
 
 # ---- Helpers ----------------------------------------------------------------
 
@@ -68,6 +257,340 @@ def _safe_domain(u: str) -> str:
     return u
 
 
+def _wrap_pattern(width: int) -> re.Pattern:
+  # Longest run of at most `width` characters that starts and ends a word,
+  # or a single word longer than `width`
+  pattern = _WRAP_PATTERNS.get(width)
+  if pattern is None:
+    if width < 2:
+      pattern = re.compile(r'\S+')
+    else:
+      pattern = re.compile(r'\S(?:.{0,%d}\S)?(?= |$)|\S+' % (width - 2))
+    _WRAP_PATTERNS[width] = pattern
+  return pattern
+
+
+def wrap_lines(text: str, width: int = WRAP_WIDTH) -> List[str]:
+  """Greedy word wrap in one pass over the text.
+
+  Lines that fit are kept as they are; longer lines are split on whitespace
+  (runs of whitespace become one space) into lines of at most `width`
+  characters, and words longer than `width` get a line of their own.
+  """
+  if width <= 0:
+    width = WRAP_WIDTH
+  pattern = _wrap_pattern(width)
+  wrapped: List[str] = []
+  for line in text.split('\n'):
+    if len(line) <= width:
+      wrapped.append(line)
+      continue
+    chunks = pattern.findall(' '.join(line.split()))
+    if chunks and line[-1].isspace() and len(chunks[-1]) < width:
+      chunks[-1] += ' '
+    wrapped.extend(chunks)
+  return wrapped
+
+
+def line_offsets(lines: List[str]) -> array:
+  """Cumulative character counts of `lines`, starting with 0."""
+  return array('I', accumulate(map(len, lines), initial=0))
+
+
+def _digit_count_sum(n: int) -> int:
+  # Total digits of the numbers 0 .. n - 1
+  total = n
+  power = 10
+  while power < n:
+    total += n - power
+    power *= 10
+  return total
+
+
+def _numbered_length(offsets: Sequence[int], loc: int, count: int) -> int:
+  # Length of 'L{j}: {lines[loc + j]}\n' for j in 0 .. count - 1
+  chars = offsets[loc + count] - offsets[loc]
+  return chars + 4 * count + _digit_count_sum(count)
+
+
+def _collapse_whitespace(text: str) -> str:
+  # Same result as re.sub(r'\s+', ' ', text), several times faster
+  words = text.split()
+  if not words:
+    return ' ' if text else ''
+  collapsed = ' '.join(words)
+  if text[0].isspace():
+    collapsed = ' ' + collapsed
+  if text[-1].isspace():
+    collapsed += ' '
+  return collapsed
+
+
+def process_markdown_links(text: str) -> Tuple[str, Dict[int, str]]:
+  """Replace markdown links with numbered 【id†text†domain】 references.
+
+  Returns the processed text (whitespace collapsed to single spaces) and
+  the link id -> URL mapping.
+  """
+  links: Dict[int, str] = {}
+
+  text = _MULTILINE_LINK_PATTERN.sub(r'[\1](\2)', text)
+  text = _collapse_whitespace(text)
+
+  def _repl(m: re.Match) -> str:
+    link_id = len(links)
+    link_text = m.group(1).strip()
+    link_url = m.group(2).strip()
+    links[link_id] = link_url
+    return f'【{link_id}†{link_text}†{_safe_domain(link_url)}】'
+
+  return _LINK_PATTERN.sub(_repl, text), links
+
+
+# ---- Find index ------------------------------------------------------------
+
+
+class PageIndex:
+  """Lowercase copy of a page's lines joined by newlines, with line starts.
+
+  Built once per page and reused by every `find` on it. Matches never
+  cross a line break for substring and term search, as each wrapped line
+  is searched on its own.
+  """
+
+  def __init__(self, lines: List[str], offsets: Optional[Sequence[int]] = None):
+    text = '\n'.join(lines).lower()
+    if offsets is not None and len(text) == offsets[-1] + len(lines) - 1:
+      starts = array('I', (offset + i for i, offset in enumerate(offsets)))
+    else:
+      # Lowercasing changed the length of some characters
+      lowered = [line.lower() for line in lines]
+      text = '\n'.join(lowered)
+      starts = array('I', (offset + i for i, offset in enumerate(line_offsets(lowered))))
+    self.text = text
+    self.starts = starts
+    self.num_lines = len(lines)
+
+  def line_of(self, pos: int) -> int:
+    """Line number of a character position in `text`."""
+    return bisect_right(self.starts, pos) - 1
+
+  def _line_start(self, line: int) -> int:
+    return self.starts[line] if line < self.num_lines else len(self.text)
+
+  def _term_lines(self, term: str, step: int = 1, limit: Optional[int] = None) -> List[int]:
+    # Lines containing `term`; after a hit, the next `step` lines are skipped
+    if not term:
+      return list(range(0, self.num_lines, step))[:limit]
+    hits: List[int] = []
+    if '\n' in term:
+      return hits
+    find = self.text.find
+    pos = find(term)
+    while pos != -1 and (limit is None or len(hits) < limit):
+      line = self.line_of(pos)
+      hits.append(line)
+      pos = find(term, self._line_start(line + step))
+    return hits
+
+  def search(
+    self,
+    pattern: str,
+    mode: str = 'substring',
+    max_results: int = FIND_MAX_RESULTS,
+    window: int = FIND_SNIPPET_LINES,
+  ) -> List[Tuple[int, int]]:
+    """Find the lines where snippets of `window` lines start.
+
+    Modes:
+      substring: case-insensitive match of the whole pattern
+      terms: whitespace-separated terms, snippets ranked by the number of
+        distinct terms they contain, then by total hits
+      regex: case-insensitive regular expression; ^ and $ match at line ends
+
+    Returns up to `max_results` (line, score) pairs, best first; substring
+    and regex matches score 1 and keep document order. Raises ValueError for
+    an unknown mode or an invalid regular expression.
+    """
+    if mode == 'substring':
+      return [(line, 1) for line in self._term_lines(pattern.lower(), window, max_results)]
+    if mode == 'regex':
+      return self._search_regex(pattern, max_results, window)
+    if mode == 'terms':
+      return self._search_terms(pattern, max_results, window)
+    raise ValueError(f'Unknown find mode {mode!r}, expected one of {", ".join(FIND_MODES)}')
+
+  def _search_regex(self, pattern: str, max_results: int, window: int) -> List[Tuple[int, int]]:
+    try:
+      regex = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    except re.error as e:
+      raise ValueError(f'Invalid regular expression {pattern!r}: {e}') from None
+    results: List[Tuple[int, int]] = []
+    pos = 0
+    while len(results) < max_results and pos <= len(self.text):
+      m = regex.search(self.text, pos)
+      if m is None:
+        break
+      line = self.line_of(m.start())
+      results.append((line, 1))
+      pos = max(self._line_start(line + window), m.end() + (m.end() == m.start()))
+    return results
+
+  def _search_terms(self, pattern: str, max_results: int, window: int) -> List[Tuple[int, int]]:
+    terms = list(dict.fromkeys(pattern.lower().split()))
+    hits_by_term = [self._term_lines(term) for term in terms]
+
+    # Score each snippet that starts on a line with a hit
+    candidates = sorted({line for hits in hits_by_term for line in hits})
+    scored: List[Tuple[int, int, int]] = []
+    for line in candidates:
+      end = line + window
+      distinct = 0
+      total = 0
+      for hits in hits_by_term:
+        count = bisect_right(hits, end - 1) - bisect_right(hits, line - 1)
+        if count:
+          distinct += 1
+          total += count
+      scored.append((distinct, total, line))
+    scored.sort(key=lambda item: (-item[0], -item[1], item[2]))
+
+    results: List[Tuple[int, int]] = []
+    taken: List[int] = []
+    for distinct, _, line in scored:
+      i = bisect_right(taken, line)
+      if (i and line - taken[i - 1] < window) or (i < len(taken) and taken[i] - line < window):
+        continue
+      taken.insert(i, line)
+      results.append((line, distinct))
+      if len(results) >= max_results:
+        break
+    return results
+
+
+# ---- Page store ------------------------------------------------------------
+
+
+class PageStore:
+  """URL -> Page mapping that evicts least recently used pages over a byte budget.
+
+  The `source` of an evicted page is kept (up to MAX_EVICTED_SOURCES of
+  them) so the browser can build it again when it is needed.
+  """
+
+  def __init__(self, max_bytes: Optional[int] = None):
+    self.max_bytes = DEFAULT_PAGE_STORE_BYTES if max_bytes is None else max_bytes
+    self.total_bytes = 0
+    self.evictions = 0
+    self._pages: OrderedDict[str, Page] = OrderedDict()
+    self._sizes: Dict[str, int] = {}
+    self._evicted: OrderedDict[str, Tuple[Any, ...]] = OrderedDict()
+
+  def __contains__(self, url: object) -> bool:
+    return url in self._pages
+
+  def __len__(self) -> int:
+    return len(self._pages)
+
+  def __iter__(self) -> Iterator[str]:
+    return iter(self._pages)
+
+  def __getitem__(self, url: str) -> Page:
+    page = self.get(url)
+    if page is None:
+      raise KeyError(url)
+    return page
+
+  def __setitem__(self, url: str, page: Page) -> None:
+    self.put(url, page)
+
+  def keys(self):
+    return self._pages.keys()
+
+  def items(self):
+    return self._pages.items()
+
+  def get(self, url: str, default: Optional[Page] = None) -> Optional[Page]:
+    page = self._pages.get(url)
+    if page is None:
+      return default
+    self._pages.move_to_end(url)
+    return page
+
+  def put(self, url: str, page: Page) -> None:
+    self._pages[url] = page
+    self._pages.move_to_end(url)
+    self._evicted.pop(url, None)
+    self.update(url)
+
+  def update(self, url: str) -> None:
+    """Recount the size of a page after it was built or indexed, evicting if needed."""
+    page = self._pages.get(url)
+    if page is None:
+      return
+    size = page.nbytes
+    self.total_bytes += size - self._sizes.get(url, 0)
+    self._sizes[url] = size
+    self._evict()
+
+  def evicted_source(self, url: str) -> Optional[Tuple[Any, ...]]:
+    """Source of an evicted page, or None if the page was never evicted."""
+    return self._evicted.get(url)
+
+  def _evict(self) -> None:
+    # The most recently used page always stays
+    while self.total_bytes > self.max_bytes and len(self._pages) > 1:
+      url, page = self._pages.popitem(last=False)
+      self.total_bytes -= self._sizes.pop(url)
+      self.evictions += 1
+      if page.source is not None:
+        self._evicted[url] = page.source
+        if len(self._evicted) > MAX_EVICTED_SOURCES:
+          self._evicted.popitem(last=False)
+
+
+class PageStack:
+  """Cursor -> URL history that keeps the last `max_entries` URLs.
+
+  Cursors keep counting from the first page of the session; looking up a
+  cursor older than the kept entries raises IndexError (see `oldest`).
+  """
+
+  __slots__ = ('_urls', '_base')
+
+  def __init__(self, urls: Iterable[str] = (), max_entries: Optional[int] = None):
+    self._urls: deque = deque(maxlen=max_entries or DEFAULT_PAGE_STACK_SIZE)
+    self._base = 0
+    for url in urls:
+      self.append(url)
+
+  def append(self, url: str) -> None:
+    if len(self._urls) == self._urls.maxlen:
+      self._base += 1
+    self._urls.append(url)
+
+  def __len__(self) -> int:
+    return self._base + len(self._urls)
+
+  def __bool__(self) -> bool:
+    return bool(self._urls)
+
+  def __iter__(self) -> Iterator[str]:
+    return iter(self._urls)
+
+  @property
+  def oldest(self) -> int:
+    """First cursor that still resolves to a URL."""
+    return self._base
+
+  def __getitem__(self, cursor: int) -> str:
+    if cursor < 0:
+      cursor += len(self)
+    if not self._urls or cursor < self._base or cursor >= len(self):
+      raise IndexError('page cursor out of range')
+    return self._urls[cursor - self._base]
+
+
 # ---- BrowserState ------------------------------------------------------------
 
 
@@ -112,72 +635,81 @@ class Browser:
     data = self.state.get_data()
     page = data.url_to_page.get(url)
     if not page:
-      raise ValueError(f'Page not found for url {url}')
+      source = data.url_to_page.evicted_source(url)
+      if source is None:
+        raise ValueError(f'Page not found for url {url}')
+      page = self._rebuild_page(source)
+      data.url_to_page[page.url] = page
+    return page
+
+  def _rebuild_page(self, source: Tuple[Any, ...], depth: int = 0) -> Page:
+    # Build a page the page store evicted again from its source
+    if depth > MAX_REBUILD_DEPTH:
+      raise ValueError('Page source nested too deeply to rebuild')
+    kind = source[0]
+    if kind == 'search':
+      _, query, topn = source
+      return self._search_page(query, topn)
+    if kind == 'find':
+      _, pattern, url, parent_source, mode = source
+      return self._build_find_results_page(pattern, self._parent_page(url, parent_source, depth), mode)
+    if kind == 'invalid_link':
+      _, link_id, url, parent_source = source
+      return self._build_invalid_link_page(link_id, self._parent_page(url, parent_source, depth))
+    if kind == 'expired_cursor':
+      _, cursor, oldest = source
+      return self._build_expired_cursor_page(cursor, oldest)
+    return self._fetch_page(source[1])
+
+  def _parent_page(self, url: str, source: Tuple[Any, ...], depth: int) -> Page:
+    # The page a find or invalid-link page was built from: the stored page if
+    # it is still that page, otherwise rebuilt from its own source. Derived
+    # pages reuse URLs (find_results_{pattern}), so the URL alone is not enough.
+    page = self.state.get_data().url_to_page.get(url)
+    if page is None or page.source != source:
+      page = self._rebuild_page(source, depth + 1)
     return page
 
+  def _account(self, page: Page) -> None:
+    # Pages grow when they are built or indexed
+    self.state.get_data().url_to_page.update(page.url)
+
   def _join_lines_with_numbers(self, lines: List[str]) -> str:
     result = []
     for i, line in enumerate(lines):
       result.append(f'L{i}: {line}')
     return '\n'.join(result)
 
-  def _wrap_lines(self, text: str, width: int = 80) -> List[str]:
-    if width <= 0:
-      width = 80
-    src_lines = text.split('\n')
-    wrapped: List[str] = []
-    for line in src_lines:
-      if line == '':
-        wrapped.append('')
-      elif len(line) <= width:
-        wrapped.append(line)
-      else:
-        words = re.split(r'\s+', line)
-        if not words:
-          wrapped.append(line)
-          continue
-        curr = ''
-        for w in words:
-          test = (curr + ' ' + w) if curr else w
-          if len(test) > width and curr:
-            wrapped.append(curr)
-            curr = w
-          else:
-            curr = test
-        if curr:
-          wrapped.append(curr)
-    return wrapped
+  def _wrap_lines(self, text: str, width: int = WRAP_WIDTH) -> List[str]:
+    return wrap_lines(text, width)
 
   def _process_markdown_links(self, text: str) -> Tuple[str, Dict[int, str]]:
-    links: Dict[int, str] = {}
-    link_id = 0
-
-    multiline_pattern = re.compile(r'\[([^\]]+)\]\s*\n\s*\(([^)]+)\)')
-    text = multiline_pattern.sub(lambda m: f'[{m.group(1)}]({m.group(2)})', text)
-    text = re.sub(r'\s+', ' ', text)
-
-    link_pattern = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+    return process_markdown_links(text)
 
-    def _repl(m: re.Match) -> str:
-      nonlocal link_id
-      link_text = m.group(1).strip()
-      link_url = m.group(2).strip()
-      domain = _safe_domain(link_url)
-      formatted = f'【{link_id}†{link_text}†{domain}】'
-      links[link_id] = link_url
-      link_id += 1
-      return formatted
-
-    processed = link_pattern.sub(_repl, text)
-    return processed, links
-
-  def _get_end_loc(self, loc: int, num_lines: int, total_lines: int, lines: List[str]) -> int:
+  def _get_end_loc(
+    self,
+    loc: int,
+    num_lines: int,
+    total_lines: int,
+    lines: List[str],
+    offsets: Optional[Sequence[int]] = None,
+  ) -> int:
     if num_lines <= 0:
-      txt = self._join_lines_with_numbers(lines[loc:])
+      # Number of lines whose numbered text starts within the view budget,
+      # found by binary search over the cumulative line lengths
+      if offsets is None:
+        offsets = line_offsets(lines)
       data = self.state.get_data()
       chars_per_token = 4
-      max_chars = min(data.view_tokens * chars_per_token, len(txt))
-      num_lines = txt[:max_chars].count('\n') + 1
+      max_chars = data.view_tokens * chars_per_token
+      lo, hi = 0, total_lines - loc - 1
+      while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if _numbered_length(offsets, loc, mid) <= max_chars:
+          lo = mid
+        else:
+          hi = mid - 1
+      num_lines = lo + 1
     return min(loc + num_lines, total_lines)
 
   def _display_page(self, page: Page, cursor: int, loc: int, num_lines: int) -> str:
@@ -191,29 +723,24 @@ class Browser:
     elif loc >= total_lines:
       loc = max(0, total_lines - 1)
 
-    end_loc = self._get_end_loc(loc, num_lines, total_lines, page.lines)
+    end_loc = self._get_end_loc(loc, num_lines, total_lines, page.lines, page.line_offsets)
 
     header = f'[{cursor}] {page.title}'
     header += f'({page.url})\n' if page.url else '\n'
     header += f'**viewing lines [{loc} - {end_loc - 1}] of {total_lines - 1}**\n\n'
 
+    lines = page.lines
     body_lines = []
     for i in range(loc, end_loc):
-      body_lines.append(f'L{i}: {page.lines[i]}')
+      body_lines.append(f'L{i}: {lines[i]}')
 
+    self._account(page)
     return header + '\n'.join(body_lines)
 
   # ---- page builders ----
 
   def _build_search_results_page_collection(self, query: str, results: Dict[str, Any]) -> Page:
-    page = Page(
-      url=f'search_results_{query}',
-      title=query,
-      text='',
-      lines=[],
-      links={},
-      fetched_at=datetime.utcnow(),
-    )
+    page = Page(url=f'search_results_{query}', title=query)
 
     tb = []
     tb.append('')
@@ -236,114 +763,143 @@ class Browser:
         link_idx += 1
 
     page.text = '\n'.join(tb)
-    page.lines = self._wrap_lines(page.text, 80)
     return page
 
   def _build_search_result_page(self, result: WebSearchResult, link_idx: int) -> Page:
-    page = Page(
-      url=result.url,
-      title=result.title,
-      text='',
-      lines=[],
-      links={},
-      fetched_at=datetime.utcnow(),
-    )
-
-    link_fmt = f'【{link_idx}†{result.title}】\n'
-    preview = link_fmt + f'URL: {result.url}\n'
     full_text = result.content.get('fullText', '') if result.content else ''
-    preview += full_text[:300] + '\n\n'
-
-    if not full_text:
-      page.links[link_idx] = result.url
 
     if full_text:
-      raw = f'URL: {result.url}\n{full_text}'
-      processed, links = self._process_markdown_links(raw)
-      page.text = processed
-      page.links = links
-    else:
-      page.text = preview
+      # Links and wrapping are processed when the page is first opened
+      return Page(
+        url=result.url,
+        title=result.title,
+        raw=f'URL: {result.url}\n{full_text}',
+        process_links=True,
+        source=('fetch', result.url),
+      )
 
-    page.lines = self._wrap_lines(page.text, 80)
-    return page
+    link_fmt = f'【{link_idx}†{result.title}】\n'
+    preview = link_fmt + f'URL: {result.url}\n'
+    preview += full_text[:300] + '\n\n'
+    return Page(
+      url=result.url,
+      title=result.title,
+      text=preview,
+      links={link_idx: result.url},
+      source=('fetch', result.url),
+    )
 
   def _build_page_from_fetch(self, requested_url: str, fetch_response: Dict[str, Any]) -> Page:
-    page = Page(
-      url=requested_url,
-      title=requested_url,
-      text='',
-      lines=[],
-      links={},
-      fetched_at=datetime.utcnow(),
-    )
+    url = requested_url
+    title = requested_url
+    text = ''
 
-    for url, url_results in fetch_response.get('results', {}).items():
+    for result_url, url_results in fetch_response.get('results', {}).items():
       if url_results:
         r0 = url_results[0]
         if r0.get('content'):
-          page.text = r0['content']
+          text = r0['content']
         if r0.get('title'):
-          page.title = r0['title']
-        page.url = url
+          title = r0['title']
+        url = result_url
         break
 
-    if not page.text:
-      page.text = 'No content could be extracted from this page.'
+    if not text:
+      text = 'No content could be extracted from this page.'
     else:
-      page.text = f'URL: {page.url}\n{page.text}'
+      text = f'URL: {url}\n{text}'
 
-    processed, links = self._process_markdown_links(page.text)
-    page.text = processed
-    page.links = links
-    page.lines = self._wrap_lines(page.text, 80)
-    return page
+    return Page(url=url, title=title, raw=text, process_links=True, source=('fetch', requested_url))
 
-  def _build_find_results_page(self, pattern: str, page: Page) -> Page:
+  def _build_find_results_page(self, pattern: str, page: Page, mode: str = 'substring') -> Page:
     find_page = Page(
       url=f'find_results_{pattern}',
       title=f'Find results for text: `{pattern}` in `{page.title}`',
-      text='',
-      lines=[],
-      links={},
-      fetched_at=datetime.utcnow(),
+      source=('find', pattern, page.url, page.source, mode) if page.source is not None else None,
     )
 
-    max_results = 50
-    num_show_lines = 4
-    pattern_lower = pattern.lower()
+    matches = page.index.search(pattern, mode, FIND_MAX_RESULTS, FIND_SNIPPET_LINES)
+    self._account(page)
 
+    lines = page.lines
     result_chunks: List[str] = []
-    line_idx = 0
-    while line_idx < len(page.lines):
-      line = page.lines[line_idx]
-      if pattern_lower not in line.lower():
-        line_idx += 1
-        continue
-
-      end_line = min(line_idx + num_show_lines, len(page.lines))
-      snippet = '\n'.join(page.lines[line_idx:end_line])
-      link_fmt = f'【{len(result_chunks)}†match at L{line_idx}】'
+    for line_idx, score in matches:
+      end_line = min(line_idx + FIND_SNIPPET_LINES, len(lines))
+      snippet = '\n'.join(lines[line_idx:end_line])
+      label = f'match at L{line_idx}'
+      if mode == 'terms':
+        label += f', {score} of {len(set(pattern.lower().split()))} terms'
+      link_fmt = f'【{len(result_chunks)}†{label}】'
       result_chunks.append(f'{link_fmt}\n{snippet}')
 
-      if len(result_chunks) >= max_results:
-        break
-      line_idx += num_show_lines
-
     if not result_chunks:
       find_page.text = f'No `find` results for pattern: `{pattern}`'
     else:
       find_page.text = '\n\n'.join(result_chunks)
 
-    find_page.lines = self._wrap_lines(find_page.text, 80)
     return find_page
 
-  # ---- public API: search / open / find ------------------------------------
+  def _build_invalid_link_page(self, link_id: int, page: Page) -> Page:
+    err = Page(
+      url=f'invalid_link_{link_id}',
+      title=f'No link with id {link_id} on `{page.title}`',
+      source=('invalid_link', link_id, page.url, page.source) if page.source is not None else None,
+    )
+    available = sorted(page.links.keys())
+    available_list = ', '.join(map(str, available)) if available else '(none)'
+    err.text = '\n'.join(
+      [
+        f'Requested link id: {link_id}',
+        f'Current page: {page.title}',
+        f'Available link ids on this page: {available_list}',
+        '',
+        'Tips:',
+        '- To scroll this page, call browser_open with { loc, num_lines } (no id).',
+        '- To open a result from a search results page, pass the correct { cursor, id }.',
+      ]
+    )
+    return err
 
-  def search(self, *, query: str, topn: int = 5) -> Dict[str, Any]:
-    if not self._client:
-      raise RuntimeError('Client not provided')
+  def _build_expired_cursor_page(self, cursor: int, oldest: int) -> Page:
+    err = Page(
+      url=f'expired_cursor_{cursor}',
+      title=f'Cursor {cursor} is no longer available',
+      source=('expired_cursor', cursor, oldest),
+    )
+    err.text = '\n'.join(
+      [
+        f'Requested cursor: {cursor}',
+        f'Only recent pages are kept; the oldest available cursor is {oldest}.',
+        '',
+        'Tips:',
+        '- To see that page again, search again or call browser_open with its URL as id.',
+      ]
+    )
+    return err
 
+  def _open_error_page(self, err: Page) -> Dict[str, Any]:
+    self._save_page(err)
+    cursor = len(self.get_state().page_stack) - 1
+    page_text = self._display_page(err, cursor, 0, -1)
+    return {'state': self.get_state(), 'pageText': cap_tool_content(page_text)}
+
+  def _fetch_page(self, url: str) -> Page:
+    fetch_response = self._client.web_fetch(url)
+    normalized: Dict[str, Any] = {
+      'results': {
+        url: [
+          {
+            'title': fetch_response.title or url,
+            'url': url,
+            'content': fetch_response.content or '',
+          }
+        ]
+      }
+    }
+    return self._build_page_from_fetch(url, normalized)
+
+  def _search_page(self, query: str, topn: int) -> Page:
+    # Runs the search, stores the result pages and returns the results page
     resp = self._client.web_search(query, max_results=topn)
 
     normalized: Dict[str, Any] = {'results': {}}
@@ -360,9 +916,9 @@ class Browser:
     normalized['results'][query] = rows
 
     search_page = self._build_search_results_page_collection(query, normalized)
-    self._save_page(search_page)
-    cursor = len(self.get_state().page_stack) - 1
+    search_page.source = ('search', query, topn)
 
+    data = self.get_state()
     for query_results in normalized.get('results', {}).values():
       for i, r in enumerate(query_results):
         ws = WebSearchResult(
@@ -371,9 +927,19 @@ class Browser:
           content={'fullText': r.get('content', '') or ''},
         )
         result_page = self._build_search_result_page(ws, i + 1)
-        data = self.get_state()
         data.url_to_page[result_page.url] = result_page
-        self.state.set_data(data)
+    self.state.set_data(data)
+    return search_page
+
+  # ---- public API: search / open / find ------------------------------------
+
+  def search(self, *, query: str, topn: int = 5) -> Dict[str, Any]:
+    if not self._client:
+      raise RuntimeError('Client not provided')
+
+    search_page = self._search_page(query, topn)
+    self._save_page(search_page)
+    cursor = len(self.get_state().page_stack) - 1
 
     page_text = self._display_page(search_page, cursor, loc=0, num_lines=-1)
     return {'state': self.get_state(), 'pageText': cap_tool_content(page_text)}
@@ -393,25 +959,15 @@ class Browser:
 
     if isinstance(id, str):
       url = id
-      if url in state.url_to_page:
-        self._save_page(state.url_to_page[url])
+      page = state.url_to_page.get(url)
+      if page:
+        self._save_page(page)
         cursor = len(self.get_state().page_stack) - 1
-        page_text = self._display_page(state.url_to_page[url], cursor, loc, num_lines)
+        page_text = self._display_page(page, cursor, loc, num_lines)
         return {'state': self.get_state(), 'pageText': cap_tool_content(page_text)}
 
-      fetch_response = self._client.web_fetch(url)
-      normalized: Dict[str, Any] = {
-        'results': {
-          url: [
-            {
-              'title': fetch_response.title or url,
-              'url': url,
-              'content': fetch_response.content or '',
-            }
-          ]
-        }
-      }
-      new_page = self._build_page_from_fetch(url, normalized)
+      # Not opened before, or evicted from the page store
+      new_page = self._fetch_page(url)
       self._save_page(new_page)
       cursor = len(self.get_state().page_stack) - 1
       page_text = self._display_page(new_page, cursor, loc, num_lines)
@@ -423,6 +979,8 @@ class Browser:
       if state.page_stack:
         if cursor >= len(state.page_stack):
           cursor = max(0, len(state.page_stack) - 1)
+        if cursor < state.page_stack.oldest:
+          return self._open_error_page(self._build_expired_cursor_page(cursor, state.page_stack.oldest))
         page = self._page_from_stack(state.page_stack[cursor])
       else:
         page = None
@@ -436,28 +994,7 @@ class Browser:
 
       link_url = page.links.get(id)
       if not link_url:
-        err = Page(
-          url=f'invalid_link_{id}',
-          title=f'No link with id {id} on `{page.title}`',
-          text='',
-          lines=[],
-          links={},
-          fetched_at=datetime.utcnow(),
-        )
-        available = sorted(page.links.keys())
-        available_list = ', '.join(map(str, available)) if available else '(none)'
-        err.text = '\n'.join(
-          [
-            f'Requested link id: {id}',
-            f'Current page: {page.title}',
-            f'Available link ids on this page: {available_list}',
-            '',
-            'Tips:',
-            '- To scroll this page, call browser_open with { loc, num_lines } (no id).',
-            '- To open a result from a search results page, pass the correct { cursor, id }.',
-          ]
-        )
-        err.lines = self._wrap_lines(err.text, 80)
+        err = self._build_invalid_link_page(id, page)
         self._save_page(err)
         cursor = len(self.get_state().page_stack) - 1
         page_text = self._display_page(err, cursor, 0, -1)
@@ -465,19 +1002,7 @@ class Browser:
 
       new_page = state.url_to_page.get(link_url)
       if not new_page:
-        fetch_response = self._client.web_fetch(link_url)
-        normalized: Dict[str, Any] = {
-          'results': {
-            link_url: [
-              {
-                'title': fetch_response.title or link_url,
-                'url': link_url,
-                'content': fetch_response.content or '',
-              }
-            ]
-          }
-        }
-        new_page = self._build_page_from_fetch(link_url, normalized)
+        new_page = self._fetch_page(link_url)
 
       self._save_page(new_page)
       cursor = len(self.get_state().page_stack) - 1
@@ -494,7 +1019,7 @@ class Browser:
     page_text = self._display_page(page, cursor, loc, num_lines)
     return {'state': self.get_state(), 'pageText': cap_tool_content(page_text)}
 
-  def find(self, *, pattern: str, cursor: int = -1) -> Dict[str, Any]:
+  def find(self, *, pattern: str, cursor: int = -1, mode: str = 'substring') -> Dict[str, Any]:
     state = self.get_state()
     if cursor == -1:
       if not state.page_stack:
@@ -504,9 +1029,11 @@ class Browser:
     else:
       if cursor < 0 or cursor >= len(state.page_stack):
         cursor = max(0, min(cursor, len(state.page_stack) - 1))
+      if cursor < state.page_stack.oldest:
+        return self._open_error_page(self._build_expired_cursor_page(cursor, state.page_stack.oldest))
       page = self._page_from_stack(state.page_stack[cursor])
 
-    find_page = self._build_find_results_page(pattern, page)
+    find_page = self._build_find_results_page(pattern, page, mode)
     self._save_page(find_page)
     new_cursor = len(self.get_state().page_stack) - 1
 
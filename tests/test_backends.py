@@ -0,0 +1,108 @@
+"""BackendPool: routing and failover against local stub servers"""
+
+import asyncio
+import sys
+import time
+
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench.stub_server import StubOllamaServer, StubConfig  # noqa: E402
+from lib.helper_ollama.backends import BackendPool  # noqa: E402
+
+
+# Nothing listens on the discard port, so connections are refused
+DEAD_HOST = 'http://127.0.0.1:9'
+MESSAGES = [{'role': 'user', 'content': 'hi'}]
+
+
+@pytest.fixture
+def stubs():
+    servers = [StubOllamaServer(StubConfig(tokens=4)) for _ in range(2)]
+    for server in servers:
+        server.start()
+    yield servers
+    for server in servers:
+        server.stop()
+
+
+def _chats(stub):
+    return stub.requests.get('/api/chat', 0)
+
+
+def _chat(model):
+    return lambda client: client.chat(model=model, messages=MESSAGES)
+
+
+def test_routes_to_the_least_loaded_backend(stubs):
+    pool = BackendPool([stub.host for stub in stubs])
+    stream = pool.call('model-0', lambda client: client.chat(model='model-0', messages=MESSAGES, stream=True),
+                       stream=True)
+    next(stream)
+    busy = next(b for b in pool.backends if b.in_flight)
+
+    pool.call('model-0', _chat('model-0'))
+
+    idle = next(stub for stub in stubs if stub.host != busy.host)
+    assert _chats(idle) == 1
+    list(stream)
+    assert all(b.in_flight == 0 for b in pool.backends)
+
+
+def test_prefers_the_backend_with_the_model_resident(stubs):
+    stubs[0].config.running = 1
+    stubs[1].config.running = 3
+    pool = BackendPool([stub.host for stub in stubs])
+
+    for _ in range(3):
+        pool.call('model-2', _chat('model-2'))
+
+    assert (_chats(stubs[0]), _chats(stubs[1])) == (0, 3)
+
+
+def test_fails_over_from_an_unreachable_host(stubs):
+    pool = BackendPool([DEAD_HOST, stubs[0].host], resident_ttl=1e9)
+    dead = pool.backends[0]
+    # Looks like the best choice until the request fails
+    dead.resident, dead.resident_at = {'model-0:latest'}, time.monotonic()
+    pool.backends[1].resident_at = time.monotonic()
+
+    response = pool.call('model-0', _chat('model-0'))
+
+    assert response.message.content
+    assert not dead.healthy and dead.failures == 1
+    assert pool.candidates('model-0')[0].host == stubs[0].host
+
+
+def test_async_stream_fails_over_before_the_first_chunk(stubs):
+    pool = BackendPool([DEAD_HOST, stubs[0].host], resident_ttl=1e9)
+    dead = pool.backends[0]
+    dead.resident, dead.resident_at = {'model-0:latest'}, time.monotonic()
+    pool.backends[1].resident_at = time.monotonic()
+
+    async def main():
+        stream = await pool.acall(
+            'model-0', lambda client: client.chat(model='model-0', messages=MESSAGES, stream=True), stream=True
+        )
+        return [chunk async for chunk in stream]
+
+    chunks = asyncio.run(main())
+
+    assert chunks[-1].done
+    assert not dead.healthy
+    assert all(b.in_flight == 0 for b in pool.backends)
+
+
+def test_resident_refresh_runs_concurrently(stubs):
+    for stub in stubs:
+        stub.config.latency_s = 0.3
+    pool = BackendPool([stub.host for stub in stubs])
+
+    started = time.perf_counter()
+    pool.candidates('model-0')
+
+    assert time.perf_counter() - started < 0.5
+    assert all(stub.requests.get('/api/ps') == 1 for stub in stubs)
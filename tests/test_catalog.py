@@ -0,0 +1,56 @@
+"""Model catalog: sharing per host and TTL"""
+
+import sys
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lib.helper_ollama.catalog import get_catalog, invalidate_host  # noqa: E402
+
+
+def _loader(calls):
+    def load():
+        calls.append(1)
+        return [{'name': 'llama3:latest', 'name_short': 'llama3'}]
+    return load
+
+
+def test_each_ttl_gets_its_own_catalog():
+    host = 'http://catalog-ttl:11434'
+    short = get_catalog(host, _loader([]), ttl=1.0)
+    long = get_catalog(host, _loader([]), ttl=60.0)
+
+    assert short is not long
+    assert (short.ttl, long.ttl) == (1.0, 60.0)
+    assert get_catalog(host, _loader([]), ttl=60.0) is long
+
+
+def test_invalidate_host_reaches_every_ttl():
+    host = 'http://catalog-invalidate:11434'
+    calls = []
+    catalogs = [get_catalog(host, _loader(calls), ttl=ttl) for ttl in (5.0, 50.0)]
+    for catalog in catalogs:
+        catalog.names()
+    assert len(calls) == 2
+
+    invalidate_host(host)
+    for catalog in catalogs:
+        catalog.names()
+    assert len(calls) == 4
+
+
+def test_lookups_survive_a_concurrent_invalidate():
+    catalog = get_catalog('http://catalog-race:11434', _loader([]), ttl=60.0)
+    ensure_loaded = catalog._ensure_loaded
+
+    def invalidated_after_load():
+        # Another session pulls a model right after this lookup released the lock
+        snapshot = ensure_loaded()
+        catalog.invalidate()
+        return snapshot
+
+    catalog._ensure_loaded = invalidated_after_load
+
+    assert catalog.names() == ['llama3:latest']
+    assert catalog.get('llama3') is not None
@@ -0,0 +1,102 @@
+"""ContextManager: truncation, summaries and the low-water mark"""
+
+import sys
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench.stub_server import StubOllamaServer, StubConfig  # noqa: E402
+from lib.helper_ollama import OllamaHelper  # noqa: E402
+from lib.helper_ollama.context import ContextManager, SUMMARY_PREFIX  # noqa: E402
+
+
+SYSTEM = {'role': 'system', 'content': 'You are terse.'}
+
+
+def _conversation(turns):
+    messages = [SYSTEM]
+    for i in range(turns):
+        messages.append({'role': 'user', 'content': f'question {i} ' + 'x' * 40})
+        messages.append({'role': 'assistant', 'content': f'answer {i} ' + 'y' * 40})
+    return messages
+
+
+class FakeHelper:
+    """Records summary requests and answers them with a fixed summary"""
+
+    def __init__(self):
+        self.calls = []
+
+    def chat(self, model, messages, **kwargs):
+        self.calls.append((messages, kwargs))
+        return {'message': {'content': 'They asked questions.'}}
+
+
+def test_fits_unchanged_conversations_as_is():
+    manager = ContextManager(budget=10_000)
+    messages = _conversation(3)
+
+    assert manager.fit(messages) is messages
+
+
+def test_truncate_keeps_system_and_newest_turns():
+    manager = ContextManager(budget=100)
+    messages = _conversation(10)
+
+    fitted = manager.fit(messages)
+
+    assert fitted[0] == SYSTEM
+    assert fitted[-1] == messages[-1]
+    assert fitted[1]['role'] == 'user'
+    assert manager.count(fitted) <= 100
+    assert manager.dropped_messages == len(messages) - len(fitted)
+
+
+def test_window_only_moves_when_the_budget_overflows():
+    manager = ContextManager(budget=120, low_water=0.5)
+    messages = _conversation(10)
+    first = manager.fit(messages)
+    assert manager.window_moves == 1
+
+    # The next turn still fits after the low-water cut: same prefix, no move
+    messages.append({'role': 'user', 'content': 'one more'})
+    second = manager.fit(messages)
+    assert manager.window_moves == 1
+    assert second[:len(first)] == first
+
+    # Keep adding until the budget overflows and the window jumps
+    while manager.window_moves == 1:
+        messages.append({'role': 'assistant', 'content': 'z' * 40})
+        manager.fit(messages)
+    assert manager.count(manager.fit(messages)) <= 120
+
+
+def test_summarize_folds_dropped_turns_into_a_pinned_summary():
+    helper = FakeHelper()
+    manager = ContextManager(budget=120, strategy='summarize', helper=helper, summary_model='small')
+    messages = _conversation(10)
+
+    fitted = manager.fit(messages)
+
+    assert fitted[0] == SYSTEM
+    assert fitted[1] == {'role': 'system', 'content': SUMMARY_PREFIX + 'They asked questions.'}
+    assert manager.count(fitted) <= 120
+    assert len(helper.calls) == 1
+    assert helper.calls[0][1]['context_window'] is False
+
+    # The same dropped turns reuse the summary
+    manager.fit(messages)
+    assert len(helper.calls) == 1
+
+
+def test_summary_request_bypasses_the_helpers_own_window():
+    with StubOllamaServer(StubConfig(tokens=4)) as stub:
+        helper = OllamaHelper(host=stub.host)
+        manager = ContextManager(budget=120, strategy='summarize', helper=helper, summary_model='model-0')
+        helper.context_window = manager
+
+        helper.chat('model-0', _conversation(20))
+
+    # One cut for the conversation; the long summary transcript was not refit
+    assert (manager.window_moves, manager.summaries) == (1, 1)
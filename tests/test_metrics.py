@@ -0,0 +1,35 @@
+"""Metrics registry: Prometheus rendering"""
+
+import sys
+
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lib.helper_ollama.metrics import MetricsRegistry  # noqa: E402
+
+
+def _samples(text):
+    return dict(line.rsplit(' ', 1) for line in text.splitlines() if line and not line.startswith('#'))
+
+
+def test_large_counter_keeps_full_precision():
+    metrics = MetricsRegistry()
+    for _ in range(3):
+        metrics.observe('chat', 'llama3', 0.25, response=SimpleNamespace(eval_count=1_234_567))
+
+    samples = _samples(metrics.render_prometheus())
+
+    assert samples['ollama_helper_eval_tokens_total{endpoint="chat",model="llama3"}'] == '3703701'
+    assert samples['ollama_helper_requests_total{endpoint="chat",model="llama3"}'] == '3'
+
+
+def test_float_values_round_trip():
+    metrics = MetricsRegistry()
+    metrics.observe('chat', 'llama3', 1234567.125)
+
+    samples = _samples(metrics.render_prometheus())
+
+    assert float(samples['ollama_helper_request_seconds_sum{endpoint="chat",model="llama3"}']) == 1234567.125
+    assert samples['ollama_helper_request_seconds_bucket{endpoint="chat",model="llama3",le="+Inf"}'] == '1'
@@ -0,0 +1,57 @@
+"""SingleFlight: coalescing of concurrent async calls"""
+
+import asyncio
+import sys
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lib.helper_ollama.singleflight import SingleFlight  # noqa: E402
+
+
+def test_cancelled_leader_hands_over_to_a_waiter():
+    flight = SingleFlight()
+    sent = []
+
+    async def request(name, delay):
+        sent.append(name)
+        await asyncio.sleep(delay)
+        return name
+
+    async def main():
+        leader = asyncio.create_task(flight.ado('k', lambda: request('leader', 10)))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flight.ado('k', lambda i=i: request(f'follower-{i}', 0.01)))
+                     for i in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        assert leader.cancelled()
+        return results
+
+    results = asyncio.run(main())
+
+    # One waiter took over and the others received its result
+    assert len(set(results)) == 1 and results[0].startswith('follower-')
+    assert sent == ['leader', results[0]]
+    stats = flight.stats()
+    assert (stats['calls'], stats['executed'], stats['collapsed'], stats['in_flight']) == (4, 2, 2, 0)
+
+
+def test_waiters_receive_the_leader_error():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError('boom')
+
+    async def main():
+        leader = asyncio.create_task(flight.ado('k', failing))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.ado('k', failing))
+        return await asyncio.gather(leader, follower, return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(e, ValueError) for e in results)
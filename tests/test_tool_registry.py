@@ -0,0 +1,106 @@
+"""Tool registry: schema cache and argument validation"""
+
+import re
+import sys
+
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lib.helper_ollama import tool_registry  # noqa: E402
+from lib.helper_ollama.tool_registry import (  # noqa: E402
+    ToolArgumentError, ToolRegistry, compile_tool, validate_arguments,
+)
+
+
+SOURCE = '''
+def get_weather(city: str, days: int = 1, metric: bool = True) -> str:
+    """
+    Get the weather forecast
+
+    Args:
+        city: City name
+        days: Number of days
+        metric: Use metric units
+    """
+    return f'{city}: sunny for {days} day(s)'
+'''
+
+
+def _define(page, source=SOURCE):
+    # Like a Streamlit rerun: a new function object from the same source
+    # (compiled schemas are cached per process, so each test uses its own page)
+    namespace = {'__name__': page}
+    exec(source, namespace)
+    return namespace['get_weather']
+
+
+@pytest.fixture
+def conversions(monkeypatch):
+    calls = []
+    convert = tool_registry.convert_function_to_tool
+
+    def counting(fn):
+        calls.append(fn)
+        return convert(fn)
+
+    monkeypatch.setattr(tool_registry, 'convert_function_to_tool', counting)
+    return calls
+
+
+def test_redefined_function_reuses_the_compiled_schema(conversions):
+    first = compile_tool(_define('rerun_page'))
+    second = compile_tool(_define('rerun_page'))
+
+    assert second is first
+    assert len(conversions) == 1
+
+
+def test_changed_source_is_recompiled(conversions):
+    first = compile_tool(_define('edited_page'))
+    edited = SOURCE.replace('Get the weather forecast', "Get tomorrow's weather")
+    changed = compile_tool(_define('edited_page', edited))
+
+    assert changed is not first
+    assert changed.function.description != first.function.description
+    assert len(conversions) == 2
+
+
+def test_parameters_with_defaults_are_optional():
+    tool = compile_tool(_define('defaults_page'))
+
+    assert tool.function.parameters.required == ['city']
+    assert validate_arguments(tool, {'city': 'Paris'}) == {'city': 'Paris'}
+
+
+def test_quoted_values_are_converted():
+    tool = compile_tool(_define('weather_page'))
+
+    arguments = validate_arguments(tool, {'city': 'Paris', 'days': '3', 'metric': 'false'})
+
+    assert arguments == {'city': 'Paris', 'days': 3, 'metric': False}
+
+
+@pytest.mark.parametrize('arguments, message', [
+    ({'days': 2}, 'missing required argument(s): city'),
+    ({'city': 'Paris', 'hours': 2}, 'unexpected argument(s): hours'),
+    ({'city': 'Paris', 'days': 'soon'}, "argument 'days' should be integer"),
+    ({'city': 'Paris', 'days': 2.5}, "argument 'days' should be integer"),
+])
+def test_invalid_arguments_are_rejected(arguments, message):
+    tool = compile_tool(_define('weather_page'))
+
+    with pytest.raises(ToolArgumentError, match=re.escape(message)):
+        validate_arguments(tool, arguments)
+
+
+def test_registry_rebuilds_tools_only_when_it_changes():
+    registry = ToolRegistry([_define('registry_page')])
+    tools = registry.tools
+
+    assert registry.tools is tools
+    registry.register({'type': 'function', 'function': {'name': 'noop', 'parameters': {'type': 'object'}}})
+    assert registry.tools is not tools
+    assert registry.names == ['get_weather', 'noop']
@@ -0,0 +1,44 @@
+"""VectorIndex: replacing, deleting and compacting vectors"""
+
+import sys
+
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lib.helper_ollama.vector_index import VectorIndex  # noqa: E402
+
+
+def test_duplicate_ids_keep_the_last_vector():
+    index = VectorIndex()
+    index.add(['a', 'a', 'b'], np.array([[1, 0], [0, 1], [1, 1]]), ['old', 'new', 'b'])
+
+    assert len(index) == 2
+    top = index.search(np.array([1, 0]), k=3)
+    assert [hit['id'] for hit in top] == ['b', 'a']
+    assert top[1]['text'] == 'new'
+    assert top[1]['score'] < 0.01
+
+
+def test_duplicate_ids_delete_and_compact_leave_no_ghost_rows():
+    index = VectorIndex()
+    index.add(['a', 'a'], np.array([[1, 0], [0, 1]]))
+    index.add(['b'], np.array([[1, 0]]))
+
+    assert index.delete(['a']) == 1
+    assert [hit['id'] for hit in index.search(np.array([1, 0]), k=5)] == ['b']
+
+    index.compact()
+    assert index._size == 1
+    assert [hit['id'] for hit in index.search(np.array([0, 1]), k=5)] == ['b']
+
+
+def test_add_replaces_existing_id():
+    index = VectorIndex()
+    index.add(['a'], np.array([[1, 0]]))
+    index.add(['a'], np.array([[0, 1]]))
+
+    assert len(index) == 1
+    assert index.search(np.array([0, 1]), k=1)[0]['score'] > 0.99
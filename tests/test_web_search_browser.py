@@ -0,0 +1,101 @@
+"""Browser page store and page stack: eviction, rebuilding and expired cursors"""
+
+import sys
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from web_search_gpt_oss_helper import Browser, BrowserStateData, PageStack, PageStore  # noqa: E402
+
+
+class FakeWebClient:
+    """web_search/web_fetch returning fixed pages that mention 'foo'"""
+
+    def __init__(self):
+        self.searches = 0
+        self.fetches = 0
+
+    def web_search(self, query, max_results=5):
+        self.searches += 1
+        return SimpleNamespace(results=[
+            SimpleNamespace(
+                title=f'{query} {i}',
+                url=f'https://example.com/{query}/{i}',
+                content=f'{query} result {i} mentions foo and [a link](https://example.com/x)',
+            )
+            for i in range(max_results)
+        ])
+
+    def web_fetch(self, url):
+        self.fetches += 1
+        return SimpleNamespace(title=url, content=f'Page {url} about foo', links=[])
+
+
+def _browser():
+    state = BrowserStateData(url_to_page=PageStore(max_bytes=1))
+    return Browser(initial_state=state, client=FakeWebClient())
+
+
+def _body(result):
+    # Drop the header, whose cursor changes when a page is reopened
+    return result['pageText'].split('\n\n', 1)[1]
+
+
+def test_repeated_find_rebuilds_after_eviction():
+    browser = _browser()
+    browser.search(query='q', topn=2)
+    browser.find(pattern='foo')
+    second = _body(browser.find(pattern='foo'))
+    browser.search(query='other', topn=1)
+
+    assert 'find_results_foo' not in browser.get_state().url_to_page
+    assert _body(browser.open(cursor=2)) == second
+
+
+def test_find_rebuilds_from_its_own_parent():
+    browser = _browser()
+    browser.search(query='q', topn=2)
+    browser.find(pattern='result', cursor=0)
+    nested = _body(browser.find(pattern='q result'))
+    browser.search(query='other', topn=1)
+    # Reuses the URL find_results_result for a page built from another search
+    browser.find(pattern='result', cursor=3)
+
+    assert _body(browser.open(cursor=2)) == nested
+
+
+def test_invalid_link_page_rebuilds_after_eviction():
+    browser = _browser()
+    browser.search(query='q', topn=2)
+    browser.open(id=99, cursor=0)
+    browser.open(id=98)
+    error = _body(browser.open(cursor=2))
+    browser.search(query='other', topn=1)
+
+    assert _body(browser.open(cursor=2)) == error
+    assert 'No link with id 98' in browser.open(cursor=2)['pageText']
+
+
+def test_page_stack_rejects_expired_cursors():
+    stack = PageStack([f'u{i}' for i in range(5)], max_entries=3)
+
+    assert (len(stack), stack.oldest) == (5, 2)
+    assert stack[2] == 'u2' and stack[-1] == 'u4'
+    with pytest.raises(IndexError):
+        stack[1]
+
+
+def test_expired_cursor_shows_an_error_page():
+    state = BrowserStateData(page_stack=PageStack(max_entries=2))
+    browser = Browser(initial_state=state, client=FakeWebClient())
+    browser.search(query='a', topn=1)
+    browser.search(query='b', topn=1)
+    browser.search(query='c', topn=1)
+
+    for result in (browser.open(cursor=0), browser.find(pattern='foo', cursor=0)):
+        assert 'Cursor 0 is no longer available' in result['pageText']
+        assert 'a result' not in result['pageText']
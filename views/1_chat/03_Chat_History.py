@@ -1,5 +1,7 @@
 import streamlit as st
-from ollama import chat
+
+from lib.helper_ollama import ContextManager
+from lib.helper_streamlit import StreamlitOllamaHelper
 
 st.set_page_config(page_title="Chat with History", page_icon="💬", layout="wide")
 
@@ -16,6 +18,14 @@ with tab1:
     with st.sidebar:
         st.header("Settings")
         model = st.selectbox("Select Model", ["gemma3", "llama3.1", "llama3.2", "qwen2.5"], index=0)
+        context_budget = st.number_input(
+            "Context budget (tokens)",
+            min_value=256,
+            max_value=131072,
+            value=4096,
+            step=256,
+            help="Older turns are dropped from the prompt once the history exceeds this estimate",
+        )
     
     # Initialize session state for chat history
     if 'chat_history' not in st.session_state:
@@ -38,31 +48,20 @@ with tab1:
             },
         ]
     
-    # Display chat history
-    for msg in st.session_state.chat_history:
-        with st.chat_message(msg['role']):
-            st.write(msg['content'])
+    # One context manager per conversation keeps the truncation point (and
+    # with it the server's prompt cache) stable across turns
+    if 'chat_context' not in st.session_state or st.session_state.chat_context.budget != context_budget:
+        st.session_state.chat_context = ContextManager(budget=context_budget)
     
-    # Chat input
-    if user_input := st.chat_input("Continue the conversation..."):
-        # Add user message to history
-        st.session_state.chat_history.append({'role': 'user', 'content': user_input})
-        
-        # Display user message
-        with st.chat_message("user"):
-            st.write(user_input)
-        
-        # Get response
-        with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                response = chat(model, messages=st.session_state.chat_history)
-                st.write(response.message.content)
-                
-                # Add assistant response to history
-                st.session_state.chat_history.append({
-                    'role': 'assistant',
-                    'content': response.message.content
-                })
+    # Display history and stream replies (partial replies survive reruns)
+    StreamlitOllamaHelper().run_chat_with_history(
+        model=model,
+        session_key='chat_history',
+        show_stats=True,
+        placeholder="Continue the conversation...",
+        context_window=st.session_state.chat_context,
+        keep_alive="30m",
+    )
     
     if st.button("Clear History", key="clear_history"):
         st.session_state.chat_history = []
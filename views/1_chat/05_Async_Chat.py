@@ -1,6 +1,7 @@
 import streamlit as st
-from ollama import chat
-import asyncio
+
+from lib.helper_ollama import OllamaHelper
+from lib.helper_streamlit.streaming import StreamRenderer
 
 st.set_page_config(page_title="Async Chat", page_icon="💬", layout="wide")
 
@@ -10,12 +11,16 @@ st.markdown("Asynchronous chat operations")
 # Create tabs
 tab1, tab2 = st.tabs(["🎯 Demo", "📄 Source Code"])
 
+# The helper runs coroutines on one long-lived background event loop,
+# so the AsyncClient and its connections are reused across clicks
+helper = OllamaHelper()
+
 with tab1:
     st.header("Interactive Demo")
     
     st.info("""
-    ⚠️ **Note**: Async operations are not fully supported in Streamlit's synchronous execution model.
-    This demo runs the synchronous version. For true async operations, use the Ollama AsyncClient in a native async environment.
+    Streamlit runs pages synchronously, so the async requests are submitted to a background
+    event loop owned by the helper and the streamed chunks are handed back as they arrive.
     """)
     
     # Sidebar settings
@@ -26,19 +31,21 @@ with tab1:
     # User input
     user_input = st.text_input("Ask a question:", value="Why is the sky blue?", key="user_input")
     
-    if st.button("Send (Sync Mode)", key="send_btn"):
-        with st.spinner("Processing..."):
-            messages = [
-                {
-                    'role': 'user',
-                    'content': user_input,
-                },
-            ]
-            
-            response = chat(model, messages=messages)
-            
-            st.success("Response:")
-            st.write(response['message']['content'])
+    if st.button("Send", key="send_btn"):
+        messages = [
+            {
+                'role': 'user',
+                'content': user_input,
+            },
+        ]
+        
+        st.success("Response:")
+        renderer = StreamRenderer(st.empty())
+        renderer.consume(
+            helper.iterate(helper.async_chat(model, messages, stream=True)),
+            lambda chunk: chunk['message']['content'],
+        )
+        st.caption(renderer.caption())
 
 with tab2:
     st.header("Source Code")
@@ -1,6 +1,6 @@
 import streamlit as st
-import asyncio
-import ollama
+
+from lib.helper_ollama import OllamaHelper
 
 st.set_page_config(page_title="Async Generate", page_icon="✨", layout="wide")
 
@@ -10,9 +10,11 @@ st.markdown("Asynchronous text generation")
 # Create tabs
 tab1, tab2 = st.tabs(["🎯 Demo", "📄 Source Code"])
 
+# Coroutines run on the helper's long-lived background loop and AsyncClient
+helper = OllamaHelper()
+
 async def async_generate(model: str, prompt: str):
-    client = ollama.AsyncClient()
-    response = await client.generate(model, prompt)
+    response = await helper.async_generate(model, prompt)
     return response['response']
 
 with tab1:
@@ -28,7 +30,7 @@ with tab1:
     
     if st.button("Generate Async", key="generate_btn"):
         with st.spinner("Generating asynchronously..."):
-            response = asyncio.run(async_generate(model, prompt))
+            response = helper.run(async_generate(model, prompt))
             
             st.success("Generated Response:")
             st.write(response)
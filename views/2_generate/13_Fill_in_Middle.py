@@ -1,5 +1,6 @@
 import streamlit as st
-from ollama import generate
+
+from lib.helper_ollama import OllamaHelper, get_response_cache
 
 st.set_page_config(page_title="Fill in Middle", page_icon="💻", layout="wide")
 
@@ -9,6 +10,8 @@ st.markdown("Code completion - generate code between prefix and suffix")
 # Create tabs
 tab1, tab2 = st.tabs(["🎯 Demo", "📄 Source Code"])
 
+helper = OllamaHelper(response_cache=get_response_cache())
+
 with tab1:
     st.header("Interactive Demo")
     
@@ -33,16 +36,15 @@ with tab1:
     
     if st.button("Fill in Middle", key="generate_btn"):
         with st.spinner("Generating code..."):
-            response = generate(
-                model='codellama:7b-code',
-                prompt=prefix,
+            # Cached when temperature is 0
+            response = helper.generate(
+                'codellama:7b-code',
+                prefix,
                 suffix=suffix,
-                options={
-                    'num_predict': num_predict,
-                    'temperature': temperature,
-                    'top_p': 0.9,
-                    'stop': ['<EOT>'],
-                },
+                num_predict=num_predict,
+                temperature=temperature,
+                top_p=0.9,
+                stop=['<EOT>'],
             )
             
             st.subheader("Generated Code:")
@@ -51,7 +53,9 @@ with tab1:
 
 with tab2:
     st.header("Source Code")
-    st.code('''from ollama import generate
+    st.code('''from lib.helper_ollama import OllamaHelper, get_response_cache
+
+helper = OllamaHelper(response_cache=get_response_cache())
 
 prompt = \'\'\'def remove_non_ascii(s: str) -> str:
     """ \'\'\'
@@ -60,16 +64,15 @@ suffix = """
     return result
 """
 
-response = generate(
-  model='codellama:7b-code',
-  prompt=prompt,
+# Cached, as temperature is 0
+response = helper.generate(
+  'codellama:7b-code',
+  prompt,
   suffix=suffix,
-  options={
-    'num_predict': 128,
-    'temperature': 0,
-    'top_p': 0.9,
-    'stop': ['<EOT>'],
-  },
+  num_predict=128,
+  temperature=0,
+  top_p=0.9,
+  stop=['<EOT>'],
 )
 
 print(response['response'])
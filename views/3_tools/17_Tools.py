@@ -1,5 +1,7 @@
 import streamlit as st
-from ollama import ChatResponse, chat
+from ollama import ChatResponse
+
+from lib.helper_ollama import OllamaHelper, ToolRegistry
 
 st.set_page_config(page_title="Tools", page_icon="🛠️", layout="wide")
 
@@ -34,11 +36,6 @@ with tab1:
         with st.spinner("Processing..."):
             messages = [{'role': 'user', 'content': prompt}]
             
-            available_functions = {
-                'add_two_numbers': add_two_numbers,
-                'subtract_two_numbers': subtract_two_numbers,
-            }
-            
             # Create manual tool definition for subtract
             subtract_tool = {
                 'type': 'function',
@@ -56,28 +53,33 @@ with tab1:
                 },
             }
             
-            response: ChatResponse = chat(
-                model,
-                messages=messages,
-                tools=[add_two_numbers, subtract_tool],
+            # Schemas are compiled once, arguments are checked before the call
+            registry = ToolRegistry(
+                [add_two_numbers, subtract_tool],
+                functions={'subtract_two_numbers': subtract_two_numbers},
             )
             
+            helper = OllamaHelper()
+            response: ChatResponse = helper.chat_with_tools(model, messages, registry)
+            
             st.subheader("Model Response:")
             
             if response.message.tool_calls:
-                for tool in response.message.tool_calls:
-                    if function_to_call := available_functions.get(tool.function.name):
-                        st.write(f"🔧 **Calling function:** `{tool.function.name}`")
-                        st.write(f"**Arguments:** {tool.function.arguments}")
-                        output = function_to_call(**tool.function.arguments)
-                        st.write(f"**Function output:** {output}")
-                        
-                        # Add function response to messages
-                        messages.append(response.message)
-                        messages.append({'role': 'tool', 'content': str(output), 'tool_name': tool.function.name})
+                messages.append(response.message)
+                
+                for result in helper.run_tools(registry, response.message.tool_calls):
+                    st.write(f"🔧 **Calling function:** `{result.name}`")
+                    st.write(f"**Arguments:** {result.arguments}")
+                    if result.ok:
+                        st.write(f"**Function output:** {result.output}")
+                    else:
+                        st.error(result.error)
+                    
+                    # Add function response to messages
+                    messages.append(result.to_message())
                 
                 # Get final response
-                final_response = chat(model, messages=messages)
+                final_response = helper.chat(model, messages)
                 st.success("**Final Response:**")
                 st.write(final_response.message.content)
             else:
@@ -1,8 +1,8 @@
 import streamlit as st
-import asyncio
-import ollama
 from ollama import ChatResponse
 
+from lib.helper_ollama import OllamaHelper
+
 st.set_page_config(page_title="Async Tools", page_icon="🛠️", layout="wide")
 
 st.title("🛠️ Asynchronous Function Calling")
@@ -11,6 +11,9 @@ st.markdown("Use async function calling for better performance")
 # Create tabs
 tab1, tab2 = st.tabs(["🎯 Demo", "📄 Source Code"])
 
+# Coroutines run on the helper's long-lived background loop and AsyncClient
+helper = OllamaHelper()
+
 def add_two_numbers(a: int, b: int) -> int:
     """Add two numbers"""
     return a + b
@@ -44,11 +47,9 @@ async def async_tool_call(model: str, prompt: str):
         },
     }
     
-    client = ollama.AsyncClient()
-    
-    response: ChatResponse = await client.chat(
+    response: ChatResponse = await helper.async_chat_with_tools(
         model,
-        messages=messages,
+        messages,
         tools=[add_two_numbers, subtract_tool],
     )
     
@@ -65,7 +66,7 @@ async def async_tool_call(model: str, prompt: str):
                 messages.append(response.message)
                 messages.append({'role': 'tool', 'content': str(results[-1]['output']), 'tool_name': tool.function.name})
         
-        final_response = await client.chat(model, messages=messages)
+        final_response = await helper.async_chat(model, messages)
         return results, final_response.message.content
     
     return None, None
@@ -85,7 +86,7 @@ with tab1:
     
     if st.button("Send", key="send_btn"):
         with st.spinner("Processing asynchronously..."):
-            results, final_response = asyncio.run(async_tool_call(model, prompt))
+            results, final_response = helper.run(async_tool_call(model, prompt))
             
             if results:
                 st.subheader("Tool Calls:")
@@ -1,7 +1,8 @@
 import streamlit as st
-from ollama import ChatResponse, Client
 import random
 
+from lib.helper_streamlit import StreamlitOllamaHelper
+
 st.set_page_config(page_title="Multi Tool", page_icon="🛠️", layout="wide")
 
 st.title("🛠️ Multi-Tool Calling")
@@ -43,69 +44,23 @@ with tab1:
     
     if st.button("Get Weather Info", key="weather_btn"):
         with st.spinner("Processing..."):
-            available_functions = {
-                'get_temperature': get_temperature,
-                'get_conditions': get_conditions,
-            }
-            
             messages = [{'role': 'user', 'content': f'What is the temperature in {city1}? and what are the weather conditions in {city2}?'}]
             
             st.write(f"**Prompt:** {messages[0]['content']}")
             
-            client = Client()
-            response = client.chat(
+            # Streams each turn, runs the tool calls of a turn concurrently and
+            # feeds the results back until the model answers
+            result = StreamlitOllamaHelper().run_agent(
                 model,
-                stream=True,
-                messages=messages,
+                messages,
                 tools=[get_temperature, get_conditions],
-                think=True
+                think=True,
             )
             
-            thinking_text = ""
-            content_text = ""
-            tool_calls_list = []
-            
-            thinking_placeholder = st.empty()
-            
-            for chunk in response:
-                if chunk.message.thinking:
-                    thinking_text += chunk.message.thinking
-                    with thinking_placeholder.container():
-                        st.subheader("🤔 Thinking:")
-                        st.text(thinking_text)
-                
-                if chunk.message.content:
-                    content_text += chunk.message.content
-                
-                if chunk.message.tool_calls:
-                    for tool in chunk.message.tool_calls:
-                        if function_to_call := available_functions.get(tool.function.name):
-                            output = function_to_call(**tool.function.arguments)
-                            tool_calls_list.append({
-                                'function': tool.function.name,
-                                'arguments': tool.function.arguments,
-                                'output': output
-                            })
-                            messages.append(chunk.message)
-                            messages.append({'role': 'tool', 'content': str(output), 'tool_name': tool.function.name})
-            
-            if tool_calls_list:
-                st.subheader("🔧 Tool Calls:")
-                for tc in tool_calls_list:
-                    st.write(f"**Function:** `{tc['function']}` with arguments: {tc['arguments']}")
-                    st.write(f"**Output:** {tc['output']}")
-                    st.divider()
-                
-                st.subheader("Getting final result...")
-                res = client.chat(model, stream=True, tools=[get_temperature, get_conditions], messages=messages, think=True)
-                
-                final_response = ""
-                for chunk in res:
-                    if chunk.message.content:
-                        final_response += chunk.message.content
-                
-                st.success("**Final Result:**")
-                st.write(final_response)
+            if result.stop_reason == 'complete':
+                st.success(f"✅ Final result after {result.iterations} iterations and {result.tool_calls} tool calls")
+            elif result.stop_reason == 'max_iterations':
+                st.warning(f"Stopped after {result.iterations} iterations")
 
 with tab2:
     st.header("Source Code")
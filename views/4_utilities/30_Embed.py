@@ -1,7 +1,8 @@
 import streamlit as st
-from ollama import embed
 import numpy as np
 
+from lib.helper_ollama import OllamaHelper
+
 st.set_page_config(page_title="Embeddings", page_icon="⚙️", layout="wide")
 
 st.title("⚙️ Text Embeddings")
@@ -10,6 +11,8 @@ st.markdown("Generate vector embeddings from text")
 # Create tabs
 tab1, tab2 = st.tabs(["🎯 Demo", "📄 Source Code"])
 
+helper = OllamaHelper()
+
 def cosine_similarity(a, b):
     """Calculate cosine similarity between two vectors"""
     return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
@@ -29,8 +32,7 @@ with tab1:
     if st.button("Generate Embedding", key="embed_btn"):
         with st.spinner("Generating embedding..."):
             try:
-                response = embed(model=model, input=text_input)
-                embeddings = response['embeddings'][0]
+                embeddings = helper.embed_batch(model, [text_input])[0]
                 
                 st.success("✅ Embedding generated!")
                 
@@ -70,14 +72,13 @@ with tab1:
     if st.button("Compare Similarity", key="compare_btn"):
         with st.spinner("Comparing..."):
             try:
-                emb1 = embed(model=model, input=text1)['embeddings'][0]
-                emb2 = embed(model=model, input=text2)['embeddings'][0]
+                emb1, emb2 = helper.embed_batch(model, [text1, text2])
                 
                 similarity = cosine_similarity(emb1, emb2)
                 
                 st.metric("Cosine Similarity", f"{similarity:.4f}")
                 
-                st.progress(float(similarity))
+                st.progress(min(max(float(similarity), 0.0), 1.0))
                 
                 if similarity > 0.8:
                     st.success("Very similar texts!")
@@ -89,6 +90,35 @@ with tab1:
             except Exception as e:
                 st.error(f"Error: {str(e)}")
 
+    st.divider()
+    
+    st.subheader("Batch Embeddings")
+    
+    batch_input = st.text_area(
+        "One text per line:",
+        value="The cat sat on the mat\nA dog barked at the mailman\nStock markets rallied today",
+        height=120,
+        key="batch_input",
+    )
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        batch_size = st.number_input("Batch size", min_value=1, max_value=512, value=64, key="batch_size")
+    with col2:
+        concurrency = st.number_input("Concurrent requests", min_value=1, max_value=16, value=4, key="concurrency")
+    
+    if st.button("Embed Batch", key="batch_btn"):
+        texts = [line for line in batch_input.splitlines() if line.strip()]
+        with st.spinner(f"Embedding {len(texts)} texts..."):
+            try:
+                matrix = helper.embed_batch(model, texts, batch_size=batch_size, concurrency=concurrency)
+                
+                st.success(f"✅ Embedded {matrix.shape[0]} texts ({matrix.shape[1]} dimensions)")
+                st.json(helper.embedder.stats())
+                
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
+
 with tab2:
     st.header("Source Code")
     st.code('''from ollama import embed
@@ -1,8 +1,9 @@
 import streamlit as st
 from pydantic import BaseModel
-from ollama import chat
 import json
 
+from lib.helper_ollama import OllamaHelper, get_response_cache
+
 st.set_page_config(page_title="Structured Outputs", page_icon="⚙️", layout="wide")
 
 st.title("⚙️ Structured Outputs")
@@ -11,6 +12,9 @@ st.markdown("Get structured JSON responses using Pydantic schemas")
 # Create tabs
 tab1, tab2 = st.tabs(["🎯 Demo", "📄 Source Code"])
 
+# Temperature 0 makes the output deterministic, so repeated prompts are served from the cache
+helper = OllamaHelper(response_cache=get_response_cache())
+
 # Define the schema
 class FriendInfo(BaseModel):
     name: str
@@ -51,11 +55,11 @@ class FriendList(BaseModel):
     if st.button("Generate", key="generate_btn"):
         with st.spinner("Generating structured output..."):
             try:
-                response = chat(
-                    model=model,
-                    messages=[{'role': 'user', 'content': prompt}],
+                response = helper.chat(
+                    model,
+                    [{'role': 'user', 'content': prompt}],
                     format=FriendList.model_json_schema(),
-                    options={'temperature': 0},
+                    temperature=0,
                 )
                 
                 # Validate and parse response
@@ -78,6 +82,8 @@ class FriendList(BaseModel):
                     st.subheader("Raw JSON")
                     st.json(json.loads(friends_response.model_dump_json()))
                 
+                st.caption(f"Response cache: {helper.response_cache_stats()}")
+                
                 st.subheader("Schema Used")
                 st.json(FriendList.model_json_schema())
                 
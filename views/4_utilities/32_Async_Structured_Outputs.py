@@ -1,9 +1,9 @@
 import streamlit as st
 from pydantic import BaseModel
-import asyncio
-import ollama
 import json
 
+from lib.helper_ollama import OllamaHelper
+
 st.set_page_config(page_title="Async Structured Outputs", page_icon="⚙️", layout="wide")
 
 st.title("⚙️ Asynchronous Structured Outputs")
@@ -12,6 +12,9 @@ st.markdown("Get structured JSON responses asynchronously")
 # Create tabs
 tab1, tab2 = st.tabs(["🎯 Demo", "📄 Source Code"])
 
+# Coroutines run on the helper's long-lived background loop and AsyncClient
+helper = OllamaHelper()
+
 # Define the schema
 class FriendInfo(BaseModel):
     name: str
@@ -23,12 +26,11 @@ class FriendList(BaseModel):
 
 async def async_structured_output(model: str, prompt: str):
     """Async function to get structured output"""
-    client = ollama.AsyncClient()
-    response = await client.chat(
-        model=model,
-        messages=[{'role': 'user', 'content': prompt}],
+    response = await helper.async_chat(
+        model,
+        [{'role': 'user', 'content': prompt}],
         format=FriendList.model_json_schema(),
-        options={'temperature': 0},
+        temperature=0,
     )
     
     friends_response = FriendList.model_validate_json(response.message.content)
@@ -65,7 +67,7 @@ class FriendList(BaseModel):
     if st.button("Generate Async", key="generate_btn"):
         with st.spinner("Generating asynchronously..."):
             try:
-                friends_response = asyncio.run(async_structured_output(model, prompt))
+                friends_response = helper.run(async_structured_output(model, prompt))
                 
                 st.success("✅ Structured data generated asynchronously!")
                 
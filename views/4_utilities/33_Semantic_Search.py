@@ -0,0 +1,106 @@
+import streamlit as st
+import re
+import time
+
+from lib.helper_ollama import OllamaHelper, VectorIndex, DEFAULT_CACHE_DIR
+
+st.set_page_config(page_title="Semantic Search", page_icon="⚙️", layout="wide")
+
+st.title("⚙️ Semantic Search")
+st.markdown("Index a corpus of documents with embeddings and query it by meaning")
+
+# Create tabs
+tab1, tab2 = st.tabs(["🎯 Demo", "📄 Source Code"])
+
+helper = OllamaHelper()
+
+
+@st.cache_resource
+def get_index(model: str) -> VectorIndex:
+    """One persistent index per embedding model, shared across sessions"""
+    slug = re.sub(r'[^A-Za-z0-9_.-]', '_', model)
+    return VectorIndex(path=DEFAULT_CACHE_DIR / 'index' / slug)
+
+
+with tab1:
+    st.header("Interactive Demo")
+
+    # Sidebar settings
+    with st.sidebar:
+        st.header("Settings")
+        model = st.selectbox("Select Model", ["nomic-embed-text", "mxbai-embed-large", "llama3.2"], index=0)
+        top_k = st.slider("Results", min_value=1, max_value=50, value=5)
+
+    index = get_index(model)
+
+    st.subheader("Corpus")
+    st.write(f"**{len(index)} document(s) indexed** for `{model}`")
+
+    uploaded = st.file_uploader("Upload a text file (one document per line)", type=["txt", "md"])
+    corpus_text = st.text_area(
+        "Or paste documents (one per line):",
+        value="Ollama runs large language models locally\nStreamlit turns Python scripts into web apps\nNumPy provides fast array operations",
+        height=120,
+        key="corpus_text",
+    )
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if st.button("Add to Index", key="index_btn"):
+            source = uploaded.getvalue().decode("utf-8", errors="replace") if uploaded else corpus_text
+            documents = [line.strip() for line in source.splitlines() if line.strip()]
+
+            with st.spinner(f"Embedding {len(documents)} documents..."):
+                try:
+                    start = time.perf_counter()
+                    index.add_texts(helper, model, documents)
+                    index.save()
+                    elapsed = time.perf_counter() - start
+
+                    st.success(f"✅ Indexed {len(documents)} documents in {elapsed:.2f}s")
+                    st.json(helper.embedder.stats())
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
+
+    with col2:
+        if st.button("Clear Index", key="clear_btn"):
+            index.clear()
+            index.save()
+            st.rerun()
+
+    st.divider()
+
+    st.subheader("Query")
+
+    query = st.text_input("Search for:", value="run models on my machine", key="query")
+
+    if query and len(index):
+        try:
+            start = time.perf_counter()
+            results = index.search_text(helper, model, query, k=top_k)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            st.caption(f"{len(results)} result(s) in {elapsed:.1f} ms")
+
+            for rank, result in enumerate(results, start=1):
+                st.write(f"**{rank}.** `{result['score']:.4f}` {result['text']}")
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
+    elif query:
+        st.info("Add documents to the index first")
+
+with tab2:
+    st.header("Source Code")
+    st.code('''from lib.helper_ollama import OllamaHelper, VectorIndex
+
+helper = OllamaHelper()
+index = VectorIndex(path="./my-index")
+
+documents = open("corpus.txt").read().splitlines()
+index.add_texts(helper, "nomic-embed-text", documents)
+index.save()
+
+for result in index.search_text(helper, "nomic-embed-text", "run models locally", k=5):
+    print(f"{result['score']:.4f}  {result['text']}")
+''', language='python')
@@ -0,0 +1,72 @@
+import streamlit as st
+
+from lib.helper_ollama import OllamaHelper
+from lib.helper_streamlit.streaming import StreamRenderer
+
+st.set_page_config(page_title="Compare Models", page_icon="⚙️", layout="wide")
+
+st.title("⚙️ Compare Models")
+st.markdown("Stream the same prompt to several models at once and compare speed and output")
+
+# Create tabs
+tab1, tab2 = st.tabs(["🎯 Demo", "📄 Source Code"])
+
+helper = OllamaHelper()
+
+with tab1:
+    st.header("Interactive Demo")
+
+    # Sidebar settings
+    with st.sidebar:
+        st.header("Settings")
+        installed = helper.get_model_names()
+        choices = installed or ["gemma3", "llama3.1", "llama3.2", "qwen2.5"]
+        models = st.multiselect("Select Models", choices, default=choices[:2])
+        temperature = st.slider("Temperature", 0.0, 2.0, 0.7, 0.1)
+        num_predict = st.slider("Max tokens", 32, 2048, 256, 32)
+
+    # User input
+    prompt = st.text_area("Prompt:", value="Explain recursion in two sentences.", height=100, key="prompt")
+
+    if st.button("Compare", key="compare_btn", disabled=not models):
+        messages = [{'role': 'user', 'content': prompt}]
+
+        # One column and renderer per model; chunks arrive interleaved
+        renderers = {}
+        for model, column in zip(models, st.columns(len(models))):
+            with column:
+                st.subheader(model)
+                renderers[model] = StreamRenderer(st.empty())
+
+        results = {}
+        for model, delta, result in helper.compare_stream(
+            models, messages, {'temperature': temperature, 'num_predict': num_predict}
+        ):
+            if delta:
+                renderers[model].write(delta)
+            elif result.done:
+                results[model] = result
+                renderers[model].finish()
+                if result.error:
+                    renderers[model].placeholder.error(result.error)
+
+        st.divider()
+        st.subheader("Results")
+        st.dataframe([results[model].to_dict() for model in models if model in results], hide_index=True)
+
+with tab2:
+    st.header("Source Code")
+    st.code('''from lib.helper_ollama import OllamaHelper
+
+helper = OllamaHelper()
+messages = [{'role': 'user', 'content': 'Explain recursion in two sentences.'}]
+
+# All models are queried concurrently over the async client
+for result in helper.compare(['gemma3', 'llama3.2'], messages, {'temperature': 0.7}):
+  print(result.model, result.to_dict())
+  print(result.text)
+
+# Or render the replies as tokens arrive
+for model, delta, result in helper.compare_stream(['gemma3', 'llama3.2'], messages):
+  print(f'[{model}] {delta}')
+''', language='python')
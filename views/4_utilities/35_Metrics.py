@@ -0,0 +1,83 @@
+import streamlit as st
+
+from lib.helper_ollama import OllamaHelper, get_metrics, start_metrics_server
+
+st.set_page_config(page_title="Metrics", page_icon="⚙️", layout="wide")
+
+st.title("⚙️ Metrics")
+st.markdown("Latency and throughput of every helper call in this Streamlit process")
+
+# Create tabs
+tab1, tab2 = st.tabs(["🎯 Demo", "📄 Source Code"])
+
+helper = OllamaHelper()
+metrics = get_metrics()
+
+
+@st.cache_resource
+def metrics_server(port: int):
+    """One /metrics endpoint per port for the lifetime of the process"""
+    return start_metrics_server(port)
+
+
+with tab1:
+    st.header("Interactive Demo")
+
+    # Sidebar settings
+    with st.sidebar:
+        st.header("Settings")
+        port = st.number_input("Prometheus port", min_value=1024, max_value=65535, value=9464)
+        serve = st.checkbox("Serve /metrics endpoint", value=False)
+        if st.button("Reset Metrics", key="reset_btn"):
+            metrics.reset()
+
+    if serve:
+        try:
+            server = metrics_server(int(port))
+            st.success(f"Prometheus endpoint: http://127.0.0.1:{server.server_port}/metrics")
+        except OSError as e:
+            st.error(f"Could not start the endpoint: {e}")
+
+    rows = helper.metrics_snapshot()
+
+    if not rows:
+        st.info("No calls recorded yet - use some of the other pages and come back")
+    else:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Requests", sum(r['requests'] for r in rows))
+        with col2:
+            st.metric("Errors", sum(r['errors'] for r in rows))
+        with col3:
+            st.metric("Generated Tokens", sum(r['eval_tokens'] for r in rows))
+
+        st.subheader("Per Endpoint and Model")
+        st.dataframe(rows, hide_index=True)
+
+        chart = [{**r, 'call': f"{r['endpoint']} {r['model']}".strip()} for r in rows]
+
+        st.subheader("Wall Time (ms)")
+        st.bar_chart(chart, x='call', y=['p50_ms', 'p95_ms'], stack=False)
+
+        if any(r['tokens_per_s'] for r in rows):
+            st.subheader("Tokens per Second")
+            st.bar_chart([r for r in chart if r['tokens_per_s']], x='call', y='tokens_per_s')
+
+    with st.expander("Prometheus Text Format"):
+        st.code(metrics.render_prometheus(), language='text')
+
+with tab2:
+    st.header("Source Code")
+    st.code('''from lib.helper_ollama import OllamaHelper, start_metrics_server
+
+helper = OllamaHelper()  # every call is recorded in the process-wide registry
+helper.chat('gemma3', [{'role': 'user', 'content': 'Hi'}])
+
+for row in helper.metrics_snapshot():
+    print(row)  # endpoint, model, requests, errors, p50_ms, p95_ms, ttft_p50_ms, tokens_per_s, ...
+
+print(helper.metrics.render_prometheus())
+
+# Scrape with Prometheus at http://127.0.0.1:9464/metrics
+start_metrics_server(9464)
+''', language='python')
@@ -2,9 +2,10 @@ import streamlit as st
 from pathlib import Path
 from typing import Literal
 from pydantic import BaseModel
-from ollama import chat
 import json
 
+from lib.helper_ollama import OllamaHelper, get_response_cache
+
 st.set_page_config(page_title="Structured Outputs Image", page_icon="🖼️", layout="wide")
 
 st.title("🖼️ Structured Outputs from Images")
@@ -13,6 +14,9 @@ st.markdown("Extract structured data from images using Pydantic schemas")
 # Create tabs
 tab1, tab2 = st.tabs(["🎯 Demo", "📄 Source Code"])
 
+# The cache key includes a hash of the image bytes
+helper = OllamaHelper(response_cache=get_response_cache())
+
 # Define the schema for image objects
 class Object(BaseModel):
     name: str
@@ -49,8 +53,8 @@ with tab1:
             
             try:
                 # Set up chat
-                response = chat(
-                    model=model,
+                response = helper.chat(
+                    model,
                     format=ImageDescription.model_json_schema(),
                     messages=[
                         {
@@ -59,7 +63,7 @@ with tab1:
                             'images': [image_bytes],
                         },
                     ],
-                    options={'temperature': 0},
+                    temperature=0,
                 )
                 
                 # Convert received content to the schema
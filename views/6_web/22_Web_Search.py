@@ -1,6 +1,9 @@
 import streamlit as st
 from typing import Union
-from ollama import WebFetchResponse, WebSearchResponse, chat, web_fetch, web_search
+from ollama import WebFetchResponse, WebSearchResponse
+
+from lib.helper_ollama import web_fetch, web_search
+from lib.helper_streamlit import StreamlitOllamaHelper
 
 st.set_page_config(page_title="Web Search", page_icon="🌐", layout="wide")
 
@@ -10,6 +13,11 @@ st.markdown("Use web search and web fetch tools to answer questions")
 # Create tabs
 tab1, tab2 = st.tabs(["🎯 Demo", "📄 Source Code"])
 
+def format_tool_message(result) -> str:
+    """Format a ToolResult of web_search/web_fetch for the model"""
+    user_search = result.arguments.get('query', '') or result.arguments.get('url', '')
+    return format_tool_results(result.output, user_search=user_search)
+
 def format_tool_results(results: Union[WebSearchResponse, WebFetchResponse], user_search: str):
     """Format tool results for display"""
     output = []
@@ -48,72 +56,27 @@ with tab1:
     
     if st.button("Search", key="search_btn"):
         with st.spinner("Searching..."):
-            available_tools = {'web_search': web_search, 'web_fetch': web_fetch}
-            
             messages = [{'role': 'user', 'content': query}]
             
             st.write(f"**Query:** {query}")
             st.divider()
             
-            iteration = 0
-            max_iterations = 3
+            result = StreamlitOllamaHelper().run_agent(
+                model,
+                messages,
+                tools=[web_search, web_fetch],
+                think=True,
+                max_iterations=3,
+                tool_timeouts={'web_search': 20, 'web_fetch': 30},
+                format_result=format_tool_message,
+                # Cap result at ~2000 tokens
+                max_result_chars=2000 * 4,
+            )
             
-            while iteration < max_iterations:
-                iteration += 1
-                
-                response = chat(
-                    model=model,
-                    messages=messages,
-                    tools=[web_search, web_fetch],
-                    think=True
-                )
-                
-                if response.message.thinking:
-                    with st.expander(f"🤔 Thinking (iteration {iteration})"):
-                        st.text(response.message.thinking)
-                
-                if response.message.content:
-                    st.write(f"**Content (iteration {iteration}):**")
-                    st.write(response.message.content)
-                
-                messages.append(response.message)
-                
-                if response.message.tool_calls:
-                    st.write(f"**🔧 Tool Calls (iteration {iteration}):**")
-                    for tool_call in response.message.tool_calls:
-                        function_to_call = available_tools.get(tool_call.function.name)
-                        if function_to_call:
-                            args = tool_call.function.arguments
-                            st.write(f"- Calling `{tool_call.function.name}` with: `{args}`")
-                            
-                            try:
-                                result: Union[WebSearchResponse, WebFetchResponse] = function_to_call(**args)
-                                
-                                user_search = args.get('query', '') or args.get('url', '')
-                                formatted_results = format_tool_results(result, user_search=user_search)
-                                
-                                with st.expander("📊 Results Preview"):
-                                    st.markdown(formatted_results[:500])
-                                
-                                # Cap result at ~2000 tokens
-                                messages.append({
-                                    'role': 'tool',
-                                    'content': formatted_results[:2000 * 4],
-                                    'tool_name': tool_call.function.name
-                                })
-                            except Exception as e:
-                                st.error(f"Error: {str(e)}")
-                                messages.append({
-                                    'role': 'tool',
-                                    'content': f'Error: {str(e)}',
-                                    'tool_name': tool_call.function.name
-                                })
-                        else:
-                            st.error(f"Tool {tool_call.function.name} not found")
-                    st.divider()
-                else:
-                    st.success("✅ Search completed")
-                    break
+            if result.stop_reason == 'complete':
+                st.success("✅ Search completed")
+            elif result.stop_reason == 'max_iterations':
+                st.warning(f"Stopped after {result.iterations} iterations")
 
 with tab2:
     st.header("Source Code")